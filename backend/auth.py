@@ -1,32 +1,163 @@
 """
 Authentication utilities for Blockblock Trading Competition
-- Password hashing and verification
+- Password hashing and verification (bounded worker pool, off the event loop)
 - JWT token creation and validation
 - Authentication dependency for protected routes
+- Bounded TTL cache of authenticated principals
+- Invalidation listeners (other workers are told through auth_invalidation)
 """
 
 import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 
+# Principal cache configuration
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Passwords are 4-digit PINs (10^4 candidates), so bcrypt cost cannot stop an
+# offline brute force on its own; a moderate cost keeps login bursts cheap.
+# Existing hashes keep verifying at whatever cost they were created with.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class Principal:
+    """Read-only copy of an authenticated user, safe to share across requests"""
+    id: int
+    username: str
+    wallet_address: str
+    profile_image_url: Optional[str]
+    role: str
+    is_approved: bool
+    is_active: bool
+    initial_balance: Optional[float]
+    current_balance: Optional[float]
+    profit_rate: Optional[float]
+    rank: Optional[int]
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            wallet_address=user.wallet_address,
+            profile_image_url=user.profile_image_url,
+            role=user.role,
+            is_approved=user.is_approved,
+            is_active=user.is_active,
+            initial_balance=user.initial_balance,
+            current_balance=user.current_balance,
+            profit_rate=user.profit_rate,
+            rank=user.rank,
+            created_at=user.created_at,
+        )
+
+
+class PrincipalCache:
+    """
+    LRU cache of token -> Principal.
+    An entry never outlives its token's exp claim or AUTH_CACHE_TTL_SECONDS,
+    and admin writes drop every token of the affected user: at once in the
+    worker that made the write, within AUTH_INVALIDATION_POLL_SECONDS in the others.
+    """
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL_SECONDS, max_entries: int = AUTH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        principal, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._remove(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return principal
+
+    def put(self, token: str, principal: Principal, token_exp: Optional[float] = None) -> None:
+        lifetime = self.ttl
+        if token_exp is not None:
+            lifetime = min(lifetime, token_exp - time.time())
+        if lifetime <= 0 or self.max_entries <= 0:
+            return
+
+        self._remove(token)
+        self._entries[token] = (principal, time.monotonic() + lifetime)
+        self._tokens_by_user.setdefault(principal.id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+
+
+principal_cache = PrincipalCache()
+
+# Called with the user id after every admin write (e.g. to tell other workers)
+_invalidation_listeners: List[Callable[[int], None]] = []
+
+
+def add_invalidation_listener(listener: Callable[[int], None]) -> None:
+    _invalidation_listeners.append(listener)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop cached principals for a user after an admin write, in this worker and via listeners"""
+    principal_cache.invalidate_user(user_id)
+    for listener in _invalidation_listeners:
+        try:
+            listener(user_id)
+        except Exception as e:
+            print(f"인증 캐시 무효화 리스너 오류: {e}")
+
+
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
     return pwd_context.hash(password)
@@ -37,6 +168,67 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordWorkerPool:
+    """
+    Dedicated, size-limited executor for bcrypt work.
+    Jobs beyond workers + max_queue are refused with 503 instead of piling up.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._limit = workers + max_queue
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs submitted and not yet finished (running + waiting)"""
+        return self._pending
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn, *args, refuse_when_full: bool = True) -> "asyncio.Future":
+        with self._lock:
+            if refuse_when_full and self._pending >= self._limit:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password)
+
+    async def hash_queued(self, password: str) -> str:
+        """
+        For batch jobs that cap their own concurrency: queued on the same
+        workers but never refused, so a full queue delays them instead of failing them
+        """
+        return await self._submit(hash_password, password, refuse_when_full=False)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+
+password_pool = PasswordWorkerPool()
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt worker pool"""
+    return await password_pool.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt worker pool"""
+    return await password_pool.verify(plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -68,15 +260,20 @@ def decode_access_token(token: str) -> dict:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Dependency to get the current authenticated user
     Use this in route parameters: current_user: dict = Depends(get_current_user)
+    Returns a cached Principal when the token was verified recently.
     """
     from models import User  # Import here to avoid circular dependency
     
     token = credentials.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
     payload = decode_access_token(token)
     
     user_id_str = payload.get("sub")
@@ -87,7 +284,7 @@ async def get_current_user(
         )
     
     user_id = int(user_id_str)
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -100,7 +297,9 @@ async def get_current_user(
             detail="Account pending admin approval",
         )
     
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
 
 
 async def get_current_admin(
@@ -0,0 +1,197 @@
+"""
+Cross-worker principal cache invalidation for Blockblock Trading Competition
+- The worker handling an admin write drops the user's cached principals at once
+  and appends the user id to a shared feed
+- Every worker polls the feed and drops its own cached principals for those
+  users, so other workers stop serving them within AUTH_INVALIDATION_POLL_SECONDS
+- 'file': append-only log in LEADERBOARD_SHARED_DIR (workers on one host)
+- 'postgres': auth_invalidations table (workers on several hosts)
+- Only used when LEADERBOARD_SHARING is on; a single worker needs no feed
+"""
+
+import os
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import delete, func, insert, select
+
+from database import SessionLocal
+from models import AuthInvalidation
+from snapshot_store import LEADERBOARD_SHARED_DIR
+
+AUTH_INVALIDATION_POLL_SECONDS = float(os.getenv("AUTH_INVALIDATION_POLL_SECONDS", "1"))
+# Rows older than this are pruned on write; every worker has long since read them
+AUTH_INVALIDATION_RETENTION_SECONDS = float(os.getenv("AUTH_INVALIDATION_RETENTION_SECONDS", "3600"))
+
+
+class _InvalidationFeed(ABC):
+    """Reads start at the end of the feed: a starting worker has nothing cached yet"""
+
+    @abstractmethod
+    def write(self, user_ids: List[int]) -> None:
+        """Append user ids (runs on the writer thread)"""
+
+    @abstractmethod
+    def read_new(self) -> List[int]:
+        """User ids appended since the last call"""
+
+
+class FileInvalidationFeed(_InvalidationFeed):
+    """
+    One user id per line, appended with O_APPEND so concurrent writers never
+    interleave within a write; readers only consume complete lines.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset: Optional[int] = None
+
+    def write(self, user_ids: List[int]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = "".join(f"{user_id}\n" for user_id in user_ids).encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def read_new(self) -> List[int]:
+        try:
+            size = os.stat(self.path).st_size
+        except FileNotFoundError:
+            self._offset = 0
+            return []
+        if self._offset is None:
+            # Nothing written before this worker started can be cached here
+            self._offset = size
+            return []
+        if size < self._offset:
+            # Replaced by a new log: read it from the start
+            self._offset = 0
+        if size == self._offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        complete = data.rfind(b"\n") + 1
+        self._offset += complete
+        return [int(line) for line in data[:complete].split()]
+
+
+class DatabaseInvalidationFeed(_InvalidationFeed):
+    """
+    Rows read by increasing id; old rows are pruned by the writers.
+    Writes are single short transactions, so an id committing after a larger
+    one was already read is rare; AUTH_CACHE_TTL_SECONDS still bounds that case.
+    """
+
+    def __init__(self, retention_seconds: float = AUTH_INVALIDATION_RETENTION_SECONDS):
+        self.retention = timedelta(seconds=retention_seconds)
+        self._seen: Optional[int] = None
+
+    def write(self, user_ids: List[int]) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuthInvalidation), [{"user_id": user_id} for user_id in user_ids])
+            db.execute(
+                delete(AuthInvalidation)
+                .where(AuthInvalidation.created_at < datetime.now(timezone.utc) - self.retention)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def read_new(self) -> List[int]:
+        db = SessionLocal()
+        try:
+            if self._seen is None:
+                self._seen = db.scalar(select(func.coalesce(func.max(AuthInvalidation.id), 0)))
+                return []
+            rows = db.execute(
+                select(AuthInvalidation.id, AuthInvalidation.user_id)
+                .where(AuthInvalidation.id > self._seen)
+                .order_by(AuthInvalidation.id)
+            ).all()
+        finally:
+            db.close()
+        if rows:
+            self._seen = rows[-1].id
+        return [row.user_id for row in rows]
+
+
+def create_invalidation_feed(mode: str) -> _InvalidationFeed:
+    if mode == "file":
+        return FileInvalidationFeed(os.path.join(LEADERBOARD_SHARED_DIR, "auth-invalidations.log"))
+    if mode == "postgres":
+        return DatabaseInvalidationFeed()
+    raise ValueError(f"unknown LEADERBOARD_SHARING mode: {mode}")
+
+
+class InvalidationBroadcaster:
+    """
+    publish() is the auth invalidation listener: ids are collected and written
+    by one background thread, so a batch of admin writes becomes one append.
+    The follower task hands ids written by any worker to on_invalidated.
+    """
+
+    def __init__(
+        self,
+        feed: _InvalidationFeed,
+        on_invalidated: Callable[[int], None],
+        poll_seconds: float = AUTH_INVALIDATION_POLL_SECONDS,
+    ):
+        self.feed = feed
+        self._on_invalidated = on_invalidated
+        self.poll_seconds = poll_seconds
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auth-invalidation")
+        self._lock = threading.Lock()
+        self._pending: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, user_id: int) -> None:
+        with self._lock:
+            schedule = not self._pending
+            self._pending.add(user_id)
+        if schedule:
+            self._writer.submit(self._flush).add_done_callback(_report_write_error)
+
+    def _flush(self) -> None:
+        with self._lock:
+            user_ids, self._pending = sorted(self._pending), set()
+        if user_ids:
+            self.feed.write(user_ids)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                for user_id in await loop.run_in_executor(None, self.feed.read_new):
+                    self._on_invalidated(user_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"인증 캐시 무효화 읽기 실패: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _report_write_error(future) -> None:
+    if future.exception() is not None:
+        print(f"인증 캐시 무효화 전파 실패: {future.exception()}")
@@ -0,0 +1,120 @@
+"""
+Local stand-in for the Hyperliquid /info endpoint (benchmarks only)
+- Synthetic, deterministic clearinghouseState for any wallet
+- allMids with slowly drifting prices
+- Configurable latency, 5xx error rate and 429 rate
+
+    python benchmarks/fake_info_server.py --port 9100 --latency-ms 80 --error-rate 0.01 --rate-limit-rate 0.02
+"""
+
+import math
+import time
+import random
+import hashlib
+import asyncio
+import argparse
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+BASE_PRICES = {"BTC": 60000.0, "ETH": 3000.0, "SOL": 150.0, "HYPE": 25.0}
+
+app = FastAPI(title="Fake Hyperliquid /info")
+settings = {"latency_ms": 50.0, "jitter_ms": 20.0, "error_rate": 0.0, "rate_limit_rate": 0.0}
+stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+
+def mids(now: float) -> dict:
+    return {
+        coin: base * (1 + 0.02 * math.sin(now / 60 + i))
+        for i, (coin, base) in enumerate(BASE_PRICES.items())
+    }
+
+
+def clearinghouse_state(address: str, now: float) -> dict:
+    """Cash plus at most one perp position, consistent with mids()"""
+    seed = int(hashlib.sha256(address.lower().encode()).hexdigest()[:8], 16)
+    cash = 1000.0 + seed % 9000
+    positions = []
+    unrealized = 0.0
+
+    if seed % 2 == 0:
+        coin = list(BASE_PRICES)[seed % len(BASE_PRICES)]
+        entry_px = BASE_PRICES[coin]
+        size = round((cash * 2 / entry_px) * (1 if seed % 4 == 0 else -1), 6)
+        mark = mids(now)[coin]
+        unrealized = size * (mark - entry_px)
+        positions.append({
+            "type": "oneWay",
+            "position": {
+                "coin": coin,
+                "szi": str(size),
+                "entryPx": str(entry_px),
+                "positionValue": str(abs(size) * mark),
+                "unrealizedPnl": str(unrealized),
+            },
+        })
+
+    account_value = cash + unrealized
+    return {
+        "marginSummary": {
+            "accountValue": str(account_value),
+            "totalNtlPos": str(sum(float(p["position"]["positionValue"]) for p in positions)),
+            "totalRawUsd": str(cash),
+        },
+        "assetPositions": positions,
+        "withdrawable": str(max(cash - 100, 0)),
+        "time": int(now * 1000),
+    }
+
+
+@app.post("/info")
+async def info(request: Request):
+    stats["requests"] += 1
+    delay = max(0.0, random.gauss(settings["latency_ms"], settings["jitter_ms"])) / 1000
+    await asyncio.sleep(delay)
+
+    roll = random.random()
+    if roll < settings["rate_limit_rate"]:
+        stats["rate_limited"] += 1
+        return JSONResponse({"error": "rate limited"}, status_code=429, headers={"Retry-After": "1"})
+    if roll < settings["rate_limit_rate"] + settings["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse({"error": "upstream error"}, status_code=500)
+
+    body = await request.json()
+    now = time.time()
+    if body.get("type") == "clearinghouseState":
+        return clearinghouse_state(body.get("user", ""), now)
+    if body.get("type") == "allMids":
+        return {coin: str(px) for coin, px in mids(now).items()}
+    return JSONResponse({"error": f"unsupported type {body.get('type')}"}, status_code=400)
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Hyperliquid /info server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    settings.update(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+Load test / benchmark harness for the backend
+- Starts fake_info_server.py and the app (uvicorn main:app) as subprocesses
+- Seeds a throwaway database with N approved participants plus an admin
+- Hammers /leaderboard, /api/auth/login and /api/users at increasing concurrency
+- Runs each scenario under every --app-config: "bench" raises the upstream
+  budget to measure the serving path, "defaults" keeps production settings
+  to show how much of the leaderboard a real budget leaves stale
+- Writes p50/p95/p99 latency, throughput, status counts and stale entries
+  to a JSON file
+
+Run from backend/:
+
+    python benchmarks/run_benchmarks.py --participants 100 1000 --concurrency 1 10 50
+    python benchmarks/run_benchmarks.py --app-config defaults --participants 500
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/<previous>.json
+
+--database-url defaults to a SQLite file in a temp dir. A Postgres URL works
+too, but every table in it is DROPPED and recreated - point it at a scratch DB.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+ADMIN_USERNAME = "bench_admin"
+PASSWORD = "1234"
+ENDPOINTS = ["/leaderboard", "/api/auth/login", "/api/users"]
+
+# Settings every run needs
+COMMON_APP_ENV = {
+    "JWT_SECRET_KEY": "benchmark-secret",
+    # Every scenario is a cold start: no snapshot restored from an earlier run
+    "LEADERBOARD_SNAPSHOT_PATH": "",
+}
+
+# App settings per --app-config; anything here can be overridden with --app-env KEY=VALUE
+APP_CONFIGS = {
+    "bench": dict(
+        COMMON_APP_ENV,
+        LEADERBOARD_REFRESH_INTERVAL_SECONDS="5",
+        LEADERBOARD_REFRESH_BUDGET_PER_MINUTE="100000",
+        HYPERLIQUID_WEIGHT_PER_MINUTE="100000",
+        HYPERLIQUID_WEIGHT_BURST="10000",
+    ),
+    "defaults": dict(COMMON_APP_ENV),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def seed_database(participants: int) -> None:
+    """Recreate all tables and insert the admin plus N approved participants"""
+    # Imported lazily: database reads DATABASE_URL at import time
+    sys.path.insert(0, BACKEND_DIR)
+    from database import Base, engine, SessionLocal
+    from models import User
+    from auth import hash_password
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # One bcrypt hash shared by everyone keeps seeding fast at large N
+    password_hash = hash_password(PASSWORD)
+    # executemany takes its column list from the first row: every row needs the same keys
+    rows = [
+        {
+            "username": ADMIN_USERNAME,
+            "password_hash": password_hash,
+            "wallet_address": "0x" + "0" * 40,
+            "role": "admin",
+            "is_approved": True,
+            "is_active": True,
+            "initial_balance": None,
+            "current_balance": None,
+            "profit_rate": 0.0,
+        }
+    ]
+    rows += [
+        {
+            "username": f"bench_user_{i}",
+            "password_hash": password_hash,
+            "wallet_address": "0x%040x" % (i + 1),
+            "role": "user",
+            "is_approved": True,
+            "is_active": True,
+            "initial_balance": 5000.0,
+            "current_balance": 5000.0,
+            "profit_rate": 0.0,
+        }
+        for i in range(participants)
+    ]
+
+    with SessionLocal() as db:
+        db.execute(User.__table__.insert(), rows)
+        db.commit()
+    engine.dispose()
+
+
+def start_process(args: List[str], env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(args, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def stop_process(process: Optional[subprocess.Popen]) -> None:
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def wait_until_ready(base_url: str, started: float, timeout: float) -> dict:
+    """
+    Poll until login works and /leaderboard returns a snapshot.
+    Returns seconds from process start to the first response of each kind.
+    """
+    timings = {}
+    token = None
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        while time.monotonic() - started < timeout:
+            try:
+                if "first_response_seconds" not in timings:
+                    await client.get("/health")
+                    timings["first_response_seconds"] = round(time.monotonic() - started, 3)
+                if token is None:
+                    response = await client.post(
+                        "/api/auth/login", json={"username": ADMIN_USERNAME, "password": PASSWORD}
+                    )
+                    if response.status_code == 200:
+                        token = response.json()["access_token"]
+                if token is not None:
+                    response = await client.get(
+                        "/leaderboard", headers={"Authorization": f"Bearer {token}"}
+                    )
+                    if response.status_code == 200:
+                        timings["first_leaderboard_seconds"] = round(time.monotonic() - started, 3)
+                        timings["token"] = token
+                        return timings
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"app not ready after {timeout}s (see logs)")
+
+
+async def leaderboard_staleness(base_url: str, token: str) -> dict:
+    """How many leaderboard entries are still served from a stale state"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        response = await client.get("/leaderboard", headers={"Authorization": f"Bearer {token}"})
+    entries = response.json()["entries"]
+    return {"entries": len(entries), "stale": sum(1 for entry in entries if entry["stale"])}
+
+
+def build_request(endpoint: str, token: str, participants: int, i: int) -> dict:
+    if endpoint == "/api/auth/login":
+        username = f"bench_user_{i % participants}" if participants else ADMIN_USERNAME
+        return {"method": "POST", "url": endpoint, "json": {"username": username, "password": PASSWORD}}
+    return {"method": "GET", "url": endpoint, "headers": {"Authorization": f"Bearer {token}"}}
+
+
+async def load(base_url: str, endpoint: str, token: str, participants: int,
+               concurrency: int, duration: float) -> dict:
+    """Closed-loop load: `concurrency` workers send back-to-back for `duration` seconds"""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    counter = iter(range(10**9))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            while time.monotonic() < deadline:
+                request = build_request(endpoint, token, participants, next(counter))
+                started = time.perf_counter()
+                try:
+                    response = await client.request(**request)
+                    await response.aread()
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": total - statuses.get("200", 0),
+        "status_counts": statuses,
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+async def run_scenario(args, app_config: str, participants: int, info_url: str, workdir: str) -> dict:
+    print(f"▶ {app_config}, participants={participants}: seeding database")
+    seed_database(participants)
+
+    name = f"{app_config}-{participants}"
+    port = free_port()
+    env = dict(os.environ, **APP_CONFIGS[app_config], HYPERLIQUID_API_URL=info_url)
+    # Leader lock and shared snapshot (multi-worker runs) private to this scenario
+    env["LEADERBOARD_SHARED_DIR"] = os.path.join(workdir, f"shared-{name}")
+    # The app picks its sharing mode from the worker count, as under the Procfile
+    env["WEB_CONCURRENCY"] = str(args.app_workers)
+    env.update(dict(item.split("=", 1) for item in args.app_env))
+    started = time.monotonic()
+    app = start_process(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(args.app_workers), "--log-level", "warning"],
+        env,
+        os.path.join(workdir, f"app-{name}.log"),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        startup = await wait_until_ready(base_url, started, args.ready_timeout)
+        token = startup.pop("token")
+        startup["stale_at_first_leaderboard"] = await leaderboard_staleness(base_url, token)
+        print(f"  ready: first response {startup['first_response_seconds']}s, "
+              f"first leaderboard {startup['first_leaderboard_seconds']}s, "
+              f"stale {startup['stale_at_first_leaderboard']['stale']}/{participants}")
+
+        runs = []
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                result = await load(base_url, endpoint, token, participants, concurrency, args.duration)
+                latency = result["latency_ms"]
+                print(f"  {endpoint:<18} c={concurrency:<4} {result['throughput_rps']:>8} rps  "
+                      f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms  "
+                      f"errors={result['errors']}")
+                runs.append(result)
+        stale_at_end = await leaderboard_staleness(base_url, token)
+        print(f"  stale after the run: {stale_at_end['stale']}/{participants}")
+    finally:
+        stop_process(app)
+
+    return {
+        "app_config": app_config,
+        "participants": participants,
+        "startup": startup,
+        "runs": runs,
+        "stale_at_end": stale_at_end,
+    }
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    """Print p95 / throughput deltas against an earlier results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def index(data):
+        return {
+            (scenario.get("app_config", "bench"), scenario["participants"], run["endpoint"], run["concurrency"]): run
+            for scenario in data["scenarios"]
+            for run in scenario["runs"]
+        }
+
+    before, after = index(baseline), index(results)
+    print(f"\nvs {baseline.get('commit')} ({baseline_path})")
+    for key in sorted(after.keys() & before.keys()):
+        old, new = before[key], after[key]
+        p95_old, p95_new = old["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        change = (p95_new - p95_old) / p95_old * 100 if p95_old else 0.0
+        print(f"  {key[0]:<9} N={key[1]:<6} {key[2]:<18} c={key[3]:<4} "
+              f"p95 {p95_old} -> {p95_new}ms ({change:+.1f}%)  "
+              f"rps {old['throughput_rps']} -> {new['throughput_rps']}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the backend against a fake Hyperliquid /info")
+    parser.add_argument("--participants", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS, choices=ENDPOINTS)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint/concurrency step")
+    parser.add_argument("--database-url", help="throwaway DB (default: temp SQLite file)")
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--app-config", nargs="+", default=list(APP_CONFIGS), choices=list(APP_CONFIGS))
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    parser.add_argument("--info-latency-ms", type=float, default=50.0)
+    parser.add_argument("--info-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--info-error-rate", type=float, default=0.0)
+    parser.add_argument("--info-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="results JSON path (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="blockblock-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    info_port = free_port()
+    info_url = f"http://127.0.0.1:{info_port}"
+    fake_info = start_process(
+        [sys.executable, os.path.join("benchmarks", "fake_info_server.py"),
+         "--port", str(info_port),
+         "--latency-ms", str(args.info_latency_ms),
+         "--jitter-ms", str(args.info_jitter_ms),
+         "--error-rate", str(args.info_error_rate),
+         "--rate-limit-rate", str(args.info_rate_limit_rate)],
+        dict(os.environ),
+        os.path.join(workdir, "fake-info.log"),
+    )
+    print(f"🧪 Logs and scratch DB in {workdir}")
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "duration_seconds": args.duration,
+            "app_workers": args.app_workers,
+            "database": "postgresql" if args.database_url and args.database_url.startswith("postgres") else "sqlite",
+            "app_env": {
+                app_config: dict(APP_CONFIGS[app_config], **dict(item.split("=", 1) for item in args.app_env))
+                for app_config in args.app_config
+            },
+            "info": {
+                "latency_ms": args.info_latency_ms,
+                "jitter_ms": args.info_jitter_ms,
+                "error_rate": args.info_error_rate,
+                "rate_limit_rate": args.info_rate_limit_rate,
+            },
+        },
+        "scenarios": [],
+    }
+
+    try:
+        for app_config in args.app_config:
+            for participants in args.participants:
+                results["scenarios"].append(await run_scenario(args, app_config, participants, info_url, workdir))
+        async with httpx.AsyncClient() as client:
+            results["info_stats"] = (await client.get(f"{info_url}/stats")).json()
+    finally:
+        stop_process(fake_info)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{commit or 'nogit'}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,260 @@
+"""
+Bulk user import for Blockblock Trading Competition
+- Admin uploads a CSV or JSONL cohort (username, PIN, wallet)
+- Rows are validated like a normal sign-up and deduped against the file
+  and the database with one query
+- PINs are hashed on the bounded bcrypt pool and initial balances fetched
+  concurrently, both with capped parallelism
+- Every valid row is inserted in one transaction
+- The report is streamed as NDJSON: one line per row, then a summary
+"""
+
+import os
+import csv
+import io
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from database import AsyncSessionLocal
+from models import User
+
+# Import limits
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "1000"))
+# In-flight initial-balance fetches (the shared rate limiter still applies on top)
+BULK_IMPORT_FETCH_CONCURRENCY = int(os.getenv("BULK_IMPORT_FETCH_CONCURRENCY", "8"))
+
+# Accepted column names -> UserRegister field
+FIELD_ALIASES = {
+    "username": "username",
+    "name": "username",
+    "password": "password",
+    "pin": "password",
+    "wallet_address": "wallet_address",
+    "wallet": "wallet_address",
+    "address": "wallet_address",
+}
+
+
+class ImportFileError(ValueError):
+    """The upload as a whole can't be read (bad encoding, no header, too many rows)"""
+
+
+def _normalize(raw: dict) -> dict:
+    row = {}
+    for key, value in raw.items():
+        field = FIELD_ALIASES.get(str(key or "").strip().lower())
+        if field is not None and value is not None:
+            row[field] = str(value).strip()
+    return row
+
+
+def parse_import_file(data: bytes, filename: str = "") -> List[Tuple[int, dict]]:
+    """
+    (line number, fields) for every non-blank data row.
+    JSONL when the name ends in .jsonl/.ndjson or the content starts with '{', CSV otherwise.
+    A row that isn't valid JSON comes back with an "_error" field instead of failing the file.
+    """
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFileError("UTF-8 파일만 업로드할 수 있습니다")
+
+    is_jsonl = filename.lower().endswith((".jsonl", ".ndjson")) or text.lstrip().startswith("{")
+    rows: List[Tuple[int, dict]] = []
+
+    if is_jsonl:
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                value = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                rows.append((line_no, {"_error": "JSON 형식이 올바르지 않습니다"}))
+                continue
+            if not isinstance(value, dict):
+                rows.append((line_no, {"_error": "각 줄은 JSON 객체여야 합니다"}))
+                continue
+            rows.append((line_no, _normalize(value)))
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or "username" not in {FIELD_ALIASES.get(f.strip().lower()) for f in reader.fieldnames}:
+            raise ImportFileError("CSV 첫 줄에 username, password(pin), wallet_address 헤더가 필요합니다")
+        for raw in reader:
+            if not any((value or "").strip() for value in raw.values() if isinstance(value, str)):
+                continue
+            rows.append((reader.line_num, _normalize(raw)))
+
+    if len(rows) > BULK_IMPORT_MAX_ROWS:
+        raise ImportFileError(f"한 번에 최대 {BULK_IMPORT_MAX_ROWS}명까지 가져올 수 있습니다")
+    return rows
+
+
+def _ndjson(item: dict) -> bytes:
+    return orjson.dumps(item) + b"\n"
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    if first.get("type") == "missing":
+        return f"{first['loc'][0]} 값이 없습니다"
+    message = first.get("msg", "")
+    # field_validator의 ValueError는 "Value error, <메시지>" 형태
+    return message.removeprefix("Value error, ") or "입력값이 올바르지 않습니다"
+
+
+class BulkUserImport:
+    """
+    One import run. validate builds the UserRegister model,
+    hash_password queues on the bcrypt pool (waiting rather than being
+    refused), fetch_initial_balance returns the wallet's account value
+    (None when it can't be fetched).
+    """
+
+    def __init__(
+        self,
+        validate: Callable[..., object],
+        hash_password: Callable[[str], Awaitable[str]],
+        fetch_initial_balance: Callable[[str], Awaitable[Optional[float]]],
+        hash_concurrency: int,
+        approve: bool = False,
+        fetch_concurrency: int = BULK_IMPORT_FETCH_CONCURRENCY,
+    ):
+        self._validate = validate
+        self._hash_password = hash_password
+        self._fetch_initial_balance = fetch_initial_balance
+        # At most one job per bcrypt worker, so logins never queue behind the whole cohort
+        self._hash_slots = asyncio.Semaphore(max(1, hash_concurrency))
+        self._fetch_slots = asyncio.Semaphore(max(1, fetch_concurrency))
+        self.approve = approve
+        self.created_ids: List[int] = []
+
+    async def _hash(self, password: str) -> str:
+        async with self._hash_slots:
+            return await self._hash_password(password)
+
+    async def _balance(self, wallet_address: str) -> Optional[float]:
+        async with self._fetch_slots:
+            try:
+                return await self._fetch_initial_balance(wallet_address)
+            except Exception as e:
+                print(f"초기 자산 조회 실패 ({wallet_address}): {e}")
+                return None
+
+    async def _existing(self, accepted: List[Tuple[int, object]]) -> Tuple[set, set]:
+        """Usernames and wallets already taken, in one query"""
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(User.username, User.wallet_address).where(or_(
+                    User.username.in_([data.username for _, data in accepted]),
+                    User.wallet_address.in_([data.wallet_address for _, data in accepted]),
+                ))
+            )).all()
+        return {row.username for row in rows}, {row.wallet_address for row in rows}
+
+    async def run(self, rows: List[Tuple[int, dict]]) -> AsyncIterator[bytes]:
+        report = {"created": 0, "failed": 0}
+
+        def failed(line_no: int, username: Optional[str], error: str) -> bytes:
+            report["failed"] += 1
+            return _ndjson({"row": line_no, "status": "error", "username": username, "error": error})
+
+        # 1) 형식 검증 + 파일 내 중복 제거
+        accepted: List[Tuple[int, object]] = []
+        seen_usernames, seen_wallets = set(), set()
+        for line_no, fields in rows:
+            if "_error" in fields:
+                yield failed(line_no, None, fields["_error"])
+                continue
+            try:
+                data = self._validate(**fields)
+            except ValidationError as e:
+                yield failed(line_no, fields.get("username"), _validation_message(e))
+                continue
+            if data.username in seen_usernames:
+                yield failed(line_no, data.username, "파일 안에서 사용자 이름이 중복되었습니다")
+                continue
+            if data.wallet_address in seen_wallets:
+                yield failed(line_no, data.username, "파일 안에서 지갑 주소가 중복되었습니다")
+                continue
+            seen_usernames.add(data.username)
+            seen_wallets.add(data.wallet_address)
+            accepted.append((line_no, data))
+
+        # 2) 기존 사용자와 중복 (쿼리 한 번)
+        if accepted:
+            taken_usernames, taken_wallets = await self._existing(accepted)
+            remaining = []
+            for line_no, data in accepted:
+                if data.username in taken_usernames:
+                    yield failed(line_no, data.username, "이미 사용 중인 사용자 이름입니다")
+                elif data.wallet_address in taken_wallets:
+                    yield failed(line_no, data.username, "이미 등록된 지갑 주소입니다")
+                else:
+                    remaining.append((line_no, data))
+            accepted = remaining
+
+        # 3) 비밀번호 해시 + 초기 자산 조회 (동시, 각각 상한 적용)
+        if accepted:
+            hashes, balances = await asyncio.gather(
+                asyncio.gather(*(self._hash(data.password) for _, data in accepted), return_exceptions=True),
+                asyncio.gather(*(self._balance(data.wallet_address) for _, data in accepted)),
+            )
+
+            hashed = []
+            for (line_no, data), password_hash, balance in zip(accepted, hashes, balances):
+                if isinstance(password_hash, Exception):
+                    print(f"비밀번호 해시 실패 ({data.username}): {password_hash}")
+                    yield failed(line_no, data.username, "비밀번호 처리에 실패했습니다")
+                else:
+                    hashed.append(((line_no, data), password_hash, balance))
+
+            # 4) 한 트랜잭션으로 저장
+            values = [
+                {
+                    "username": data.username,
+                    "password_hash": password_hash,
+                    "wallet_address": data.wallet_address,
+                    "role": "user",
+                    "is_approved": self.approve,
+                    "is_active": True,
+                    "initial_balance": balance,
+                    "current_balance": balance,
+                    "profit_rate": 0.0,
+                }
+                for (_, data), password_hash, balance in hashed
+            ]
+            accepted = [row for row, _, _ in hashed]
+            if values:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        async with db.begin():
+                            ids = (await db.scalars(
+                                insert(User).returning(User.id, sort_by_parameter_order=True),
+                                values
+                            )).all()
+                except IntegrityError:
+                    # 검사 이후 다른 요청이 같은 이름/지갑을 등록한 경우: 전체 롤백
+                    for line_no, data in accepted:
+                        yield failed(line_no, data.username, "동시에 등록된 사용자와 중복되어 저장하지 않았습니다")
+                except Exception as e:
+                    print(f"일괄 등록 저장 실패: {e}")
+                    for line_no, data in accepted:
+                        yield failed(line_no, data.username, "저장에 실패했습니다 (전체 롤백)")
+                else:
+                    self.created_ids = list(ids)
+                    for (line_no, data), user_id, row in zip(accepted, ids, values):
+                        report["created"] += 1
+                        yield _ndjson({
+                            "row": line_no,
+                            "status": "created",
+                            "username": data.username,
+                            "user_id": user_id,
+                            "initial_balance": row["initial_balance"],
+                        })
+
+        yield _ndjson({"summary": {"total": len(rows), **report, "approved": self.approve}})
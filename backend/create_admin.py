@@ -4,35 +4,46 @@ Run this once after deployment: python create_admin.py
 """
 
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from models import User, Base
-from auth import hash_password
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Database URL
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-
-if not DATABASE_URL:
+if not os.getenv("DATABASE_URL"):
     print("❌ ERROR: DATABASE_URL not found in environment variables")
     print("Please set DATABASE_URL in your .env file")
     exit(1)
 
-# Create engine and session
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+# Reuse the app's engine settings (URL normalisation, statement timeout)
+from database import engine, SessionLocal
+from models import User, Base
+
+# Indexes made redundant by later ones; dropped so writes stop maintaining them
+RETIRED_INDEXES = [
+    "ix_users_rank",  # superseded by the partial ix_users_participants_rank
+]
+
 
 def create_admin():
     """Create the first admin account"""
     
     # Create all tables
     print("📦 Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    # One connection and transaction for the whole schema check
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Index builds may outlast the request-sized statement timeout
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+        Base.metadata.create_all(bind=conn)
+        # create_all skips existing tables, so add indexes introduced since they were created
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+        for name in RETIRED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
     print("✅ Tables created successfully")
     
     db = SessionLocal()
@@ -53,6 +64,9 @@ def create_admin():
             print(f"   Approved: {existing_admin.is_approved}")
             return
         
+        # bcrypt/passlib only load when an account actually has to be created
+        from auth import hash_password
+
         # Create admin account
         admin_user = User(
             username="Water",
@@ -1,5 +1,7 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -9,20 +11,68 @@ load_dotenv()
 
 # DATABASE_URL 환경변수에서 가져오기
 DATABASE_URL = os.getenv("DATABASE_URL")
+if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# SQLAlchemy 엔진 생성
-engine = create_engine(DATABASE_URL)
+# 커넥션 풀 설정
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+# 비동기 드라이버 (Postgres: asyncpg, 로컬 테스트용 SQLite: aiosqlite)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _engine_kwargs(url, is_async: bool) -> dict:
+    """풀 크기/오버플로/pre-ping/statement timeout 설정"""
+    kwargs = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if url.get_backend_name() == "sqlite":
+        return kwargs
+
+    kwargs.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+    )
+    if url.get_backend_name() == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+        if is_async:
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
+
+
+_sync_url = make_url(DATABASE_URL)
+_async_url = _sync_url.set(
+    drivername=ASYNC_DRIVERS.get(_sync_url.get_backend_name(), _sync_url.drivername)
+)
+
+# SQLAlchemy 엔진 생성 (동기: 백그라운드 작업/스크립트용)
+engine = create_engine(_sync_url, **_engine_kwargs(_sync_url, is_async=False))
+
+# 비동기 엔진 (요청 핸들러용, 이벤트 루프를 막지 않음)
+async_engine = create_async_engine(_async_url, **_engine_kwargs(_async_url, is_async=True))
 
 # 세션 로컬 클래스 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 세션 (커밋 후 속성 접근 시 lazy load가 일어나지 않도록 expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base 클래스 생성
 Base = declarative_base()
 
-# 데이터베이스 세션 의존성
-def get_db():
-    db = SessionLocal()
-    try:
+# 비동기 데이터베이스 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,178 @@
+"""
+Async Hyperliquid client for Blockblock Trading Competition
+- Keep-alive connection pool shared by every /info request
+- Bounded concurrency via a semaphore
+- Per-request timeout and retry with jittered exponential backoff
+- Concurrent requests for the same wallet share one upstream call
+- Every request passes the shared weight budget in priority order
+"""
+
+import os
+import time
+import random
+import asyncio
+from typing import Any, Optional
+
+import httpx
+
+from metrics import observe_upstream
+from rate_limit import Priority, TokenBucketScheduler
+from singleflight import SingleFlight
+
+# Client configuration
+HYPERLIQUID_API_URL = os.getenv("HYPERLIQUID_API_URL", "https://api.hyperliquid.xyz")
+HYPERLIQUID_MAX_CONCURRENCY = int(os.getenv("HYPERLIQUID_MAX_CONCURRENCY", "32"))
+HYPERLIQUID_TIMEOUT_SECONDS = float(os.getenv("HYPERLIQUID_TIMEOUT_SECONDS", "5"))
+HYPERLIQUID_MAX_RETRIES = int(os.getenv("HYPERLIQUID_MAX_RETRIES", "3"))
+HYPERLIQUID_BACKOFF_SECONDS = float(os.getenv("HYPERLIQUID_BACKOFF_SECONDS", "0.2"))
+
+# Status codes worth retrying: rate limited or upstream hiccup
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Request weights from the Hyperliquid rate-limit docs; everything else is 20
+INFO_WEIGHTS = {
+    "clearinghouseState": 2,
+    "allMids": 2,
+    "l2Book": 2,
+    "orderStatus": 2,
+    "spotClearinghouseState": 2,
+    "exchangeStatus": 2,
+}
+DEFAULT_INFO_WEIGHT = 20
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class HyperliquidError(Exception):
+    """Raised when an /info request fails after all retries"""
+
+
+class HyperliquidClient:
+    """
+    Native asyncio client for the Hyperliquid /info endpoint.
+    The underlying connection pool is created lazily on first use so the
+    client can be constructed at import time without touching the network.
+    """
+
+    def __init__(
+        self,
+        base_url: str = HYPERLIQUID_API_URL,
+        max_concurrency: int = HYPERLIQUID_MAX_CONCURRENCY,
+        timeout: float = HYPERLIQUID_TIMEOUT_SECONDS,
+        max_retries: int = HYPERLIQUID_MAX_RETRIES,
+        backoff: float = HYPERLIQUID_BACKOFF_SECONDS,
+        scheduler: Optional[TokenBucketScheduler] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._single_flight = SingleFlight()
+        self.scheduler = scheduler or TokenBucketScheduler()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    async def post_info(
+        self,
+        payload: dict,
+        priority: Priority = Priority.REFRESH,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        POST /info within the rate budget, with bounded concurrency and retries.
+        timeout (default: the client's) covers each HTTP attempt only, not the
+        wait for rate budget or a connection slot.
+        """
+        client = self._get_client()
+        request_type = payload.get("type", "unknown")
+        weight = INFO_WEIGHTS.get(request_type, DEFAULT_INFO_WEIGHT)
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_retries + 1):
+            started = None
+            try:
+                await self.scheduler.acquire(weight, priority)
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    response = await client.post(
+                        "/info", json=payload,
+                        timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+                    )
+                elapsed = time.perf_counter() - started
+                if response.status_code == 429:
+                    self.scheduler.on_rate_limited(_retry_after_seconds(response))
+                elif response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    self.scheduler.on_success()
+                    data = response.json()
+                    observe_upstream(request_type, elapsed)
+                    return data
+                observe_upstream(request_type, elapsed, str(response.status_code))
+                last_error = HyperliquidError(f"HTTP {response.status_code} from /info")
+            except httpx.HTTPStatusError as e:
+                observe_upstream(request_type, elapsed, str(e.response.status_code))
+                raise HyperliquidError(f"HTTP {e.response.status_code} from /info") from e
+            except (httpx.TransportError, ValueError) as e:
+                if started is not None:
+                    observe_upstream(request_type, time.perf_counter() - started, type(e).__name__)
+                last_error = e
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._retry_delay(attempt))
+
+        raise HyperliquidError(f"/info request failed: {last_error}") from last_error
+
+    async def user_state(
+        self,
+        address: str,
+        priority: Priority = Priority.REFRESH,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        clearinghouseState for a single wallet.
+        Concurrent callers for the same address share one request (with the
+        first caller's priority and timeout), so treat the returned dict as
+        read-only.
+        """
+        address = address.lower()
+        return await self._single_flight.do(
+            ("clearinghouseState", address),
+            lambda: self.post_info({"type": "clearinghouseState", "user": address}, priority, timeout),
+        )
+
+    async def all_mids(self, priority: Priority = Priority.REFRESH) -> dict:
+        """coin -> mid price for every listed coin, in one weight-2 request"""
+        mids = await self._single_flight.do(
+            ("allMids",),
+            lambda: self.post_info({"type": "allMids"}, priority),
+        )
+        return {coin: float(px) for coin, px in mids.items()}
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
@@ -0,0 +1,259 @@
+"""
+Hyperliquid WebSocket ingestion for Blockblock Trading Competition
+- Subscribes a per-user channel (webData2) for the top approved wallets, up
+  to Hyperliquid's per-IP cap on user-specific subscriptions
+- A wallet counts as live only once the server acknowledged its subscription;
+  rejected subscriptions are dropped, so those wallets stay on REST polling
+- Reconnects with jittered backoff and resubscribes everything on reconnect
+- Hands each clearinghouseState to a callback as it arrives
+- Can record raw frames to a JSONL file for replay (see ws_replay_server.py)
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+from typing import AbstractSet, Callable, Iterable, Optional, Set, TextIO
+
+import websockets
+
+# Ingestion configuration
+HYPERLIQUID_INGESTION_MODE = os.getenv("HYPERLIQUID_INGESTION_MODE", "poll")  # 'poll', 'ws' or 'mark'
+HYPERLIQUID_WS_URL = os.getenv("HYPERLIQUID_WS_URL", "wss://api.hyperliquid.xyz/ws")
+HYPERLIQUID_WS_CHANNEL = os.getenv("HYPERLIQUID_WS_CHANNEL", "webData2")
+HYPERLIQUID_WS_PING_SECONDS = float(os.getenv("HYPERLIQUID_WS_PING_SECONDS", "50"))
+HYPERLIQUID_WS_MAX_BACKOFF_SECONDS = float(os.getenv("HYPERLIQUID_WS_MAX_BACKOFF_SECONDS", "30"))
+HYPERLIQUID_WS_RECONCILE_SECONDS = float(os.getenv("HYPERLIQUID_WS_RECONCILE_SECONDS", "300"))
+# Hyperliquid tracks at most 10 distinct users per IP across user-specific subscriptions
+HYPERLIQUID_WS_MAX_SUBSCRIPTIONS = int(os.getenv("HYPERLIQUID_WS_MAX_SUBSCRIPTIONS", "10"))
+HYPERLIQUID_WS_RECORD_PATH = os.getenv("HYPERLIQUID_WS_RECORD_PATH")
+# Recorded frames are buffered in memory and flushed at most this often
+RECORD_FLUSH_SECONDS = 1.0
+
+ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]{40}")
+
+
+def subscription_message(method: str, channel: str, address: str) -> str:
+    return json.dumps({"method": method, "subscription": {"type": channel, "user": address}})
+
+
+class HyperliquidStream:
+    """
+    One WebSocket connection carrying a subscription per wallet.
+    The wanted wallet set can change at any time; the live connection is
+    brought in line incrementally and fully re-established on reconnect.
+    on_live gets the acknowledged wallets whenever that set changes.
+    """
+
+    def __init__(
+        self,
+        on_state: Callable[[str, dict], None],
+        on_live: Optional[Callable[[AbstractSet[str]], None]] = None,
+        url: str = HYPERLIQUID_WS_URL,
+        channel: str = HYPERLIQUID_WS_CHANNEL,
+        ping_interval: float = HYPERLIQUID_WS_PING_SECONDS,
+        max_backoff: float = HYPERLIQUID_WS_MAX_BACKOFF_SECONDS,
+        record_path: Optional[str] = HYPERLIQUID_WS_RECORD_PATH,
+        max_subscriptions: int = HYPERLIQUID_WS_MAX_SUBSCRIPTIONS,
+    ):
+        self._on_state = on_state
+        self._on_live = on_live
+        self.url = url
+        self.channel = channel
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+        self.record_path = record_path
+        self.max_subscriptions = max_subscriptions
+        self._wallets: Set[str] = set()
+        # Subscribe sent / acknowledged by the server / refused by the server
+        self._subscribed: Set[str] = set()
+        self._confirmed: Set[str] = set()
+        self._rejected: Set[str] = set()
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._record_file: Optional[TextIO] = None
+        self._record_flushed_at = 0.0
+        self.frames = 0
+        self.reconnects = 0
+        self.errors = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    @property
+    def live_count(self) -> int:
+        return len(self._confirmed)
+
+    def set_wallets(self, addresses: Iterable[str]) -> None:
+        """
+        Replace the wanted wallets (in priority order); (un)subscribes on the
+        live connection. At most max_subscriptions are kept: wallets already
+        wanted keep their slot, free slots go to the first new addresses.
+        """
+        addresses = [address.lower() for address in addresses]
+        present = set(addresses)
+        wanted = {address for address in self._wallets if address in present}
+        for address in addresses:
+            if len(wanted) >= self.max_subscriptions:
+                break
+            wanted.add(address)
+        if wanted == self._wallets:
+            return
+        self._wallets = wanted
+        # A freed slot may let a refused wallet in now
+        self._rejected = set()
+        if self._ws is not None and (self._sync_task is None or self._sync_task.done()):
+            self._start_sync(self._ws)
+
+    def _start_sync(self, ws) -> None:
+        self._sync_task = asyncio.create_task(self._sync_subscriptions(ws))
+        self._sync_task.add_done_callback(_report_sync_error)
+
+    async def _sync_subscriptions(self, ws) -> None:
+        # Loop until stable: the wanted set may change while we are sending
+        while self._ws is ws:
+            to_add = self._wallets - self._subscribed - self._rejected
+            to_remove = self._subscribed - self._wallets
+            if not (to_add or to_remove):
+                return
+            # Unsubscribe first so the server-side cap has room for the new wallets
+            for address in to_remove:
+                await ws.send(subscription_message("unsubscribe", self.channel, address))
+                self._subscribed.discard(address)
+                self._set_live(address, False)
+            for address in to_add:
+                await ws.send(subscription_message("subscribe", self.channel, address))
+                self._subscribed.add(address)
+
+    def _set_live(self, address: str, live: bool) -> None:
+        if live == (address in self._confirmed):
+            return
+        if live:
+            self._confirmed.add(address)
+        else:
+            self._confirmed.discard(address)
+        self._notify_live()
+
+    def _notify_live(self) -> None:
+        if self._on_live is not None:
+            self._on_live(frozenset(self._confirmed))
+
+    def _handle_subscription_response(self, data: dict) -> None:
+        subscription = data.get("subscription") or {}
+        address = (subscription.get("user") or "").lower()
+        if data.get("method") == "subscribe" and subscription.get("type") == self.channel and address in self._subscribed:
+            self._set_live(address, True)
+
+    def _handle_error(self, data) -> None:
+        """A refused subscription names its wallet; that wallet stays on REST polling"""
+        self.errors += 1
+        refused = {address.lower() for address in ADDRESS_PATTERN.findall(str(data))} & self._subscribed
+        print(f"Hyperliquid WS 오류: {data}")
+        for address in refused:
+            self._subscribed.discard(address)
+            self._rejected.add(address)
+            self._set_live(address, False)
+
+    async def _ping(self, ws) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send(json.dumps({"method": "ping"}))
+
+    def _record(self, raw: str) -> None:
+        """Append to the recording through one buffered handle instead of an open() per frame"""
+        if self._record_file is None:
+            self._record_file = open(self.record_path, "a", buffering=1 << 16)
+        self._record_file.write(raw.strip() + "\n")
+        now = time.monotonic()
+        if now - self._record_flushed_at >= RECORD_FLUSH_SECONDS:
+            self._record_file.flush()
+            self._record_flushed_at = now
+
+    def _handle(self, raw: str) -> None:
+        self.frames += 1
+        if self.record_path:
+            self._record(raw)
+
+        message = json.loads(raw)
+        channel = message.get("channel")
+        if channel == "subscriptionResponse":
+            self._handle_subscription_response(message.get("data") or {})
+            return
+        if channel == "error":
+            self._handle_error(message.get("data"))
+            return
+        if channel != self.channel:
+            return
+        data = message.get("data") or {}
+        address = data.get("user")
+        state = data.get("clearinghouseState")
+        if address and state:
+            self._on_state(address.lower(), state)
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.url, ping_interval=None, max_size=None) as ws:
+                    self._ws = ws
+                    self._subscribed = set()
+                    self._rejected = set()
+                    backoff = 1.0
+                    self._start_sync(ws)
+                    pinger = asyncio.create_task(self._ping(ws))
+                    try:
+                        async for raw in ws:
+                            try:
+                                self._handle(raw)
+                            except Exception as e:
+                                print(f"Hyperliquid WS 메시지 처리 실패: {e}")
+                    finally:
+                        pinger.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Hyperliquid WS 연결 오류: {e}")
+            finally:
+                self._ws = None
+                self._subscribed = set()
+                if self._confirmed:
+                    self._confirmed = set()
+                    self._notify_live()
+
+            self.reconnects += 1
+            await asyncio.sleep(random.uniform(0, backoff))
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass  # already reported by _report_sync_error
+            self._sync_task = None
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+
+
+def _report_sync_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Hyperliquid WS 구독 동기화 실패: {task.exception()}")
@@ -0,0 +1,164 @@
+"""
+Leader election across uvicorn workers for Blockblock Trading Competition
+- Exactly one worker refreshes wallets and publishes the leaderboard
+- File lock (flock) for workers on one host, Postgres advisory lock across hosts
+- Both locks are released by the OS / database when the holder dies, so a
+  waiting worker takes over within one retry interval
+"""
+
+import os
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text
+
+# Election configuration
+LEADER_LOCK_RETRY_SECONDS = float(os.getenv("LEADER_LOCK_RETRY_SECONDS", "2"))
+# Arbitrary application-wide key for pg_try_advisory_lock
+LEADER_ADVISORY_LOCK_KEY = 0x426C6B42  # "BlkB"
+
+
+class FileLeaderLock:
+    """Non-blocking exclusive flock on a file; released when the process exits"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    async def try_acquire(self) -> bool:
+        import fcntl
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    async def still_held(self) -> bool:
+        # A held flock can't be taken away from a live process
+        return self._fd is not None
+
+    async def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class PostgresLeaderLock:
+    """
+    Session-level advisory lock on a dedicated connection. If the connection
+    drops, the server releases the lock; still_held() notices on the next
+    check and the worker steps down. The connection runs in autocommit so it
+    sits "idle", not "idle in transaction", for as long as the lock is held
+    (an open transaction would hold back vacuum and could be killed by
+    idle_in_transaction_session_timeout, silently dropping the lock).
+    """
+
+    def __init__(self, engine, key: int = LEADER_ADVISORY_LOCK_KEY):
+        self.engine = engine
+        self.key = key
+        self._conn = None
+
+    async def try_acquire(self) -> bool:
+        conn = await self.engine.connect()
+        try:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key})
+        except Exception:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    async def still_held(self) -> bool:
+        if self._conn is None:
+            return False
+        try:
+            await self._conn.scalar(text("SELECT 1"))
+            return True
+        except Exception:
+            await self.release()
+            return False
+
+    async def release(self) -> None:
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            await conn.scalar(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+        except Exception:
+            pass  # connection already gone: the server dropped the lock with it
+        finally:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+
+class LeaderElector:
+    """
+    Campaigns for the lock every retry interval; runs on_elected once it
+    wins and on_demoted when it loses the lock or shuts down.
+    """
+
+    def __init__(
+        self,
+        lock,
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+        retry_seconds: float = LEADER_LOCK_RETRY_SECONDS,
+    ):
+        self.lock = lock
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self.retry_seconds = retry_seconds
+        self._leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not self._leader:
+                    if await self.lock.try_acquire():
+                        self._leader = True
+                        print(f"👑 리더 선출됨 (pid={os.getpid()})")
+                        await self._on_elected()
+                elif not await self.lock.still_held():
+                    print(f"⚠️ 리더 잠금 상실 (pid={os.getpid()})")
+                    self._leader = False
+                    await self._on_demoted()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"리더 선출 오류: {e}")
+            await asyncio.sleep(self.retry_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._leader:
+            self._leader = False
+            await self._on_demoted()
+        await self.lock.release()
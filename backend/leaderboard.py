@@ -0,0 +1,566 @@
+"""
+Leaderboard snapshot engine for Blockblock Trading Competition
+- Immutable, ranked leaderboard snapshots
+- Background refresher started from the FastAPI lifespan
+- GET /leaderboard serves the latest snapshot from memory
+- Only wallets due under the adaptive schedule are re-fetched each tick;
+  wallets never fetched start from their DB standings, marked stale
+- Pushed wallet updates (WebSocket ingestion) move single entries in between
+"""
+
+import os
+import asyncio
+from dataclasses import dataclass, field
+from functools import cached_property
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import (
+    AbstractSet, Awaitable, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+)
+
+from sqlalchemy import func, select
+
+from database import SessionLocal
+from encoded_response import EncodedJSON
+from mark_to_market import MarkToMarketBook
+from models import ACTIVE_PARTICIPANT, User
+from persistence import bulk_update_standings, insert_equity_snapshots
+from rank_index import RankIndex
+from refresh_scheduler import AdaptiveRefreshScheduler
+from singleflight import SingleFlight
+
+# Refresh configuration
+LEADERBOARD_REFRESH_INTERVAL_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_INTERVAL_SECONDS", "30"))
+LEADERBOARD_MAX_AGE_SECONDS = float(os.getenv("LEADERBOARD_MAX_AGE_SECONDS", "300"))
+# Minimum spacing between snapshots published from pushed updates
+LEADERBOARD_PUSH_PUBLISH_SECONDS = float(os.getenv("LEADERBOARD_PUSH_PUBLISH_SECONDS", "2"))
+
+DEFAULT_AVATAR = "/images/avatars/default.jpg"
+
+# Distinct (kind, after_rank, limit) pages kept encoded per snapshot
+MAX_CACHED_PAGES = 64
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    """One ranked row of a leaderboard snapshot"""
+    user_id: int
+    rank: int
+    address: str
+    name: str
+    avatar: str
+    account_value: float
+    profit_rate: float
+    initial_balance: Optional[float]
+    stale: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Wire format used by the dashboard"""
+        return {
+            "address": self.address,
+            "name": self.name,
+            "avatar": self.avatar,
+            "accountValue": self.account_value,
+            "roi24h": self.profit_rate,
+            "initial_balance": self.initial_balance,
+            "rank": self.rank,
+            "stale": self.stale,
+        }
+
+    def to_user_dict(self) -> dict:
+        """Wire format of the participant list (/api/users)"""
+        return {
+            "id": self.user_id,
+            "username": self.name,
+            "wallet_address": self.address,
+            "profile_image_url": self.avatar,
+            "profit_rate": self.profit_rate,
+            "rank": self.rank,
+        }
+
+
+@dataclass(frozen=True)
+class LeaderboardSnapshot:
+    """Ranked leaderboard at a point in time; never mutated after creation"""
+    generated_at: datetime
+    entries: Tuple[LeaderboardEntry, ...]
+    # user_id -> position in entries (rank - 1)
+    positions: Mapping[int, int] = field(default_factory=lambda: MappingProxyType({}), compare=False)
+    # (kind, after_rank, limit) -> encoded page, filled on demand
+    _pages: Dict[Tuple[str, int, Optional[int]], EncodedJSON] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    @cached_property
+    def encoded(self) -> EncodedJSON:
+        """The full snapshot, encoded once and shared by every reader"""
+        return EncodedJSON.encode(self.to_dict())
+
+    def encoded_page(self, after_rank: int = 0, limit: Optional[int] = None) -> EncodedJSON:
+        if after_rank == 0 and (limit is None or limit >= len(self.entries)):
+            return self.encoded
+        return self._encoded("leaderboard", after_rank, limit, self.to_dict)
+
+    def encoded_users(self, after_rank: int = 0, limit: Optional[int] = None) -> EncodedJSON:
+        """The same page as a participant list (/api/users), encoded once per snapshot"""
+        return self._encoded(
+            "users", after_rank, limit, lambda entries: [entry.to_user_dict() for entry in entries]
+        )
+
+    def _encoded(self, kind: str, after_rank: int, limit: Optional[int], render) -> EncodedJSON:
+        key = (kind, after_rank, limit)
+        page = self._pages.get(key)
+        if page is None:
+            page = EncodedJSON.encode(render(self.page(after_rank, limit)))
+            if len(self._pages) < MAX_CACHED_PAGES:
+                self._pages[key] = page
+        return page
+
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        return (now - self.generated_at).total_seconds()
+
+    def rank_of(self, user_id: int) -> Optional[int]:
+        position = self.positions.get(user_id)
+        return None if position is None else position + 1
+
+    def page(self, after_rank: int = 0, limit: Optional[int] = None) -> Tuple[LeaderboardEntry, ...]:
+        """Entries ranked after `after_rank` (keyset cursor), at most `limit` of them"""
+        stop = None if limit is None else after_rank + limit
+        return self.entries[after_rank:stop]
+
+    def around(self, user_id: int, n: int) -> Tuple[LeaderboardEntry, ...]:
+        """Up to n entries either side of user_id, plus the user"""
+        position = self.positions.get(user_id)
+        if position is None:
+            return ()
+        return self.entries[max(position - n, 0):position + n + 1]
+
+    def to_dict(self, entries: Optional[Tuple[LeaderboardEntry, ...]] = None) -> dict:
+        """Wire format for the whole snapshot or a slice of it"""
+        entries = self.entries if entries is None else entries
+        last_rank = entries[-1].rank if entries else None
+        return {
+            "generated_at": self.generated_at.isoformat(),
+            "total": len(self.entries),
+            "entries": [entry.to_dict() for entry in entries],
+            "next_after_rank": last_rank if last_rank is not None and last_rank < len(self.entries) else None,
+        }
+
+
+def compute_profit_rate(current_balance: float, initial_balance: Optional[float]) -> float:
+    """수익률(%) = (현재 자산 - 초기 자산) / 초기 자산 * 100"""
+    if initial_balance and initial_balance > 0:
+        return ((current_balance - initial_balance) / initial_balance) * 100
+    return 0.0
+
+
+def build_snapshot(
+    results: List[dict],
+    generated_at: Optional[datetime] = None,
+    rank_index: Optional[RankIndex] = None,
+) -> LeaderboardSnapshot:
+    """
+    Freeze wallet states into a snapshot in rank order.
+    With no rank_index the results are ranked from scratch; otherwise the
+    index must already hold exactly the users in `results`.
+    """
+    by_user = {res["user_id"]: res for res in results}
+    if rank_index is None:
+        rank_index = RankIndex()
+        for res in results:
+            rank_index.upsert(res["user_id"], res["profit_rate"])
+
+    ordered = (by_user[user_id] for user_id in rank_index)
+    entries = tuple(
+        LeaderboardEntry(
+            user_id=res["user_id"],
+            rank=i + 1,
+            address=res["address"],
+            name=res["username"],
+            avatar=res["profile_image_url"] or DEFAULT_AVATAR,
+            account_value=res["accountValue"],
+            profit_rate=res["profit_rate"],
+            initial_balance=res["initial_balance"],
+            stale=res.get("stale", False),
+            error=res.get("error"),
+        )
+        for i, res in enumerate(ordered)
+    )
+    return LeaderboardSnapshot(
+        generated_at=generated_at or datetime.now(timezone.utc),
+        entries=entries,
+        positions=MappingProxyType({entry.user_id: i for i, entry in enumerate(entries)}),
+    )
+
+
+class Participant(NamedTuple):
+    """Approved participant plus the standings currently stored in the DB"""
+    user_id: int
+    wallet_address: str
+    username: str
+    profile_image_url: Optional[str]
+    initial_balance: float
+    current_balance: Optional[float]
+    profit_rate: Optional[float]
+    rank: Optional[int]
+
+
+def load_participants() -> List[Participant]:
+    """Approved, active participants"""
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(
+                User.id, User.wallet_address, User.username, User.profile_image_url,
+                func.coalesce(User.initial_balance, 0), User.current_balance, User.profit_rate, User.rank
+            ).where(ACTIVE_PARTICIPANT)
+        )
+        return [Participant(*row) for row in rows]
+    finally:
+        db.close()
+
+
+def stored_state(p: Participant) -> dict:
+    """Wallet state from the standings in the DB, for a wallet not fetched yet (stale)"""
+    account_value = p.current_balance if p.current_balance is not None else p.initial_balance
+    return {
+        "user_id": p.user_id,
+        "address": p.wallet_address,
+        "username": p.username,
+        "profile_image_url": p.profile_image_url,
+        "accountValue": account_value,
+        "initial_balance": p.initial_balance,
+        "profit_rate": compute_profit_rate(account_value, p.initial_balance),
+        "has_positions": False,
+        "stale": True,
+        "error": None,
+    }
+
+
+def persist_snapshot(
+    snapshot: LeaderboardSnapshot,
+    participants: List[Participant],
+    sampled: Optional[AbstractSet[int]] = None,
+) -> int:
+    """
+    Write balances, profit rates and ranks back to the users table in one
+    statement, skipping users whose stored standings did not change, and
+    append the equity history for every wallet freshly fetched this tick
+    (`sampled`, default: all).
+    Returns the number of user rows written.
+    """
+    stored: Dict[int, Tuple] = {
+        p.user_id: (p.current_balance, p.profit_rate, p.rank) for p in participants
+    }
+    rows = [
+        {
+            "id": entry.user_id,
+            "current_balance": entry.account_value,
+            "profit_rate": entry.profit_rate,
+            "rank": entry.rank,
+        }
+        for entry in snapshot.entries
+        if stored.get(entry.user_id) != (entry.account_value, entry.profit_rate, entry.rank)
+    ]
+    history = [
+        {
+            "user_id": entry.user_id,
+            "account_value": entry.account_value,
+            "profit_rate": entry.profit_rate,
+        }
+        for entry in snapshot.entries
+        if not entry.stale and (sampled is None or entry.user_id in sampled)
+    ]
+    if not rows and not history:
+        return 0
+
+    db = SessionLocal()
+    try:
+        written = bulk_update_standings(db, rows)
+        insert_equity_snapshots(db, snapshot.generated_at, history)
+        db.commit()
+        return written
+    finally:
+        db.close()
+
+
+class LeaderboardRefresher:
+    """
+    Rebuilds the leaderboard snapshot on a fixed interval.
+    Readers only ever see a fully built snapshot: the reference is swapped
+    in a single assignment once ranking is complete.
+    """
+
+    def __init__(
+        self,
+        fetch_state: Callable[[str, str, Optional[str], float, Optional[float]], Awaitable[dict]],
+        interval: float = LEADERBOARD_REFRESH_INTERVAL_SECONDS,
+        scheduler: Optional[AdaptiveRefreshScheduler] = None,
+        fetch_mids: Optional[Callable[[], Awaitable[Mapping[str, float]]]] = None,
+        is_leader: Callable[[], bool] = lambda: True,
+    ):
+        self._fetch_state = fetch_state
+        # Multi-worker mode: a refresh that outlives its worker's leadership must not write
+        self._is_leader = is_leader
+        self.interval = interval
+        self.scheduler = scheduler or AdaptiveRefreshScheduler()
+        # Mark-to-market mode: wallets not re-synced this tick are revalued from one allMids call
+        self._fetch_mids = fetch_mids
+        self.mark_book: Optional[MarkToMarketBook] = MarkToMarketBook() if fetch_mids is not None else None
+        # Latest known state per user, reused for wallets not due this tick
+        self._states: Dict[int, dict] = {}
+        self._user_by_address: Dict[str, int] = {}
+        # Users updated by push since the last persisted tick
+        self._pushed: Set[int] = set()
+        self._republish_handle: Optional[asyncio.TimerHandle] = None
+        self._snapshot: Optional[LeaderboardSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._listeners: List[Callable[[Optional[LeaderboardSnapshot], LeaderboardSnapshot], None]] = []
+        self._single_flight = SingleFlight()
+        self.rank_index = RankIndex()
+
+    @property
+    def snapshot(self) -> Optional[LeaderboardSnapshot]:
+        return self._snapshot
+
+    def add_listener(self, listener: Callable[[Optional[LeaderboardSnapshot], LeaderboardSnapshot], None]) -> None:
+        """Called with (previous, current) every time a new snapshot is published"""
+        self._listeners.append(listener)
+
+    def _publish(self, snapshot: LeaderboardSnapshot) -> None:
+        snapshot.encoded  # encode once here rather than in the first request
+        previous = self._snapshot
+        self._snapshot = snapshot
+        for listener in self._listeners:
+            try:
+                listener(previous, snapshot)
+            except Exception as e:
+                print(f"리더보드 리스너 오류: {e}")
+
+    def adopt_snapshot(self, snapshot: LeaderboardSnapshot) -> None:
+        """Publish a snapshot built by another worker (follower side of LEADERBOARD_SHARING)"""
+        self._publish(snapshot)
+
+    def seed_from_snapshot(self, snapshot: LeaderboardSnapshot) -> None:
+        """
+        Take over a follower's last adopted snapshot as the known state, so a
+        newly elected leader refreshes on its normal schedule instead of
+        refetching every wallet at once (entries stay stale until refetched).
+        """
+        self._seed(snapshot.entries)
+
+    def restore_snapshot(self, snapshot: LeaderboardSnapshot, user_ids: AbstractSet[int], serve: bool) -> int:
+        """
+        Warm start from a snapshot persisted by an earlier process. Entries
+        for users who are no longer participants are dropped; with serve,
+        the rest is published right away (keeping the original generated_at
+        so staleness checks still apply). Every entry is marked stale until
+        this process refetches it. Returns the number of entries kept.
+        """
+        entries = [entry for entry in snapshot.entries if entry.user_id in user_ids]
+        self._seed(entries)
+        if serve and entries:
+            self._publish(build_snapshot(
+                list(self._states.values()), generated_at=snapshot.generated_at, rank_index=self.rank_index
+            ))
+        return len(entries)
+
+    def _seed(self, entries) -> None:
+        """Known state from entries this process did not fetch itself, hence stale"""
+        self._states = {
+            entry.user_id: {
+                "user_id": entry.user_id,
+                "address": entry.address,
+                "username": entry.name,
+                "profile_image_url": entry.avatar,
+                "accountValue": entry.account_value,
+                "initial_balance": entry.initial_balance,
+                "profit_rate": entry.profit_rate,
+                "has_positions": False,
+                "stale": True,
+                "error": entry.error,
+            }
+            for entry in entries
+        }
+        self._user_by_address = {entry.address.lower(): entry.user_id for entry in entries}
+        self._sync_rank_index(self._states)
+
+    async def refresh(self) -> LeaderboardSnapshot:
+        """
+        Fetch the participants that are due, rank, persist and publish.
+        Overlapping calls join the refresh already in progress.
+        """
+        return await self._single_flight.do("leaderboard", self._refresh)
+
+    async def _refresh(self) -> LeaderboardSnapshot:
+        loop = asyncio.get_running_loop()
+        participants = await loop.run_in_executor(None, load_participants)
+
+        # The scheduler caps every fetch, unseen wallets included; wallets not
+        # reached yet are served from their DB standings (stale) meanwhile
+        selected = set(self.scheduler.select([p.user_id for p in participants], self.interval))
+        to_fetch = [p for p in participants if p.user_id in selected]
+        results = await asyncio.gather(*(
+            self._fetch_state(
+                p.wallet_address, p.username, p.profile_image_url, p.initial_balance, p.current_balance
+            )
+            for p in to_fetch
+        ))
+
+        fetched: Dict[int, dict] = {}
+        for p, res in zip(to_fetch, results):
+            fetched[p.user_id] = state = dict(res, user_id=p.user_id)
+            book = state.pop("book", None)
+            if not res.get("stale"):
+                self.scheduler.record(p.user_id, res["accountValue"], res.get("has_positions", False))
+                if self.mark_book is not None and book is not None:
+                    self.mark_book.set_wallet(p.user_id, *book)
+
+        revalued = await self._revalue([p.user_id for p in participants if p.user_id not in fetched])
+
+        states: Dict[int, dict] = {}
+        for p in participants:
+            state = fetched.get(p.user_id)
+            if state is None and p.user_id not in self._states:
+                state = stored_state(p)
+            elif state is None:
+                state = dict(self._states[p.user_id], username=p.username, profile_image_url=p.profile_image_url)
+                if p.user_id in revalued:
+                    state.update(
+                        accountValue=revalued[p.user_id],
+                        profit_rate=compute_profit_rate(revalued[p.user_id], state["initial_balance"]),
+                    )
+            states[p.user_id] = state
+        for user_id in self._states.keys() - states.keys():
+            self.scheduler.forget(user_id)
+        if self.mark_book is not None:
+            self.mark_book.retain(states.keys())
+        self._states = states
+        self._user_by_address = {p.wallet_address.lower(): p.user_id for p in participants}
+        sampled = set(fetched) | set(revalued) | (self._pushed & states.keys())
+        self._pushed = set()
+
+        self._sync_rank_index(states)
+        snapshot = build_snapshot(list(states.values()), rank_index=self.rank_index)
+        if not self._is_leader():
+            # Demoted while fetching: the standings belong to the new leader now
+            return snapshot
+        persisting = loop.run_in_executor(None, persist_snapshot, snapshot, participants, sampled)
+        try:
+            await asyncio.shield(persisting)
+        except asyncio.CancelledError:
+            # The write can't be interrupted; let stop() return only after it has finished
+            await persisting
+            raise
+        self._publish(snapshot)
+        return snapshot
+
+    async def _revalue(self, user_ids: List[int]) -> Dict[int, float]:
+        """
+        Mark-to-market equity for wallets not re-synced this tick, from one
+        allMids call. Empty when disabled or when the price fetch fails; those
+        wallets then keep their last values.
+        """
+        if self.mark_book is None or not user_ids or not len(self.mark_book):
+            return {}
+        try:
+            mids = await self._fetch_mids()
+        except Exception as e:
+            print(f"allMids 조회 실패: {e}")
+            return {}
+        return self.mark_book.revalue(mids, user_ids)
+
+    def _sync_rank_index(self, states: Dict[int, dict]) -> None:
+        """Move only the users whose profit rate changed and drop users who left"""
+        for user_id in self.rank_index.user_ids():
+            if user_id not in states:
+                self.rank_index.remove(user_id)
+        for user_id, state in states.items():
+            self.rank_index.upsert(user_id, state["profit_rate"])
+
+    def apply_wallet_state(self, address: str, account_value: float, has_positions: bool = False) -> bool:
+        """
+        Apply a pushed equity update for one wallet: O(log n) rank move now,
+        snapshot republished at most every LEADERBOARD_PUSH_PUBLISH_SECONDS,
+        DB write-back on the next regular tick.
+        Returns False for unknown wallets or unchanged values.
+        """
+        user_id = self._user_by_address.get(address.lower())
+        previous = self._states.get(user_id) if user_id is not None else None
+        if previous is None:
+            return False
+        if previous["accountValue"] == account_value and not previous.get("stale"):
+            return False
+
+        profit_rate = compute_profit_rate(account_value, previous["initial_balance"])
+        self._states[user_id] = dict(
+            previous,
+            accountValue=account_value,
+            profit_rate=profit_rate,
+            has_positions=has_positions,
+            stale=False,
+            error=None,
+        )
+        self.rank_index.upsert(user_id, profit_rate)
+        self._pushed.add(user_id)
+
+        if self._republish_handle is None:
+            self._republish_handle = asyncio.get_running_loop().call_later(
+                LEADERBOARD_PUSH_PUBLISH_SECONDS, self._republish
+            )
+        return True
+
+    def user_ids_for(self, addresses: Iterable[str]) -> Set[int]:
+        """Participants behind the given wallet addresses (unknown ones are skipped)"""
+        return {
+            self._user_by_address[address.lower()]
+            for address in addresses
+            if address.lower() in self._user_by_address
+        }
+
+    def _republish(self) -> None:
+        """Publish a snapshot from in-memory state without fetching or DB work"""
+        self._republish_handle = None
+        self._publish(build_snapshot(list(self._states.values()), rank_index=self.rank_index))
+
+    def request_refresh(self) -> None:
+        """Wake the refresher early (e.g. after an admin approves a user)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"리더보드 갱신 실패: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._republish_handle is not None:
+            self._republish_handle.cancel()
+            self._republish_handle = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # The refresh itself is shielded from _run's cancellation; stop it too
+        await self._single_flight.cancel()
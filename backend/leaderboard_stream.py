@@ -0,0 +1,123 @@
+"""
+Leaderboard push stream for Blockblock Trading Competition
+- Server-Sent Events: full snapshot on connect, then deltas only
+- One diff + one encoding per refresh, fanned out to every subscriber
+- Slow subscribers are resynced with a full snapshot instead of buffering
+"""
+
+import os
+import asyncio
+from typing import Dict, Optional, Set
+
+import orjson
+
+from leaderboard import LeaderboardSnapshot
+
+# Stream configuration
+LEADERBOARD_STREAM_HEARTBEAT_SECONDS = float(os.getenv("LEADERBOARD_STREAM_HEARTBEAT_SECONDS", "15"))
+LEADERBOARD_STREAM_QUEUE_SIZE = int(os.getenv("LEADERBOARD_STREAM_QUEUE_SIZE", "8"))
+
+HEARTBEAT = ": keep-alive\n\n"
+
+
+def encode_event(event: str, data: dict) -> str:
+    """Format one SSE message"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+def snapshot_event(snapshot: LeaderboardSnapshot) -> str:
+    """Full-snapshot message reusing the snapshot's pre-encoded body"""
+    return f"event: snapshot\ndata: {snapshot.encoded.body.decode()}\n\n"
+
+
+def diff_snapshots(previous: LeaderboardSnapshot, current: LeaderboardSnapshot) -> Optional[dict]:
+    """
+    Entries whose equity, rank or profile changed, plus joins and leaves.
+    Values are absolute, so applying the same delta twice is harmless.
+    Returns None when nothing changed.
+    """
+    before: Dict[str, dict] = {e.address: e.to_dict() for e in previous.entries}
+    after: Dict[str, dict] = {e.address: e.to_dict() for e in current.entries}
+
+    updated = [row for address, row in after.items() if address in before and before[address] != row]
+    joined = [row for address, row in after.items() if address not in before]
+    left = [address for address in before if address not in after]
+
+    if not (updated or joined or left):
+        return None
+
+    return {
+        "generated_at": current.generated_at.isoformat(),
+        "updated": updated,
+        "joined": joined,
+        "left": left,
+    }
+
+
+class _Subscriber:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=LEADERBOARD_STREAM_QUEUE_SIZE)
+        self.resync = False
+
+
+class LeaderboardBroadcaster:
+    """Fans each refresh out to every connected stream as a pre-encoded delta"""
+
+    def __init__(self):
+        self._subscribers: Set[_Subscriber] = set()
+        self._latest: Optional[LeaderboardSnapshot] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, previous: Optional[LeaderboardSnapshot], current: LeaderboardSnapshot) -> None:
+        """Refresher listener: diff once, encode once, enqueue everywhere"""
+        self._latest = current
+        if previous is None:
+            message = snapshot_event(current)
+        else:
+            delta = diff_snapshots(previous, current)
+            if delta is None:
+                return
+            message = encode_event("delta", delta)
+
+        for sub in self._subscribers:
+            if sub.resync:
+                continue
+            try:
+                sub.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind: drop the backlog and send a full snapshot next
+                sub.resync = True
+
+    async def stream(self, request):
+        """Async generator backing the SSE StreamingResponse"""
+        sub = _Subscriber()
+        self._subscribers.add(sub)
+        try:
+            if self._latest is not None:
+                yield snapshot_event(self._latest)
+
+            while True:
+                if await request.is_disconnected():
+                    break
+
+                if sub.resync:
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    sub.resync = False
+                    if self._latest is not None:
+                        yield snapshot_event(self._latest)
+                    continue
+
+                try:
+                    message = await asyncio.wait_for(
+                        sub.queue.get(), timeout=LEADERBOARD_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                yield message
+        finally:
+            self._subscribers.discard(sub)
@@ -3,60 +3,133 @@
 # 설명: FastAPI 백엔드 - 인증 시스템 + 관리자 승인 + 리더보드 API
 # ==============================================================================
 
+import time
+
+# 부팅 시작 시각 (첫 응답/첫 스냅샷까지 걸린 시간 측정용)
+BOOT_STARTED = time.monotonic()
+
 import os
 import re
-from typing import Optional, List
+import base64
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, List, Literal
 from datetime import datetime, timedelta
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, status, Depends
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, Query, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, field_validator
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse, Response, JSONResponse
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy import select, update, delete, func, or_, tuple_, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Hyperliquid API
-from hyperliquid.info import Info
-from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid_client import HyperliquidClient
+from rate_limit import Priority
+from wallet_cache import WalletStateCache
 
 # 데이터베이스
-from database import get_db
-from models import User
+from database import get_async_db, async_engine, engine
+from models import User, EquitySnapshot
 
 # 인증
 from auth import (
-    hash_password, 
-    verify_password, 
+    hash_password_async,
+    verify_password_async,
     create_access_token, 
     get_current_user,
-    get_current_admin
+    get_current_admin,
+    invalidate_user,
+    add_invalidation_listener,
+    principal_cache,
+    password_pool,
+    PASSWORD_HASH_WORKERS
 )
 
-# Cloudinary (이미지 업로드)
-import cloudinary
-import cloudinary.uploader
+# 리더보드 스냅샷
+from leaderboard import LeaderboardRefresher, LEADERBOARD_MAX_AGE_SECONDS, compute_profit_rate, load_participants
+from refresh_scheduler import AdaptiveRefreshScheduler, WALLET_REFRESH_MAX_SECONDS
+from mark_to_market import parse_clearinghouse_state, HYPERLIQUID_MARK_RESYNC_SECONDS
+from hyperliquid_ws import HyperliquidStream, HYPERLIQUID_INGESTION_MODE, HYPERLIQUID_WS_RECONCILE_SECONDS
+from leaderboard_stream import LeaderboardBroadcaster
+from downsample import lttb_indices
+from leader_election import LeaderElector, FileLeaderLock, PostgresLeaderLock
+from snapshot_store import (
+    MmapSnapshotStore,
+    SnapshotFollower,
+    create_snapshot_store,
+    LEADERBOARD_SHARING,
+    LEADERBOARD_SHARED_DIR,
+    LEADERBOARD_SNAPSHOT_PATH,
+    SnapshotSourceMismatch
+)
+from auth_invalidation import InvalidationBroadcaster, create_invalidation_feed
+from encoded_response import encoded_response, json_response
+from bulk_import import BulkUserImport, ImportFileError, parse_import_file
 
-import asyncio
+# 모니터링
+import metrics
 
 # ==============================================================================
 # 환경변수 설정
 # ==============================================================================
 
-# Cloudinary 설정
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+# Cloudinary (이미지 업로드) - 부팅 시간을 줄이기 위해 첫 업로드 때 import/설정
+_cloudinary_uploader = None
+
+
+def get_cloudinary_uploader():
+    global _cloudinary_uploader
+    if _cloudinary_uploader is None:
+        import cloudinary
+        import cloudinary.uploader
+
+        cloudinary.config(
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+            secure=True
+        )
+        _cloudinary_uploader = cloudinary.uploader
+    return _cloudinary_uploader
 
 # ==============================================================================
 # FastAPI 앱
 # ==============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    백그라운드 리더보드 갱신 시작/종료
+    LEADERBOARD_SHARING이 켜져 있으면 선출된 리더 워커만 갱신하고 나머지는 공유 스냅샷을 읽음
+    디스크에 저장된 마지막 스냅샷을 먼저 복원해 첫 갱신 전에도 바로 서빙
+    """
+    await restore_persisted_snapshot()
+    if leader_elector is None:
+        await start_ingestion()
+    else:
+        leader_elector.start()
+        snapshot_follower.start()
+        auth_invalidations.start()
+    startup_timings["app_started_seconds"] = round(time.monotonic() - BOOT_STARTED, 3)
+    print(f"⏱️ 앱 시작 완료: {startup_timings['app_started_seconds']}초")
+    yield
+    if leader_elector is None:
+        await stop_ingestion()
+    else:
+        await auth_invalidations.stop()
+        await snapshot_follower.stop()
+        await leader_elector.stop()
+    await hyperliquid_client.aclose()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Blockblock Trading Competition API",
     description="Hyperliquid 트레이딩 대회 API with Authentication",
     version="3.0.0",
-    redirect_slashes=False  # Prevent 405 errors from trailing slashes
+    redirect_slashes=False,  # Prevent 405 errors from trailing slashes
+    lifespan=lifespan
 )
 
 # CORS 설정 (프론트엔드 연동)
@@ -68,8 +141,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Hyperliquid API
-info = Info(MAINNET_API_URL, skip_ws=True)
+# 요청별 지연시간/DB 쿼리 계측 (/metrics)
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
+metrics.instrument_engine(async_engine.sync_engine)
+
+# Hyperliquid API (비동기, 커넥션 풀 공유)
+hyperliquid_client = HyperliquidClient()
+
+# 지갑별 상태 캐시 (조회 실패 시 마지막 정상값을 stale로 제공, 기한은 HTTP 요청에만 적용)
+wallet_cache = WalletStateCache(
+    fetch=lambda address, timeout: hyperliquid_client.user_state(address, timeout=timeout)
+)
 
 
 # ==============================================================================
@@ -119,6 +202,33 @@ class UserUpdate(BaseModel):
     profile_image_url: Optional[str] = None
 
 
+# 관리자 일괄 작업 한 번에 처리할 최대 사용자 수
+ADMIN_BATCH_MAX_USERS = int(os.getenv("ADMIN_BATCH_MAX_USERS", "500"))
+
+
+class UserIdBatch(BaseModel):
+    """일괄 승인/거절 대상"""
+    user_ids: List[int] = Field(min_length=1, max_length=ADMIN_BATCH_MAX_USERS)
+    
+    @field_validator('user_ids')
+    @classmethod
+    def dedupe_ids(cls, v: List[int]) -> List[int]:
+        return list(dict.fromkeys(v))
+
+
+class UserBatchUpdate(UserIdBatch):
+    """
+    일괄 수정 요청: 선택한 모든 사용자에게 같은 값을 적용하는 필드만 허용
+    (이름/지갑/프로필 이미지는 사용자별 수정 엔드포인트에서)
+    """
+    is_approved: Optional[bool] = None
+    is_active: Optional[bool] = None
+    role: Optional[Literal["user", "admin"]] = None
+    
+    class Config:
+        extra = "forbid"
+
+
 class UserResponse(BaseModel):
     """사용자 정보 응답"""
     id: int
@@ -145,6 +255,14 @@ class TokenResponse(BaseModel):
     user: UserResponse
 
 
+class AdminUserPage(BaseModel):
+    """관리자 사용자 목록 페이지"""
+    items: List[UserResponse]
+    total: int                   # 현재 status_filter 기준 전체 수 (검색어 무관)
+    counts: dict                 # {"all", "pending", "approved"}
+    next_cursor: Optional[str]   # 다음 페이지 요청 시 cursor로 전달 (없으면 마지막 페이지)
+
+
 # ==============================================================================
 # API 엔드포인트
 # ==============================================================================
@@ -157,14 +275,56 @@ async def root():
 
 @app.get("/health")
 async def health():
-    """상세 헬스체크"""
+    """상세 헬스체크 (liveness: 외부 의존성 확인 없이 즉시 응답)"""
     return {
         "status": "healthy",
         "database": "connected",
-        "cloudinary": "configured" if os.getenv("CLOUDINARY_CLOUD_NAME") else "not configured"
+        "cloudinary": "configured" if os.getenv("CLOUDINARY_CLOUD_NAME") else "not configured",
+        "worker": {
+            "pid": os.getpid(),
+            "sharing": LEADERBOARD_SHARING,
+            "leader": leader_elector.is_leader if leader_elector is not None else True
+        }
     }
 
 
+# 준비 상태 확인 시 DB 응답 대기 한도
+READINESS_DB_TIMEOUT_SECONDS = float(os.getenv("READINESS_DB_TIMEOUT_SECONDS", "2"))
+
+
+async def ping_database():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+@app.get("/ready")
+async def ready():
+    """
+    준비 상태 (readiness): DB 연결 + 서빙 가능한 리더보드 스냅샷
+    준비되기 전에는 503 → 배포/로드밸런서가 트래픽을 보내지 않음
+    """
+    checks = {}
+    try:
+        await asyncio.wait_for(ping_database(), READINESS_DB_TIMEOUT_SECONDS)
+        checks["database"] = "ok"
+    except Exception as e:
+        checks["database"] = f"error: {type(e).__name__}"
+
+    snapshot = leaderboard_refresher.snapshot
+    if snapshot is None:
+        checks["leaderboard"] = "not ready"
+    elif snapshot.age_seconds() > LEADERBOARD_MAX_AGE_SECONDS:
+        checks["leaderboard"] = "stale"
+    else:
+        checks["leaderboard"] = "ok"
+
+    is_ready = all(value == "ok" for value in checks.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "not ready", "checks": checks, "startup": startup_timings}
+    )
+
+
 # ==============================================================================
 # 인증 엔드포인트
 # ==============================================================================
@@ -175,7 +335,7 @@ async def register(
     password: str = Form(...),
     wallet_address: str = Form(...),
     profile_image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     회원가입 (관리자 승인 대기 상태로 등록)
@@ -191,10 +351,10 @@ async def register(
         raise HTTPException(status_code=400, detail=str(e))
     
     # 중복 체크
-    existing_user = db.query(User).filter(
+    existing_user = await db.scalar(select(User).where(
         (User.username == user_data.username) | 
         (User.wallet_address == user_data.wallet_address)
-    ).first()
+    ).limit(1))
     
     if existing_user:
         if existing_user.username == user_data.username:
@@ -210,7 +370,7 @@ async def register(
             if profile_image.content_type not in allowed:
                 raise HTTPException(status_code=400, detail="JPG, PNG, GIF, WebP 이미지만 가능합니다")
             
-            result = cloudinary.uploader.upload(
+            result = get_cloudinary_uploader().upload(
                 profile_image.file,
                 folder="blockblock-profiles",
                 public_id=f"user_{user_data.username}",
@@ -228,7 +388,9 @@ async def register(
     # 초기 자산 조회
     initial_balance = None
     try:
-        user_state = info.user_state(user_data.wallet_address)
+        user_state = await hyperliquid_client.user_state(
+            user_data.wallet_address, priority=Priority.CRITICAL
+        )
         margin_summary = user_state.get("marginSummary", {})
         initial_balance = float(margin_summary.get("accountValue", 0))
     except Exception as e:
@@ -237,7 +399,7 @@ async def register(
     # DB 저장 (is_approved=False로 설정)
     new_user = User(
         username=user_data.username,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         wallet_address=user_data.wallet_address,
         profile_image_url=profile_image_url,
         role="user",
@@ -249,8 +411,9 @@ async def register(
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    invalidate_user_counts()
     
     return {
         "success": True,
@@ -264,12 +427,12 @@ async def register(
 @app.post("/api/auth/login", response_model=TokenResponse)
 async def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     로그인
     """
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user = await db.scalar(select(User).where(User.username == credentials.username))
     
     if not user:
         raise HTTPException(
@@ -277,7 +440,7 @@ async def login(
             detail="사용자 이름 또는 비밀번호가 잘못되었습니다"
         )
     
-    if not verify_password(credentials.password, user.password_hash):
+    if not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="사용자 이름 또는 비밀번호가 잘못되었습니다"
@@ -319,36 +482,130 @@ async def get_me(current_user: User = Depends(get_current_user)):
 # 관리자 엔드포인트
 # ==============================================================================
 
-@app.get("/api/admin/users", response_model=List[UserResponse])
+# 관리자 목록 상단 카운트 (가입/승인/거절 시 무효화, 다른 워커의 변경은 TTL로 반영)
+ADMIN_USER_COUNTS_TTL_SECONDS = float(os.getenv("ADMIN_USER_COUNTS_TTL_SECONDS", "30"))
+_user_counts = {"value": None, "expires_at": 0.0}
+
+# UserResponse에 필요한 컬럼만 조회 (password_hash 등 제외)
+ADMIN_USER_COLUMNS = [getattr(User, field) for field in UserResponse.model_fields]
+
+# 정렬/커서 키. SQLite는 created_at을 초 단위 문자열(CURRENT_TIMESTAMP)로 저장하므로
+# 바인딩된 datetime과 비교가 어긋나지 않게 문자열 그대로 비교
+USER_CURSOR_IS_TEXT = async_engine.dialect.name == "sqlite"
+USER_CURSOR_KEY = (func.datetime(User.created_at) if USER_CURSOR_IS_TEXT else User.created_at).label("cursor_ts")
+
+
+def invalidate_user_counts():
+    _user_counts["value"] = None
+
+
+async def get_user_counts(db: AsyncSession) -> dict:
+    """승인 상태별 사용자 수 (GROUP BY 한 번, 캐시)"""
+    if _user_counts["value"] is not None and time.monotonic() < _user_counts["expires_at"]:
+        return _user_counts["value"]
+    
+    rows = (await db.execute(
+        select(User.is_approved, func.count()).where(User.role != "admin").group_by(User.is_approved)
+    )).all()
+    by_status = {bool(is_approved): count for is_approved, count in rows}
+    counts = {
+        "all": sum(by_status.values()),
+        "pending": by_status.get(False, 0),
+        "approved": by_status.get(True, 0)
+    }
+    _user_counts["value"] = counts
+    _user_counts["expires_at"] = time.monotonic() + ADMIN_USER_COUNTS_TTL_SECONDS
+    return counts
+
+
+def encode_user_cursor(created_at, user_id: int) -> str:
+    value = created_at if isinstance(created_at, str) else created_at.isoformat()
+    return base64.urlsafe_b64encode(f"{value}|{user_id}".encode()).decode().rstrip("=")
+
+
+def decode_user_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, user_id = raw.rsplit("|", 1)
+        return (created_at if USER_CURSOR_IS_TEXT else datetime.fromisoformat(created_at)), int(user_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다")
+
+
+def like_prefix(value: str) -> str:
+    """LIKE 'value%' 패턴 (와일드카드 문자는 이스케이프)"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def admin_user_items(rows) -> list:
+    return [{field: row._mapping[field] for field in UserResponse.model_fields} for row in rows]
+
+
+@app.get("/api/admin/users", response_model=AdminUserPage)
 async def get_all_users(
+    request: Request,
     status_filter: Optional[str] = None,  # 'pending', 'approved', 'all'
+    q: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    모든 사용자 목록 조회 (관리자 전용)
+    사용자 목록 조회 (관리자 전용)
+    최신 가입순, (created_at, id) 기준 keyset 페이지네이션
+    - q: 사용자 이름(대소문자 무시) 또는 지갑 주소 앞부분 검색
+    - cursor: 이전 페이지의 next_cursor
     """
-    query = db.query(User).filter(User.role != "admin")
+    query = select(*ADMIN_USER_COLUMNS, USER_CURSOR_KEY).where(User.role != "admin")
     
     if status_filter == "pending":
-        query = query.filter(User.is_approved == False)
+        query = query.where(User.is_approved == False)
     elif status_filter == "approved":
-        query = query.filter(User.is_approved == True)
+        query = query.where(User.is_approved == True)
+    
+    if q and q.strip():
+        pattern = like_prefix(q.strip().lower())
+        query = query.where(or_(
+            func.lower(User.username).like(pattern, escape="\\"),
+            User.wallet_address.like(pattern, escape="\\")
+        ))
+    
+    if cursor:
+        created_at, user_id = decode_user_cursor(cursor)
+        query = query.where(tuple_(USER_CURSOR_KEY.element, User.id) < tuple_(created_at, user_id))
     
-    users = query.order_by(User.created_at.desc()).all()
-    return [UserResponse.from_orm(u) for u in users]
+    # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+    rows = (await db.execute(
+        query.order_by(USER_CURSOR_KEY.element.desc(), User.id.desc()).limit(limit + 1)
+    )).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_user_cursor(rows[-1].cursor_ts, rows[-1].id)
+    
+    counts = await get_user_counts(db)
+    
+    return json_response(request, {
+        "items": admin_user_items(rows),
+        "total": counts.get(status_filter, counts["all"]),
+        "counts": counts,
+        "next_cursor": next_cursor
+    })
 
 
 @app.post("/api/admin/approve/{user_id}")
 async def approve_user(
     user_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용자 승인 (관리자 전용)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
@@ -357,7 +614,10 @@ async def approve_user(
         raise HTTPException(status_code=400, detail="관리자 계정은 승인할 수 없습니다")
     
     user.is_approved = True
-    db.commit()
+    await db.commit()
+    invalidate_user(user_id)
+    invalidate_user_counts()
+    leaderboard_refresher.request_refresh()
     
     return {
         "success": True,
@@ -370,12 +630,12 @@ async def approve_user(
 async def reject_user(
     user_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용자 거절/삭제 (관리자 전용)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
@@ -384,8 +644,11 @@ async def reject_user(
         raise HTTPException(status_code=400, detail="관리자 계정은 삭제할 수 없습니다")
     
     username = user.username
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    invalidate_user(user_id)
+    invalidate_user_counts()
+    leaderboard_refresher.request_refresh()
     
     return {
         "success": True,
@@ -400,32 +663,32 @@ async def update_user(
     wallet_address: Optional[str] = Form(None),
     profile_image: Optional[UploadFile] = File(None),
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용자 정보 수정 (관리자 전용)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
     
     # 사용자 이름 수정
     if username:
-        existing = db.query(User).filter(
+        existing = await db.scalar(select(User.id).where(
             User.username == username,
             User.id != user_id
-        ).first()
+        ).limit(1))
         if existing:
             raise HTTPException(status_code=409, detail="이미 사용 중인 사용자 이름입니다")
         user.username = username
     
     # 지갑 주소 수정
     if wallet_address:
-        existing = db.query(User).filter(
+        existing = await db.scalar(select(User.id).where(
             User.wallet_address == wallet_address,
             User.id != user_id
-        ).first()
+        ).limit(1))
         if existing:
             raise HTTPException(status_code=409, detail="이미 등록된 지갑 주소입니다")
         user.wallet_address = wallet_address
@@ -433,7 +696,7 @@ async def update_user(
     # 프로필 이미지 수정
     if profile_image:
         try:
-            result = cloudinary.uploader.upload(
+            result = get_cloudinary_uploader().upload(
                 profile_image.file,
                 folder="blockblock-profiles",
                 public_id=f"user_{user.username}",
@@ -448,131 +711,627 @@ async def update_user(
         except Exception as e:
             print(f"이미지 업로드 실패: {e}")
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user_id)
+    if wallet_address:
+        leaderboard_refresher.request_refresh()
     
     return UserResponse.from_orm(user)
 
 
+@app.post("/api/admin/users/approve")
+async def approve_users(
+    request: Request,
+    batch: UserIdBatch,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    사용자 일괄 승인 (관리자 전용)
+    UPDATE 한 번으로 처리하고 새로 승인된 사용자를 반환 (화면은 목록을 다시 불러오지 않고 반영)
+    - skipped: 없거나, 관리자이거나, 이미 승인된 ID
+    """
+    rows = (await db.execute(
+        update(User)
+        .where(User.id.in_(batch.user_ids), User.role != "admin", User.is_approved == False)
+        .values(is_approved=True)
+        .returning(*ADMIN_USER_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await db.commit()
+    
+    approved_ids = {row.id for row in rows}
+    for user_id in approved_ids:
+        invalidate_user(user_id)
+    if approved_ids:
+        invalidate_user_counts()
+        leaderboard_refresher.request_refresh()
+    
+    return json_response(request, {
+        "success": True,
+        "message": f"{len(rows)}명이 승인되었습니다",
+        "users": admin_user_items(rows),
+        "skipped": [user_id for user_id in batch.user_ids if user_id not in approved_ids]
+    })
+
+
+@app.post("/api/admin/users/reject")
+async def reject_users(
+    request: Request,
+    batch: UserIdBatch,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    사용자 일괄 거절/삭제 (관리자 전용)
+    DELETE 한 번으로 처리하고 삭제된 사용자(id, 승인 여부)를 반환
+    """
+    rows = (await db.execute(
+        delete(User)
+        .where(User.id.in_(batch.user_ids), User.role != "admin")
+        .returning(User.id, User.username, User.is_approved)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await db.commit()
+    
+    deleted_ids = {row.id for row in rows}
+    for user_id in deleted_ids:
+        invalidate_user(user_id)
+    if deleted_ids:
+        invalidate_user_counts()
+        leaderboard_refresher.request_refresh()
+    
+    return json_response(request, {
+        "success": True,
+        "message": f"{len(rows)}명이 거절/삭제되었습니다",
+        "deleted": [{"id": row.id, "username": row.username, "is_approved": row.is_approved} for row in rows],
+        "skipped": [user_id for user_id in batch.user_ids if user_id not in deleted_ids]
+    })
+
+
+@app.patch("/api/admin/users")
+async def update_users(
+    request: Request,
+    batch: UserBatchUpdate,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    사용자 일괄 수정 (관리자 전용): 승인/활성/권한
+    UPDATE 한 번으로 처리하고 바뀐 사용자를 그대로 반환
+    - 자기 자신은 대상에 넣을 수 없음 (관리자 잠김 방지)
+    - skipped: 없거나 관리자인 ID (승인/거절과 동일)
+    """
+    changes = batch.model_dump(exclude={"user_ids"}, exclude_none=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="변경할 항목이 없습니다")
+    if current_admin.id in batch.user_ids:
+        raise HTTPException(status_code=400, detail="자기 자신의 승인/활성 상태와 권한은 변경할 수 없습니다")
+    
+    rows = (await db.execute(
+        update(User)
+        .where(User.id.in_(batch.user_ids), User.role != "admin")
+        .values(**changes)
+        .returning(*ADMIN_USER_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await db.commit()
+    
+    updated_ids = {row.id for row in rows}
+    for user_id in updated_ids:
+        invalidate_user(user_id)
+    if updated_ids:
+        invalidate_user_counts()
+        leaderboard_refresher.request_refresh()
+    
+    return json_response(request, {
+        "success": True,
+        "message": f"{len(rows)}명의 정보가 수정되었습니다",
+        "users": admin_user_items(rows),
+        "skipped": [user_id for user_id in batch.user_ids if user_id not in updated_ids]
+    })
+
+
+@app.post("/api/admin/users/import")
+async def import_users(
+    file: UploadFile = File(...),
+    approve: bool = Form(False),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    사용자 일괄 등록 (관리자 전용)
+    - CSV(username,password,wallet_address 헤더) 또는 JSONL 파일
+    - approve=true면 승인된 상태로 등록
+    - 결과는 행마다 한 줄씩 NDJSON으로 스트리밍, 마지막 줄은 요약
+    """
+    try:
+        rows = parse_import_file(await file.read(), file.filename or "")
+    except ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def fetch_initial_balance(wallet_address: str) -> float:
+        # 개별 가입(CRITICAL)보다 뒤에 서도록 갱신과 같은 우선순위로 조회
+        user_state = await hyperliquid_client.user_state(wallet_address, priority=Priority.REFRESH)
+        return float(user_state.get("marginSummary", {}).get("accountValue", 0))
+
+    bulk = BulkUserImport(
+        validate=UserRegister,
+        hash_password=password_pool.hash_queued,
+        fetch_initial_balance=fetch_initial_balance,
+        hash_concurrency=PASSWORD_HASH_WORKERS,
+        approve=approve
+    )
+
+    async def report():
+        async for line in bulk.run(rows):
+            yield line
+        if bulk.created_ids:
+            invalidate_user_counts()
+            if approve:
+                leaderboard_refresher.request_refresh()
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
+@app.get("/api/admin/wallet-cache")
+async def get_wallet_cache_stats(
+    limit: int = Query(20, ge=1, le=200),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    지갑 상태 캐시 현황: 적중률, 가장 느린/오래된 지갑 (관리자 전용)
+    """
+    return wallet_cache.stats(limit)
+
+
 # ==============================================================================
 # 리더보드 API (인증 필요)
 # ==============================================================================
 
-def fetch_address_state_sync(address: str, username: str, profile_image_url: str, initial_balance: float):
-    """유저 자산 조회 (동기)"""
+async def fetch_address_state(
+    address: str,
+    username: str,
+    profile_image_url: str,
+    initial_balance: float,
+    last_balance: Optional[float] = None
+):
+    """
+    유저 자산 조회 (비동기)
+    조회 실패 시 캐시의 마지막 정상값, 그마저 없으면 DB에 저장된 잔고를 stale로 사용
+    """
+    stale = False
+    error = None
+    has_positions = False
+    book = None
     try:
-        user_state = info.user_state(address)
+        user_state, state_info = await wallet_cache.get(address)
         margin_summary = user_state.get("marginSummary", {})
         current_balance = float(margin_summary.get("accountValue", 0))
-        
-        profit_rate = 0.0
-        if initial_balance and initial_balance > 0:
-            profit_rate = ((current_balance - initial_balance) / initial_balance) * 100
-        
-        return {
-            "address": address,
-            "username": username,
-            "profile_image_url": profile_image_url,
-            "accountValue": current_balance,
-            "initial_balance": initial_balance,
-            "profit_rate": profit_rate,
-            "error": None
-        }
+        has_positions = bool(user_state.get("assetPositions"))
+        book = parse_clearinghouse_state(user_state)
+        stale = state_info.stale
+        error = state_info.error
     except Exception as e:
-        return {
-            "address": address,
-            "username": username,
-            "profile_image_url": profile_image_url,
-            "accountValue": 0,
-            "initial_balance": initial_balance,
-            "profit_rate": 0,
-            "error": str(e)
-        }
+        current_balance = last_balance if last_balance is not None else 0
+        stale = True
+        error = str(e)
+    
+    profit_rate = compute_profit_rate(current_balance, initial_balance)
+    
+    return {
+        "address": address,
+        "username": username,
+        "profile_image_url": profile_image_url,
+        "accountValue": current_balance,
+        "initial_balance": initial_balance,
+        "profit_rate": profit_rate,
+        "has_positions": has_positions,
+        "book": book,
+        "stale": stale,
+        "error": error
+    }
+
+
+# 수집 모드별 지갑 전체 재조회(clearinghouseState) 주기
+# - poll: 활동량 기반 (기본 스케줄러)
+# - ws: 구독이 확인된 지갑은 실시간 수신이 기본이고 REST 폴링은 HYPERLIQUID_WS_RECONCILE_SECONDS마다 대조용으로만,
+#       구독 한도를 넘었거나 거절된 지갑은 poll과 같은 활동량 기반 주기로 수행
+# - mark: 매 틱 allMids 1회로 전체 지갑을 평가하고, 체결/펀딩/입출금 반영용 재동기화는 느린 주기로만 수행
+if HYPERLIQUID_INGESTION_MODE == "ws":
+    refresh_scheduler = AdaptiveRefreshScheduler(live_interval=HYPERLIQUID_WS_RECONCILE_SECONDS)
+elif HYPERLIQUID_INGESTION_MODE == "mark":
+    refresh_scheduler = AdaptiveRefreshScheduler(
+        min_interval=HYPERLIQUID_MARK_RESYNC_SECONDS,
+        max_interval=max(HYPERLIQUID_MARK_RESYNC_SECONDS, WALLET_REFRESH_MAX_SECONDS)
+    )
+else:
+    refresh_scheduler = None
+
+# 백그라운드 리더보드 갱신기 (lifespan에서 시작)
+leaderboard_refresher = LeaderboardRefresher(
+    fetch_state=fetch_address_state,
+    scheduler=refresh_scheduler,
+    fetch_mids=hyperliquid_client.all_mids if HYPERLIQUID_INGESTION_MODE == "mark" else None,
+    is_leader=lambda: leader_elector is None or leader_elector.is_leader
+)
+
+# 참가자에서 빠진 지갑(거절/비활성/주소 변경)은 스냅샷마다 캐시에서 제거
+leaderboard_refresher.add_listener(
+    lambda previous, current: wallet_cache.retain(entry.address for entry in current.entries)
+)
+
+# 리더보드 실시간 푸시 (갱신마다 한 번 diff 후 모든 구독자에게 전송)
+leaderboard_broadcaster = LeaderboardBroadcaster()
+leaderboard_refresher.add_listener(leaderboard_broadcaster.publish)
+
+
+def on_stream_state(address: str, clearinghouse_state: dict):
+    """WebSocket으로 받은 clearinghouseState를 리더보드에 반영"""
+    margin_summary = clearinghouse_state.get("marginSummary", {})
+    leaderboard_refresher.apply_wallet_state(
+        address,
+        float(margin_summary.get("accountValue", 0)),
+        bool(clearinghouse_state.get("assetPositions"))
+    )
+
+
+def on_stream_live(addresses):
+    """구독이 확인된 지갑만 대조 주기로 폴링, 나머지는 일반 폴링 주기"""
+    refresh_scheduler.set_live(leaderboard_refresher.user_ids_for(addresses))
+
+
+# Hyperliquid 실시간 수집 (HYPERLIQUID_INGESTION_MODE=ws일 때만)
+hyperliquid_stream = None
+if HYPERLIQUID_INGESTION_MODE == "ws":
+    hyperliquid_stream = HyperliquidStream(on_state=on_stream_state, on_live=on_stream_live)
+    leaderboard_refresher.add_listener(
+        lambda previous, current: hyperliquid_stream.set_wallets(e.address for e in current.entries)
+    )
+
+
+async def start_ingestion():
+    """지갑 갱신 시작 (단일 워커 또는 리더로 선출된 워커)"""
+    if leaderboard_refresher.snapshot is not None:
+        leaderboard_refresher.seed_from_snapshot(leaderboard_refresher.snapshot)
+    leaderboard_refresher.start()
+    if hyperliquid_stream is not None:
+        hyperliquid_stream.start()
+
+
+async def stop_ingestion():
+    """지갑 갱신 중지 (종료 또는 리더 자격 상실)"""
+    if hyperliquid_stream is not None:
+        await hyperliquid_stream.stop()
+    await leaderboard_refresher.stop()
+
+
+# 멀티 워커 모드 (LEADERBOARD_SHARING=file|postgres)
+# 리더: Hyperliquid 조회 + 스냅샷 발행 / 팔로워: 발행된 스냅샷을 버전당 한 번만 읽어 그대로 서빙
+# 관리자 변경으로 인한 인증 캐시 무효화는 모든 워커에 전파
+leader_elector = None
+snapshot_follower = None
+auth_invalidations = None
+if LEADERBOARD_SHARING != "off":
+    snapshot_store = create_snapshot_store(LEADERBOARD_SHARING)
+    leader_elector = LeaderElector(
+        lock=(
+            PostgresLeaderLock(async_engine) if LEADERBOARD_SHARING == "postgres"
+            else FileLeaderLock(os.path.join(LEADERBOARD_SHARED_DIR, "leader.lock"))
+        ),
+        on_elected=start_ingestion,
+        on_demoted=stop_ingestion
+    )
+    snapshot_follower = SnapshotFollower(
+        snapshot_store,
+        on_snapshot=leaderboard_refresher.adopt_snapshot,
+        is_leader=lambda: leader_elector.is_leader
+    )
+    leaderboard_refresher.add_listener(
+        lambda previous, current: snapshot_store.publish(current) if leader_elector.is_leader else None
+    )
+    auth_invalidations = InvalidationBroadcaster(
+        create_invalidation_feed(LEADERBOARD_SHARING),
+        on_invalidated=principal_cache.invalidate_user
+    )
+    add_invalidation_listener(auth_invalidations.publish)
+
+
+# 재시작 대비 로컬 디스크 스냅샷 (file 공유 모드에서는 공유 파일이 곧 저장본)
+persisted_snapshot = None
+if LEADERBOARD_SHARING == "file":
+    persisted_snapshot = snapshot_store
+elif LEADERBOARD_SNAPSHOT_PATH:
+    persisted_snapshot = MmapSnapshotStore(LEADERBOARD_SNAPSHOT_PATH)
+    leaderboard_refresher.add_listener(
+        lambda previous, current: persisted_snapshot.publish(current)
+        if leader_elector is None or leader_elector.is_leader else None
+    )
+
+
+async def restore_persisted_snapshot():
+    """
+    마지막으로 저장된 스냅샷 복원
+    - 다른 DB에서 만들어진 스냅샷은 무시, 더 이상 참가자가 아닌 사용자는 제외
+    - 충분히 최신이면 첫 갱신을 기다리지 않고 바로 서빙
+    - 오래됐어도 지갑 상태의 출발점으로 사용 (전체 지갑 동시 재조회 방지)
+    """
+    if persisted_snapshot is None:
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        snapshot = await loop.run_in_executor(None, persisted_snapshot.read_if_changed)
+        if snapshot is None:
+            return
+        participants = await loop.run_in_executor(None, load_participants)
+    except SnapshotSourceMismatch:
+        print("💾 저장된 스냅샷이 다른 DB의 것이라 복원하지 않음")
+        return
+    except Exception as e:
+        print(f"저장된 스냅샷 복원 실패: {e}")
+        return
+
+    age = snapshot.age_seconds()
+    kept = leaderboard_refresher.restore_snapshot(
+        snapshot,
+        user_ids={p.user_id for p in participants},
+        serve=age <= LEADERBOARD_MAX_AGE_SECONDS
+    )
+    print(f"💾 저장된 스냅샷 복원: {kept}/{len(snapshot.entries)}명, {age:.0f}초 전")
+
+
+# 부팅 후 걸린 시간 (/ready, /metrics에 노출)
+startup_timings = {"app_started_seconds": None, "first_snapshot_seconds": None}
+
+
+def record_first_snapshot(previous, current):
+    if startup_timings["first_snapshot_seconds"] is None:
+        startup_timings["first_snapshot_seconds"] = round(time.monotonic() - BOOT_STARTED, 3)
+        print(f"⏱️ 첫 리더보드 스냅샷: {startup_timings['first_snapshot_seconds']}초")
+
+
+leaderboard_refresher.add_listener(record_first_snapshot)
+
+
+def current_snapshot():
+    """최신 리더보드 스냅샷 (없거나 오래되었으면 503)"""
+    snapshot = leaderboard_refresher.snapshot
+    
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="리더보드를 준비 중입니다")
+    
+    if snapshot.age_seconds() > LEADERBOARD_MAX_AGE_SECONDS:
+        raise HTTPException(status_code=503, detail="리더보드 데이터가 오래되었습니다")
+    
+    return snapshot
 
 
 @app.get("/leaderboard")
 async def get_leaderboard(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    after_rank: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user)
 ):
     """
     리더보드 조회 (인증 필요)
+    백그라운드에서 갱신된 스냅샷을 메모리에서 바로 반환
+    - limit: 상위 K명 / 페이지 크기 (생략 시 전체)
+    - after_rank: 커서 (이전 페이지의 next_after_rank)
+    갱신 시 한 번 인코딩된 바이트를 그대로 전송 (ETag/304, gzip/br)
+    """
+    snapshot = current_snapshot()
+    return encoded_response(request, snapshot.encoded_page(after_rank, limit))
+
+
+@app.get("/leaderboard/around-me")
+async def get_leaderboard_around_me(
+    request: Request,
+    n: int = Query(5, ge=0, le=50),
+    current_user: User = Depends(get_current_user)
+):
     """
-    users = db.query(User).filter(
-        User.is_active == True,
-        User.is_approved == True,
-        User.role == "user"
-    ).all()
+    내 순위 기준 위아래 n명 (인증 필요)
+    """
+    snapshot = current_snapshot()
+    window = snapshot.around(current_user.id, n)
     
-    if not users:
-        return []
+    if not window:
+        raise HTTPException(status_code=404, detail="리더보드에 순위가 없습니다")
     
-    loop = asyncio.get_running_loop()
+    payload = snapshot.to_dict(window)
+    payload["my_rank"] = snapshot.rank_of(current_user.id)
+    return json_response(request, payload)
+
+
+@app.get("/leaderboard/stream")
+async def stream_leaderboard(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    리더보드 실시간 스트림 (Server-Sent Events, 인증 필요)
+    접속 시 전체 스냅샷(event: snapshot), 이후 변경분만(event: delta) 전송
+    """
+    return StreamingResponse(
+        leaderboard_broadcaster.stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/users")
+async def get_users(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    after_rank: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    등록된 참가자 목록 (인증 필요), 순위순
+    limit 지정 시 rank 기준 keyset 페이지네이션 (after_rank 이후 limit명)
+    리더보드 스냅샷에서 페이지마다 한 번 인코딩한 바이트를 그대로 전송 (DB 조회 없음)
+    """
+    snapshot = current_snapshot()
+    return encoded_response(request, snapshot.encoded_users(after_rank, limit))
+
+
+# 자산 추이: 샘플이 많으면 SQL에서 ntile로 points개 구간으로 나눠 구간마다 첫/끝/최저/최고 샘플만
+# 남기고(M4) 그 결과에 LTTB를 적용. 전체 행을 파이썬으로 가져오지 않음
+EQUITY_COLUMNS = (EquitySnapshot.ts, EquitySnapshot.account_value, EquitySnapshot.profit_rate)
+
+
+def equity_m4_query(window: list, buckets: int):
+    """구간마다 첫/끝/최저/최고 샘플 (최대 4 * buckets행, 시간순)"""
+    bucketed = select(
+        *EQUITY_COLUMNS,
+        func.ntile(buckets).over(order_by=EquitySnapshot.ts).label("bucket")
+    ).where(*window).subquery()
     
-    tasks = [
-        loop.run_in_executor(
-            None, 
-            fetch_address_state_sync, 
-            user.wallet_address,
-            user.username,
-            user.profile_image_url,
-            user.initial_balance or 0
-        )
-        for user in users
-    ]
+    def rank(*order_by):
+        return func.row_number().over(partition_by=bucketed.c.bucket, order_by=order_by)
     
-    results = await asyncio.gather(*tasks)
+    ranked = select(
+        bucketed.c.ts,
+        bucketed.c.account_value,
+        bucketed.c.profit_rate,
+        rank(bucketed.c.ts).label("first"),
+        rank(bucketed.c.ts.desc()).label("last"),
+        rank(bucketed.c.account_value, bucketed.c.ts).label("low"),
+        rank(bucketed.c.account_value.desc(), bucketed.c.ts).label("high"),
+    ).subquery()
     
-    leaderboard_data = []
-    for res in results:
-        leaderboard_data.append({
-            "address": res["address"],
-            "name": res["username"],
-            "avatar": res["profile_image_url"] or "/images/avatars/default.jpg",
-            "accountValue": res["accountValue"],
-            "equity": res["accountValue"],
-            "roi24h": res["profit_rate"],
-            "profit_rate": res["profit_rate"],
-            "initial_balance": res["initial_balance"]
-        })
+    return select(ranked.c.ts, ranked.c.account_value, ranked.c.profit_rate).where(or_(
+        ranked.c.first == 1, ranked.c.last == 1, ranked.c.low == 1, ranked.c.high == 1
+    )).order_by(ranked.c.ts)
+
+
+@app.get("/api/equity/{wallet_address}")
+async def get_equity_curve(
+    wallet_address: str,
+    points: int = Query(500, ge=3, le=5000),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    지갑별 자산 추이 (인증 필요)
+    SQL에서 구간별로 줄인 뒤 LTTB로 points 개수만큼 다운샘플링하여 반환
+    """
+    user_id = await db.scalar(select(User.id).where(
+        User.wallet_address == wallet_address.lower().strip()
+    ))
     
-    leaderboard_data.sort(key=lambda x: x["profit_rate"], reverse=True)
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
     
-    for i, item in enumerate(leaderboard_data):
-        item["rank"] = i + 1
+    window = [EquitySnapshot.user_id == user_id]
+    if since:
+        window.append(EquitySnapshot.ts >= since)
+    if until:
+        window.append(EquitySnapshot.ts <= until)
     
-    # DB 업데이트
-    for item in leaderboard_data:
-        user = db.query(User).filter(User.wallet_address == item["address"]).first()
-        if user:
-            user.current_balance = item["accountValue"]
-            user.profit_rate = item["profit_rate"]
-            user.rank = item["rank"]
-    db.commit()
+    total = await db.scalar(select(func.count()).where(*window))
+    
+    if total <= 4 * points:
+        query = select(*EQUITY_COLUMNS).where(*window).order_by(EquitySnapshot.ts)
+    else:
+        query = equity_m4_query(window, points)
+    
+    rows = (await db.execute(query)).all()
+    indices = lttb_indices(
+        [r.ts.timestamp() for r in rows],
+        [r.account_value for r in rows],
+        points
+    )
     
-    return leaderboard_data
+    return {
+        "wallet_address": wallet_address.lower().strip(),
+        "total_samples": total,
+        "points": [
+            {
+                "ts": rows[i].ts.isoformat(),
+                "equity": rows[i].account_value,
+                "profit_rate": rows[i].profit_rate
+            }
+            for i in indices
+        ]
+    }
 
 
-@app.get("/api/users")
-async def get_users(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """등록된 참가자 목록 (인증 필요)"""
-    users = db.query(User).filter(
-        User.is_active == True,
-        User.is_approved == True,
-        User.role == "user"
-    ).order_by(User.profit_rate.desc()).all()
-    
-    return [
-        {
-            "id": u.id,
-            "username": u.username,
-            "wallet_address": u.wallet_address,
-            "profile_image_url": u.profile_image_url,
-            "profit_rate": u.profit_rate,
-            "rank": u.rank
-        }
-        for u in users
-    ]
+# ==============================================================================
+# 모니터링 (Prometheus)
+# ==============================================================================
+
+metrics.register_gauge(
+    "leaderboard_snapshot_age_seconds", "Age of the served leaderboard snapshot",
+    lambda: leaderboard_refresher.snapshot.age_seconds() if leaderboard_refresher.snapshot else None
+)
+metrics.register_gauge(
+    "startup_first_snapshot_seconds", "Seconds from process boot to the first servable leaderboard snapshot",
+    lambda: startup_timings["first_snapshot_seconds"]
+)
+metrics.register_gauge(
+    "leaderboard_entries", "Participants in the served leaderboard snapshot",
+    lambda: len(leaderboard_refresher.snapshot.entries) if leaderboard_refresher.snapshot else None
+)
+metrics.register_gauge(
+    "leaderboard_is_leader", "1 if this worker refreshes wallets and publishes snapshots",
+    lambda: int(leader_elector.is_leader) if leader_elector is not None else 1
+)
+metrics.register_gauge(
+    "leaderboard_stream_subscribers", "Open /leaderboard/stream connections",
+    lambda: leaderboard_broadcaster.subscriber_count
+)
+metrics.register_gauge(
+    "password_hash_queue_depth", "bcrypt jobs running or waiting",
+    lambda: password_pool.queue_depth
+)
+metrics.register_gauge(
+    "hyperliquid_rate_limit_queue_depth", "/info calls waiting for rate budget",
+    lambda: hyperliquid_client.scheduler.queue_depth
+)
+metrics.register_gauge(
+    "db_pool_checked_out", "Async DB connections in use",
+    lambda: async_engine.pool.checkedout() if hasattr(async_engine.pool, "checkedout") else None
+)
+metrics.register_gauge("wallet_cache_entries", "Cached wallet states", lambda: len(wallet_cache))
+metrics.register_counter("wallet_cache_hits", "Wallet state cache hits", lambda: wallet_cache.hits)
+metrics.register_counter("wallet_cache_misses", "Wallet state cache misses", lambda: wallet_cache.misses)
+metrics.register_counter(
+    "wallet_cache_stale_served", "Last-known-good wallet states served after a failed fetch",
+    lambda: wallet_cache.stale_served
+)
+metrics.register_counter("auth_cache_hits", "Principal cache hits", lambda: principal_cache.hits)
+metrics.register_counter("auth_cache_misses", "Principal cache misses", lambda: principal_cache.misses)
+
+if hyperliquid_stream is not None:
+    metrics.register_gauge(
+        "hyperliquid_ws_connected", "1 while the Hyperliquid WebSocket is connected",
+        lambda: int(hyperliquid_stream.connected)
+    )
+    metrics.register_counter("hyperliquid_ws_frames", "Frames received", lambda: hyperliquid_stream.frames)
+    metrics.register_counter(
+        "hyperliquid_ws_reconnects", "WebSocket reconnects", lambda: hyperliquid_stream.reconnects
+    )
+    metrics.register_gauge(
+        "hyperliquid_ws_live_wallets", "Wallets with an acknowledged subscription",
+        lambda: hyperliquid_stream.live_count
+    )
+    metrics.register_counter(
+        "hyperliquid_ws_errors", "Error frames (e.g. refused subscriptions)", lambda: hyperliquid_stream.errors
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """
+    Prometheus 스크레이프 엔드포인트
+    METRICS_TOKEN이 설정되어 있으면 Bearer 토큰 필요
+    """
+    if metrics.METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {metrics.METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,129 @@
+"""
+Mark-to-market equity for Blockblock Trading Competition
+- Keeps each wallet's cash and open perp positions from its last full
+  clearinghouseState fetch
+- Revalues every wallet from one allMids price map in a single vectorized pass
+- Full per-wallet re-syncs (trades, funding, transfers) happen on a slower cadence
+"""
+
+import os
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# How often each wallet still gets a full clearinghouseState re-sync in 'mark' mode
+HYPERLIQUID_MARK_RESYNC_SECONDS = float(os.getenv("HYPERLIQUID_MARK_RESYNC_SECONDS", "120"))
+
+
+class Position(NamedTuple):
+    coin: str
+    size: float          # signed (szi): > 0 long, < 0 short
+    entry_px: float
+    unrealized_pnl: float  # as reported at fetch time; used while no mid is known
+
+
+def parse_clearinghouse_state(state: dict) -> Tuple[float, List[Position]]:
+    """
+    (cash, positions) from a clearinghouseState, where
+    cash = accountValue - sum(unrealizedPnl), i.e. equity with every position at entry.
+    """
+    positions = []
+    for asset_position in state.get("assetPositions") or []:
+        position = asset_position.get("position") or {}
+        size = float(position.get("szi") or 0)
+        if size == 0:
+            continue
+        positions.append(Position(
+            coin=position["coin"],
+            size=size,
+            entry_px=float(position.get("entryPx") or 0),
+            unrealized_pnl=float(position.get("unrealizedPnl") or 0),
+        ))
+
+    account_value = float((state.get("marginSummary") or {}).get("accountValue", 0))
+    cash = account_value - sum(p.unrealized_pnl for p in positions)
+    return cash, positions
+
+
+class MarkToMarketBook:
+    """
+    Cash + positions for every wallet, flattened into NumPy arrays so a
+    revaluation is a gather, a multiply and a bincount regardless of how
+    many wallets and positions there are. Arrays are rebuilt lazily after
+    the book changes (i.e. only on ticks that re-synced some wallet).
+    """
+
+    def __init__(self):
+        self._wallets: Dict[int, Tuple[float, Tuple[Position, ...]]] = {}
+        self._dirty = True
+        self._user_ids = np.empty(0, dtype=np.int64)
+        self._cash = np.empty(0)
+        self._coins: List[str] = []
+        self._pos_wallet = np.empty(0, dtype=np.int64)
+        self._pos_coin = np.empty(0, dtype=np.int64)
+        self._pos_size = np.empty(0)
+        self._pos_entry = np.empty(0)
+        self._pos_pnl = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self._wallets)
+
+    def set_wallet(self, user_id: int, cash: float, positions: Iterable[Position]) -> None:
+        self._wallets[user_id] = (cash, tuple(positions))
+        self._dirty = True
+
+    def remove(self, user_id: int) -> None:
+        if self._wallets.pop(user_id, None) is not None:
+            self._dirty = True
+
+    def retain(self, user_ids: Iterable[int]) -> None:
+        """Drop every wallet not in user_ids"""
+        keep = set(user_ids)
+        for user_id in [u for u in self._wallets if u not in keep]:
+            self.remove(user_id)
+
+    def _rebuild(self) -> None:
+        if not self._dirty:
+            return
+        coin_index: Dict[str, int] = {}
+        user_ids, cash = [], []
+        pos_wallet, pos_coin, pos_size, pos_entry, pos_pnl = [], [], [], [], []
+
+        for i, (user_id, (wallet_cash, positions)) in enumerate(self._wallets.items()):
+            user_ids.append(user_id)
+            cash.append(wallet_cash)
+            for p in positions:
+                pos_wallet.append(i)
+                pos_coin.append(coin_index.setdefault(p.coin, len(coin_index)))
+                pos_size.append(p.size)
+                pos_entry.append(p.entry_px)
+                pos_pnl.append(p.unrealized_pnl)
+
+        self._user_ids = np.array(user_ids, dtype=np.int64)
+        self._cash = np.array(cash, dtype=np.float64)
+        self._coins = list(coin_index)
+        self._pos_wallet = np.array(pos_wallet, dtype=np.int64)
+        self._pos_coin = np.array(pos_coin, dtype=np.int64)
+        self._pos_size = np.array(pos_size, dtype=np.float64)
+        self._pos_entry = np.array(pos_entry, dtype=np.float64)
+        self._pos_pnl = np.array(pos_pnl, dtype=np.float64)
+        self._dirty = False
+
+    def revalue(self, mids: Mapping[str, float], user_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+        """
+        Equity per wallet at the given mid prices (all wallets, or just user_ids).
+        A position whose coin has no mid keeps its last reported unrealized PnL.
+        """
+        self._rebuild()
+        if not len(self._user_ids):
+            return {}
+
+        mid_by_coin = np.array([float(mids.get(coin, np.nan)) for coin in self._coins], dtype=np.float64)
+        mark = mid_by_coin[self._pos_coin]
+        pnl = np.where(np.isnan(mark), self._pos_pnl, self._pos_size * (mark - self._pos_entry))
+        equity = self._cash + np.bincount(self._pos_wallet, weights=pnl, minlength=len(self._user_ids))
+
+        values = dict(zip(self._user_ids.tolist(), equity.tolist()))
+        if user_ids is None:
+            return values
+        return {user_id: values[user_id] for user_id in user_ids if user_id in values}
@@ -0,0 +1,191 @@
+"""
+Prometheus metrics for Blockblock Trading Competition
+- Per-route request latency histogram (pure ASGI middleware, streaming-safe)
+- Hyperliquid /info latency and errors per request type
+- DB query count and time per request via SQLAlchemy cursor events
+- Queue depths, cache hit/miss counters and snapshot age read at scrape time
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable, List, Optional, Tuple
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, CONTENT_TYPE_LATEST, disable_created_metrics, generate_latest
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+
+# Optional bearer token for /metrics; unset means open (scrape over a private network)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# *_created series double the scrape size for no benefit here
+disable_created_metrics()
+registry = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    registry=registry,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+UPSTREAM_LATENCY = Histogram(
+    "hyperliquid_request_duration_seconds",
+    "Hyperliquid /info latency per attempt",
+    ["type"],
+    registry=registry,
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+UPSTREAM_ERRORS = Counter(
+    "hyperliquid_request_errors",
+    "Failed Hyperliquid /info attempts",
+    ["type", "reason"],
+    registry=registry,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while handling one request",
+    ["route"],
+    registry=registry,
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "db_seconds_per_request",
+    "Time spent in SQL statements while handling one request",
+    ["route"],
+    registry=registry,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+DB_QUERIES = Counter(
+    "db_queries",
+    "SQL statements executed (requests and background work)",
+    registry=registry,
+)
+
+
+# ------------------------------------------------------------------------------
+# Gauges/counters owned by other modules, read only when scraped
+# ------------------------------------------------------------------------------
+
+class _CallbackCollector:
+    def __init__(self):
+        self._metrics: List[Tuple[str, str, str, Callable[[], Optional[float]]]] = []
+
+    def add(self, kind: str, name: str, documentation: str, fn: Callable[[], Optional[float]]) -> None:
+        self._metrics.append((kind, name, documentation, fn))
+
+    def collect(self):
+        for kind, name, documentation, fn in self._metrics:
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            family = CounterMetricFamily if kind == "counter" else GaugeMetricFamily
+            yield family(name, documentation, value=value)
+
+
+_callbacks = _CallbackCollector()
+registry.register(_callbacks)
+
+
+def register_gauge(name: str, documentation: str, fn: Callable[[], Optional[float]]) -> None:
+    """Expose fn() as a gauge; returning None skips the sample"""
+    _callbacks.add("gauge", name, documentation, fn)
+
+
+def register_counter(name: str, documentation: str, fn: Callable[[], Optional[float]]) -> None:
+    """Expose a monotonically increasing fn() as a counter"""
+    _callbacks.add("counter", name, documentation, fn)
+
+
+def render() -> Tuple[bytes, str]:
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# ------------------------------------------------------------------------------
+# Upstream (Hyperliquid) instrumentation
+# ------------------------------------------------------------------------------
+
+def observe_upstream(request_type: str, seconds: float, error: Optional[str] = None) -> None:
+    UPSTREAM_LATENCY.labels(request_type).observe(seconds)
+    if error is not None:
+        UPSTREAM_ERRORS.labels(request_type, error).inc()
+
+
+# ------------------------------------------------------------------------------
+# DB instrumentation
+# ------------------------------------------------------------------------------
+
+class _QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_request_queries: ContextVar[Optional[_QueryStats]] = ContextVar("request_queries", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    DB_QUERIES.inc()
+    stats = _request_queries.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine) -> None:
+    """Count statements on a sync Engine (pass async_engine.sync_engine for async)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ------------------------------------------------------------------------------
+# Request middleware
+# ------------------------------------------------------------------------------
+
+class MetricsMiddleware:
+    """
+    Records latency per route template (not raw path, to keep label
+    cardinality bounded) and the DB work done for the request. For
+    streaming responses the latency covers the whole stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        stats = _QueryStats()
+        token = _request_queries.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_queries.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], route_path, str(status_code[0])).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route_path).observe(stats.count)
+            DB_SECONDS_PER_REQUEST.labels(route_path).observe(stats.seconds)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Float, DateTime, ForeignKey, Index, LargeBinary, and_, literal_column, true
 from sqlalchemy.sql import func
 from database import Base
 
@@ -18,7 +18,81 @@ class User(Base):
     initial_balance = Column(Float, nullable=True)
     current_balance = Column(Float, nullable=True)
     profit_rate = Column(Float, nullable=True, default=0.0)
-    rank = Column(Integer, nullable=True)
+    rank = Column(Integer, nullable=True)  # indexed for participants by ix_users_participants_rank
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Admin listing: newest first, keyset on (created_at, id), optionally by approval status
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_is_approved_created_at_id", "is_approved", "created_at", "id"),
+        # Prefix search (LIKE 'abc%'); pattern ops make it usable under non-C collations
+        Index(
+            "ix_users_wallet_address_pattern", "wallet_address",
+            postgresql_ops={"wallet_address": "varchar_pattern_ops"}
+        ),
+    )
+
+
+# Approved, active, non-admin users: the leaderboard / participant list predicate.
+# Constants are rendered inline (not bound) so Postgres can match the partial indexes below.
+ACTIVE_PARTICIPANT = and_(
+    User.is_active == true(),
+    User.is_approved == true(),
+    User.role == literal_column("'user'")
+)
+
+# Partial indexes over participants only; INCLUDE makes the listing an index-only scan on Postgres
+PARTICIPANT_COLUMNS = ["wallet_address", "username", "profile_image_url", "initial_balance", "current_balance"]
+Index(
+    "ix_users_participants_profit_rate", User.profit_rate.desc(), User.id,
+    postgresql_where=ACTIVE_PARTICIPANT,
+    postgresql_include=PARTICIPANT_COLUMNS + ["rank"],
+    sqlite_where=ACTIVE_PARTICIPANT
+)
+Index(
+    "ix_users_participants_rank", User.rank,
+    postgresql_where=ACTIVE_PARTICIPANT,
+    postgresql_include=PARTICIPANT_COLUMNS + ["profit_rate"],
+    sqlite_where=ACTIVE_PARTICIPANT
+)
+
+Index(
+    "ix_users_username_lower_pattern",
+    func.lower(User.username).label("username_lower"),
+    postgresql_ops={"username_lower": "text_pattern_ops"}
+)
+
+
+class EquitySnapshot(Base):
+    """Append-only equity history, one row per participant per leaderboard refresh"""
+    __tablename__ = "equity_snapshots"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    ts = Column(DateTime(timezone=True), nullable=False)
+    account_value = Column(Float, nullable=False)
+    profit_rate = Column(Float(precision=24), nullable=False)  # REAL: 4 bytes is plenty for a percentage
+
+    __table_args__ = (
+        Index("ix_equity_snapshots_user_ts", "user_id", "ts"),
+    )
+
+
+class SharedLeaderboardSnapshot(Base):
+    """Latest snapshot published by the leader worker (LEADERBOARD_SHARING=postgres), single row"""
+    __tablename__ = "leaderboard_shared_snapshot"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)  # generated_at in microseconds
+    payload = Column(LargeBinary, nullable=False)
+
+
+class AuthInvalidation(Base):
+    """Users whose cached principals every worker must drop (LEADERBOARD_SHARING=postgres)"""
+    __tablename__ = "auth_invalidations"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,97 @@
+"""
+Bulk persistence helpers for Blockblock Trading Competition
+- Single-statement write-back of leaderboard standings
+- UPDATE ... FROM (VALUES ...) on PostgreSQL, executemany elsewhere (SQLite)
+- Append-only equity history inserts
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import bindparam, insert, text, update
+from sqlalchemy.orm import Session
+
+from models import User, EquitySnapshot
+
+STANDING_COLUMNS = ("current_balance", "profit_rate", "rank")
+
+
+def _postgres_update_standings(db: Session, rows: List[Dict]) -> None:
+    values = []
+    params = {}
+    for i, row in enumerate(rows):
+        values.append(
+            f"(CAST(:id_{i} AS INTEGER), CAST(:b_{i} AS DOUBLE PRECISION), "
+            f"CAST(:p_{i} AS DOUBLE PRECISION), CAST(:r_{i} AS INTEGER))"
+        )
+        params[f"id_{i}"] = row["id"]
+        params[f"b_{i}"] = row["current_balance"]
+        params[f"p_{i}"] = row["profit_rate"]
+        params[f"r_{i}"] = row["rank"]
+
+    db.execute(
+        text(
+            "UPDATE users SET current_balance = v.current_balance, "
+            "profit_rate = v.profit_rate, rank = v.rank, updated_at = now() "
+            f"FROM (VALUES {', '.join(values)}) AS v(id, current_balance, profit_rate, rank) "
+            "WHERE users.id = v.id"
+        ),
+        params,
+    )
+
+
+def _executemany_update_standings(db: Session, rows: List[Dict]) -> None:
+    stmt = (
+        update(User.__table__)
+        .where(User.__table__.c.id == bindparam("_id"))
+        .values(
+            current_balance=bindparam("_current_balance"),
+            profit_rate=bindparam("_profit_rate"),
+            rank=bindparam("_rank"),
+        )
+    )
+    db.execute(stmt, [
+        {
+            "_id": row["id"],
+            "_current_balance": row["current_balance"],
+            "_profit_rate": row["profit_rate"],
+            "_rank": row["rank"],
+        }
+        for row in rows
+    ])
+
+
+def bulk_update_standings(db: Session, rows: List[Dict]) -> int:
+    """
+    Write current_balance, profit_rate and rank for many users at once.
+    Each row is a dict with id plus the three standing columns.
+    Returns the number of rows sent to the database (caller commits).
+    """
+    if not rows:
+        return 0
+
+    if db.get_bind().dialect.name == "postgresql":
+        _postgres_update_standings(db, rows)
+    else:
+        _executemany_update_standings(db, rows)
+    return len(rows)
+
+
+def insert_equity_snapshots(db: Session, ts: datetime, rows: List[Dict]) -> int:
+    """
+    Append one equity_snapshots row per user for a refresh at `ts`.
+    Each row is a dict with user_id, account_value and profit_rate.
+    """
+    if not rows:
+        return 0
+
+    db.execute(insert(EquitySnapshot.__table__), [
+        {
+            "user_id": row["user_id"],
+            "ts": ts,
+            "account_value": row["account_value"],
+            "profit_rate": row["profit_rate"],
+        }
+        for row in rows
+    ])
+    return len(rows)
@@ -0,0 +1,45 @@
+"""
+Order-statistics rank index for Blockblock Trading Competition
+- Sorted by (profit_rate desc, user_id) so ties rank deterministically
+- O(log n) single-wallet moves, so a refresh re-sorts only the wallets that changed
+- Iterated in rank order to build each snapshot; reads (top-K, "around me",
+  rank lookups) are served from that immutable snapshot, never from the live index
+"""
+
+from typing import Dict, Iterator, List, Tuple
+
+from sortedcontainers import SortedList
+
+
+class RankIndex:
+    """Incrementally maintained ranking of participants by profit rate"""
+
+    def __init__(self):
+        self._keys = SortedList()
+        self._key_by_user: Dict[int, Tuple[float, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[int]:
+        """User ids in rank order"""
+        return (user_id for _, user_id in self._keys)
+
+    def user_ids(self) -> List[int]:
+        return list(self._key_by_user)
+
+    def upsert(self, user_id: int, profit_rate: float) -> None:
+        """Insert or move one user (no-op if their sort key is unchanged)"""
+        key = (-profit_rate, user_id)
+        old = self._key_by_user.get(user_id)
+        if old == key:
+            return
+        if old is not None:
+            self._keys.remove(old)
+        self._keys.add(key)
+        self._key_by_user[user_id] = key
+
+    def remove(self, user_id: int) -> None:
+        key = self._key_by_user.pop(user_id, None)
+        if key is not None:
+            self._keys.remove(key)
@@ -0,0 +1,109 @@
+"""
+Upstream rate-limit budget for Blockblock Trading Competition
+- Weight-based token bucket matching Hyperliquid's per-IP REST limit
+- Strict priority classes: critical reads are served before bulk refreshes
+- Adaptive: 429 responses halve the rate, successes slowly restore it
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import itertools
+from enum import IntEnum
+from typing import List, Optional, Tuple
+
+# Hyperliquid allows 1200 weight per minute per IP; keep some headroom
+HYPERLIQUID_WEIGHT_PER_MINUTE = float(os.getenv("HYPERLIQUID_WEIGHT_PER_MINUTE", "1000"))
+HYPERLIQUID_WEIGHT_BURST = float(os.getenv("HYPERLIQUID_WEIGHT_BURST", "100"))
+
+# Adaptive rate bounds
+MIN_RATE_FRACTION = 0.1
+RECOVERY_FRACTION = 0.01
+DEFAULT_RATE_LIMIT_PAUSE_SECONDS = 1.0
+
+
+class Priority(IntEnum):
+    """Lower value is served first"""
+    CRITICAL = 0     # registration / initial-balance capture
+    REFRESH = 1      # leaderboard refresh
+    BACKGROUND = 2   # analytics backfills
+
+
+class TokenBucketScheduler:
+    """
+    Grants request weight from a shared token bucket in priority order.
+    The head of the queue blocks everything behind it, so a waiting
+    critical request is never overtaken by cheaper low-priority ones.
+    """
+
+    def __init__(
+        self,
+        weight_per_minute: float = HYPERLIQUID_WEIGHT_PER_MINUTE,
+        burst: float = HYPERLIQUID_WEIGHT_BURST,
+    ):
+        self.max_rate = weight_per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, weight: float = 1, priority: Priority = Priority.REFRESH) -> None:
+        """Wait until `weight` tokens are granted to this caller"""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), min(weight, self.capacity), future))
+        self._dispatch()
+        await future
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Upstream answered 429: back off multiplicatively and pause"""
+        self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        pause = retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_PAUSE_SECONDS
+        self._blocked_until = max(self._blocked_until, self._updated + pause)
+        self._dispatch()
+
+    def on_success(self) -> None:
+        """Additive recovery towards the configured rate"""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_FRACTION)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        self._refill(now)
+
+        wait = None
+        while self._waiters:
+            _, _, weight, future = self._waiters[0]
+            if future.done():  # cancelled waiter
+                heapq.heappop(self._waiters)
+                continue
+            if now < self._blocked_until:
+                wait = self._blocked_until - now
+                break
+            if self._tokens < weight:
+                wait = (weight - self._tokens) / self.rate
+                break
+            self._tokens -= weight
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+        if wait is not None:
+            self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
@@ -0,0 +1,103 @@
+"""
+Adaptive per-wallet refresh scheduling for Blockblock Trading Competition
+- Tracks how much each wallet's accountValue moves and whether it holds positions
+- Active or volatile wallets are refreshed often, idle ones rarely
+- Wallets with a confirmed live feed (WebSocket ingestion) are only
+  reconciled, on their own slow interval
+- Each tick stays within a total requests-per-minute budget
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+# Scheduling configuration
+LEADERBOARD_REFRESH_BUDGET_PER_MINUTE = float(os.getenv("LEADERBOARD_REFRESH_BUDGET_PER_MINUTE", "300"))
+WALLET_REFRESH_MIN_SECONDS = float(os.getenv("WALLET_REFRESH_MIN_SECONDS", "15"))
+WALLET_REFRESH_MAX_SECONDS = float(os.getenv("WALLET_REFRESH_MAX_SECONDS", "600"))
+
+# Relative accountValue change (EWMA) above which a flat wallet still counts as volatile
+VOLATILITY_THRESHOLD = 0.001
+EWMA_ALPHA = 0.3
+
+
+@dataclass
+class WalletActivity:
+    last_value: Optional[float] = None
+    change_ewma: float = 0.0
+    has_positions: bool = False
+    last_refreshed: float = 0.0
+
+
+class AdaptiveRefreshScheduler:
+    """Chooses which wallets to re-fetch on each leaderboard tick"""
+
+    def __init__(
+        self,
+        budget_per_minute: float = LEADERBOARD_REFRESH_BUDGET_PER_MINUTE,
+        min_interval: float = WALLET_REFRESH_MIN_SECONDS,
+        max_interval: float = WALLET_REFRESH_MAX_SECONDS,
+        live_interval: Optional[float] = None,
+    ):
+        self.budget_per_minute = budget_per_minute
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.live_interval = live_interval
+        self._activity: Dict[int, WalletActivity] = {}
+        self._live: Set[int] = set()
+
+    def set_live(self, user_ids: Iterable[int]) -> None:
+        """Wallets whose updates are pushed; they are re-fetched every live_interval"""
+        self._live = set(user_ids)
+
+    def record(self, user_id: int, account_value: float, has_positions: bool) -> None:
+        """Update activity after a successful fetch"""
+        activity = self._activity.setdefault(user_id, WalletActivity())
+        if activity.last_value is not None:
+            change = abs(account_value - activity.last_value) / max(abs(activity.last_value), 1.0)
+            activity.change_ewma = EWMA_ALPHA * change + (1 - EWMA_ALPHA) * activity.change_ewma
+        activity.last_value = account_value
+        activity.has_positions = has_positions
+        activity.last_refreshed = time.monotonic()
+
+    def forget(self, user_id: int) -> None:
+        self._activity.pop(user_id, None)
+        self._live.discard(user_id)
+
+    def desired_interval(self, user_id: int) -> float:
+        """Open positions or recent movement -> min interval; flat idle wallets -> max"""
+        if self.live_interval is not None and user_id in self._live:
+            return self.live_interval
+        activity = self._activity.get(user_id)
+        if activity is None or activity.has_positions:
+            return self.min_interval
+        if activity.change_ewma >= VOLATILITY_THRESHOLD:
+            return self.min_interval
+        # Scale between the bounds by how close the wallet is to the threshold
+        ratio = activity.change_ewma / VOLATILITY_THRESHOLD
+        return self.max_interval - (self.max_interval - self.min_interval) * ratio
+
+    def select(self, user_ids: Iterable[int], tick_seconds: float) -> List[int]:
+        """
+        Wallets to fetch this tick: never-seen wallets first, then the most
+        overdue relative to their desired interval, capped by the budget.
+        """
+        now = time.monotonic()
+        budget = max(1, int(self.budget_per_minute * tick_seconds / 60))
+
+        unseen: List[int] = []
+        due: List[tuple] = []
+        for user_id in user_ids:
+            activity = self._activity.get(user_id)
+            if activity is None:
+                unseen.append(user_id)
+                continue
+            elapsed = now - activity.last_refreshed
+            interval = self.desired_interval(user_id)
+            # Refresh a tick early rather than a tick late
+            if elapsed + tick_seconds >= interval:
+                due.append((elapsed / interval, user_id))
+
+        due.sort(reverse=True)
+        return (unseen + [user_id for _, user_id in due])[:budget]
@@ -0,0 +1,235 @@
+"""
+Shared leaderboard snapshot for multi-worker deployments (Blockblock Trading Competition)
+- The leader writes each published snapshot once; followers decode it once per version
+- 'file': memory-mapped file replaced atomically (workers on one host)
+- 'postgres': single DB row (workers on several hosts)
+- Several workers default to 'file'; explicitly turning sharing off with
+  several workers is refused, since every worker would poll on its own
+- Optionally (LEADERBOARD_SNAPSHOT_PATH) the latest snapshot is kept on
+  local disk so a restarted worker can serve it before its first refresh
+- Snapshots record which database they were built from; one from another
+  database is never adopted
+"""
+
+import os
+import mmap
+import hashlib
+import asyncio
+import tempfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import MappingProxyType
+from typing import Callable, Optional
+
+import orjson
+from sqlalchemy import select, update
+
+from database import DATABASE_URL, SessionLocal
+from leaderboard import LeaderboardEntry, LeaderboardSnapshot
+from models import SharedLeaderboardSnapshot
+
+# Worker processes: uvicorn takes WEB_CONCURRENCY as its --workers default (so do Procfile/railway.json)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY") or "1")
+# Sharing configuration: 'off' (single worker), 'file' or 'postgres'; unset means 'file' with several workers
+LEADERBOARD_SHARING = os.getenv("LEADERBOARD_SHARING") or ("file" if WEB_CONCURRENCY > 1 else "off")
+if LEADERBOARD_SHARING == "off" and WEB_CONCURRENCY > 1:
+    raise RuntimeError(
+        f"LEADERBOARD_SHARING=off with WEB_CONCURRENCY={WEB_CONCURRENCY}: every worker would refresh "
+        "and write standings on its own; use 'file' (one host) or 'postgres' (several hosts)"
+    )
+LEADERBOARD_SHARED_DIR = os.getenv(
+    "LEADERBOARD_SHARED_DIR", os.path.join(tempfile.gettempdir(), "blockblock-leaderboard")
+)
+LEADERBOARD_FOLLOW_POLL_SECONDS = float(os.getenv("LEADERBOARD_FOLLOW_POLL_SECONDS", "1"))
+# Snapshot kept on disk for warm restarts (opt-in, empty disables); in 'file' mode this is the shared file
+LEADERBOARD_SNAPSHOT_PATH = os.getenv("LEADERBOARD_SNAPSHOT_PATH", "")
+
+# Identifies the database a snapshot was built from (the URL itself is never written out)
+SNAPSHOT_SOURCE = hashlib.blake2b((DATABASE_URL or "").encode(), digest_size=8).hexdigest()
+
+# Order of LeaderboardEntry fields in the shared encoding
+_ENTRY_FIELDS = (
+    "user_id", "rank", "address", "name", "avatar",
+    "account_value", "profit_rate", "initial_balance", "stale", "error",
+)
+
+
+class SnapshotSourceMismatch(ValueError):
+    """The stored snapshot was built from a different database"""
+
+
+def encode_snapshot(snapshot: LeaderboardSnapshot) -> bytes:
+    """Compact, lossless encoding (keeps user_id, unlike the public wire format)"""
+    return orjson.dumps({
+        "source": SNAPSHOT_SOURCE,
+        "generated_at": snapshot.generated_at.isoformat(),
+        "entries": [[getattr(entry, name) for name in _ENTRY_FIELDS] for entry in snapshot.entries],
+    })
+
+
+def decode_snapshot(data) -> LeaderboardSnapshot:
+    payload = orjson.loads(data)
+    if payload.get("source") != SNAPSHOT_SOURCE:
+        raise SnapshotSourceMismatch("snapshot was written for a different database")
+    entries = tuple(LeaderboardEntry(*row) for row in payload["entries"])
+    return LeaderboardSnapshot(
+        generated_at=datetime.fromisoformat(payload["generated_at"]),
+        entries=entries,
+        positions=MappingProxyType({entry.user_id: i for i, entry in enumerate(entries)}),
+    )
+
+
+class _SnapshotStore(ABC):
+    """Writes go through one thread so an older snapshot never overwrites a newer one"""
+
+    def __init__(self):
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-store")
+
+    def publish(self, snapshot: LeaderboardSnapshot) -> None:
+        """Refresher listener on the leader: write in the background"""
+        future = self._writer.submit(self.write, snapshot)
+        future.add_done_callback(_report_write_error)
+
+    @abstractmethod
+    def write(self, snapshot: LeaderboardSnapshot) -> None:
+        """Store the snapshot (runs on the writer thread)"""
+
+    @abstractmethod
+    def read_if_changed(self) -> Optional[LeaderboardSnapshot]:
+        """The stored snapshot if it changed since the last call, else None"""
+
+
+def _report_write_error(future) -> None:
+    if future.exception() is not None:
+        print(f"공유 스냅샷 저장 실패: {future.exception()}")
+
+
+class MmapSnapshotStore(_SnapshotStore):
+    """
+    Snapshot file replaced with os.replace (readers never see a partial
+    write) and read back through mmap without an intermediate copy.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._seen = None
+
+    def write(self, snapshot: LeaderboardSnapshot) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encode_snapshot(snapshot))
+        os.replace(tmp_path, self.path)
+
+    def read_if_changed(self) -> Optional[LeaderboardSnapshot]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._seen or st.st_size == 0:
+            return None
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                snapshot = decode_snapshot(view)
+        self._seen = key
+        return snapshot
+
+
+class DatabaseSnapshotStore(_SnapshotStore):
+    """Single row keyed by id=1; followers poll the version column only"""
+
+    ROW_ID = 1
+
+    def __init__(self):
+        super().__init__()
+        self._seen: Optional[int] = None
+
+    def write(self, snapshot: LeaderboardSnapshot) -> None:
+        version = int(snapshot.generated_at.timestamp() * 1_000_000)
+        payload = encode_snapshot(snapshot)
+        db = SessionLocal()
+        try:
+            updated = db.execute(
+                update(SharedLeaderboardSnapshot)
+                .where(SharedLeaderboardSnapshot.id == self.ROW_ID)
+                .values(version=version, payload=payload)
+            ).rowcount
+            if not updated:
+                db.add(SharedLeaderboardSnapshot(id=self.ROW_ID, version=version, payload=payload))
+            db.commit()
+        finally:
+            db.close()
+
+    def read_if_changed(self) -> Optional[LeaderboardSnapshot]:
+        db = SessionLocal()
+        try:
+            version = db.scalar(
+                select(SharedLeaderboardSnapshot.version).where(SharedLeaderboardSnapshot.id == self.ROW_ID)
+            )
+            if version is None or version == self._seen:
+                return None
+            payload = db.scalar(
+                select(SharedLeaderboardSnapshot.payload).where(SharedLeaderboardSnapshot.id == self.ROW_ID)
+            )
+        finally:
+            db.close()
+        snapshot = decode_snapshot(payload)
+        self._seen = version
+        return snapshot
+
+
+def create_snapshot_store(mode: str = LEADERBOARD_SHARING) -> _SnapshotStore:
+    if mode == "file":
+        return MmapSnapshotStore(LEADERBOARD_SNAPSHOT_PATH or os.path.join(LEADERBOARD_SHARED_DIR, "snapshot.json"))
+    if mode == "postgres":
+        return DatabaseSnapshotStore()
+    raise ValueError(f"unknown LEADERBOARD_SHARING mode: {mode}")
+
+
+class SnapshotFollower:
+    """On non-leader workers, adopts every new snapshot the leader publishes"""
+
+    def __init__(
+        self,
+        store: _SnapshotStore,
+        on_snapshot: Callable[[LeaderboardSnapshot], None],
+        is_leader: Callable[[], bool],
+        poll_seconds: float = LEADERBOARD_FOLLOW_POLL_SECONDS,
+    ):
+        self.store = store
+        self._on_snapshot = on_snapshot
+        self._is_leader = is_leader
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if not self._is_leader():
+                    snapshot = await loop.run_in_executor(None, self.store.read_if_changed)
+                    # Leadership may have been won while reading
+                    if snapshot is not None and not self._is_leader():
+                        self._on_snapshot(snapshot)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"공유 스냅샷 읽기 실패: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
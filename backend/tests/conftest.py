@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Tests import the backend modules the same way uvicorn does (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# database.py builds its engines at import time; point it at a throwaway SQLite file
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
@@ -0,0 +1,135 @@
+"""
+Admin batch endpoints
+- Runs the app without its lifespan (no refresher, no Hyperliquid calls)
+  against the throwaway SQLite database from conftest
+"""
+
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from auth import create_access_token
+from database import Base, SessionLocal, engine
+from models import User
+
+_seq = itertools.count(1)
+
+
+@pytest.fixture(scope="module")
+def client():
+    Base.metadata.create_all(bind=engine)
+    return TestClient(main.app)
+
+
+def make_user(role: str = "user", is_approved: bool = True) -> int:
+    n = next(_seq)
+    db = SessionLocal()
+    try:
+        user = User(
+            username=f"{role}{n}",
+            password_hash="x",
+            wallet_address="0x%040x" % n,
+            role=role,
+            is_approved=is_approved,
+            is_active=True,
+            initial_balance=1000.0,
+            current_balance=1000.0,
+            profit_rate=0.0,
+        )
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def load(user_id: int) -> User:
+    db = SessionLocal()
+    try:
+        return db.get(User, user_id)
+    finally:
+        db.close()
+
+
+def auth_headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+@pytest.mark.parametrize("changes", [
+    {"is_approved": False},
+    {"is_active": False},
+    {"role": "user"},
+])
+def test_admin_cannot_change_themselves(client, changes):
+    admin = make_user("admin")
+    user = make_user()
+
+    response = client.patch(
+        "/api/admin/users", json={"user_ids": [user, admin], **changes}, headers=auth_headers(admin)
+    )
+
+    assert response.status_code == 400
+    assert load(admin).is_approved and load(admin).is_active and load(admin).role == "admin"
+    assert load(user).is_approved and load(user).is_active
+    # Still signed in
+    assert client.get("/api/admin/users", headers=auth_headers(admin)).status_code == 200
+
+
+def test_other_admins_are_skipped(client):
+    admin = make_user("admin")
+    other_admin = make_user("admin")
+    user = make_user()
+
+    response = client.patch(
+        "/api/admin/users",
+        json={"user_ids": [other_admin, user], "is_approved": False},
+        headers=auth_headers(admin),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [u["id"] for u in body["users"]] == [user]
+    assert body["skipped"] == [other_admin]
+    assert load(other_admin).is_approved
+    assert not load(user).is_approved
+
+
+def test_unknown_ids_are_skipped_and_extra_fields_rejected(client):
+    admin = make_user("admin")
+    user = make_user(is_approved=False)
+
+    response = client.patch(
+        "/api/admin/users", json={"user_ids": [user, 999999], "is_approved": True}, headers=auth_headers(admin)
+    )
+    assert response.status_code == 200
+    assert response.json()["skipped"] == [999999]
+    assert load(user).is_approved
+
+    response = client.patch(
+        "/api/admin/users", json={"user_ids": [user], "username": "renamed"}, headers=auth_headers(admin)
+    )
+    assert response.status_code == 422
+
+    response = client.patch("/api/admin/users", json={"user_ids": [user]}, headers=auth_headers(admin))
+    assert response.status_code == 400
+
+
+def test_approve_and_reject_skip_admins(client):
+    admin = make_user("admin")
+    other_admin = make_user("admin", is_approved=False)
+    pending = make_user(is_approved=False)
+
+    response = client.post(
+        "/api/admin/users/approve", json={"user_ids": [pending, other_admin]}, headers=auth_headers(admin)
+    )
+    assert response.json()["skipped"] == [other_admin]
+    assert load(pending).is_approved
+
+    response = client.post(
+        "/api/admin/users/reject", json={"user_ids": [pending, other_admin]}, headers=auth_headers(admin)
+    )
+    assert response.json()["skipped"] == [other_admin]
+    assert load(pending) is None
+    assert load(other_admin) is not None
@@ -0,0 +1,107 @@
+"""
+Cross-worker principal cache invalidation
+- Two broadcasters with their own PrincipalCache stand in for two workers
+  sharing one feed (a log file, or the conftest SQLite database)
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import auth
+from auth import Principal, PrincipalCache
+from auth_invalidation import DatabaseInvalidationFeed, FileInvalidationFeed, InvalidationBroadcaster
+from database import Base, engine
+
+TOKEN = "token-of-user-7"
+
+
+def principal(user_id: int) -> Principal:
+    return Principal(
+        id=user_id,
+        username=f"user{user_id}",
+        wallet_address="0x%040x" % user_id,
+        profile_image_url=None,
+        role="user",
+        is_approved=True,
+        is_active=True,
+        initial_balance=1000.0,
+        current_balance=1000.0,
+        profit_rate=0.0,
+        rank=None,
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+@pytest.fixture(params=["file", "database"])
+def make_feed(request, tmp_path):
+    if request.param == "file":
+        path = str(tmp_path / "auth-invalidations.log")
+        return lambda: FileInvalidationFeed(path)
+    Base.metadata.create_all(bind=engine)
+    return DatabaseInvalidationFeed
+
+
+def test_an_admin_write_in_one_worker_reaches_the_other(make_feed):
+    caches = [PrincipalCache(ttl=3600), PrincipalCache(ttl=3600)]
+    for cache in caches:
+        cache.put(TOKEN, principal(7))
+
+    async def scenario():
+        workers = [
+            InvalidationBroadcaster(make_feed(), on_invalidated=cache.invalidate_user, poll_seconds=0.01)
+            for cache in caches
+        ]
+        for worker in workers:
+            worker.start()
+        await asyncio.sleep(0.05)  # both followers are positioned at the end of the feed
+
+        caches[0].invalidate_user(7)
+        workers[0].publish(7)
+        for _ in range(200):
+            if caches[1].get(TOKEN) is None:
+                break
+            await asyncio.sleep(0.01)
+
+        for worker in workers:
+            await worker.stop()
+
+    asyncio.run(scenario())
+    assert caches[0].get(TOKEN) is None
+    assert caches[1].get(TOKEN) is None
+
+
+def test_feed_starts_at_its_end_and_reads_each_id_once(make_feed):
+    writer, reader = make_feed(), make_feed()
+    writer.write([1, 2])
+    assert reader.read_new() == []  # written before this worker started
+
+    writer.write([3])
+    writer.write([4, 5])
+    assert reader.read_new() == [3, 4, 5]
+    assert reader.read_new() == []
+
+
+def test_file_feed_ignores_a_partial_line(tmp_path):
+    path = tmp_path / "auth-invalidations.log"
+    path.write_bytes(b"")
+    reader = FileInvalidationFeed(str(path))
+    assert reader.read_new() == []
+
+    path.write_bytes(b"12\n3")
+    assert reader.read_new() == [12]
+    path.write_bytes(b"12\n34\n")
+    assert reader.read_new() == [34]
+
+
+def test_invalidate_user_notifies_listeners(monkeypatch):
+    published = []
+    monkeypatch.setattr(auth, "principal_cache", PrincipalCache(ttl=3600))
+    monkeypatch.setattr(auth, "_invalidation_listeners", [published.append])
+    auth.principal_cache.put(TOKEN, principal(7))
+
+    auth.invalidate_user(7)
+
+    assert auth.principal_cache.get(TOKEN) is None
+    assert published == [7]
@@ -0,0 +1,58 @@
+"""
+Bulk import file parsing
+- CSV (header aliases) or JSONL; bad rows are reported, unreadable files refused
+"""
+
+import pytest
+
+import bulk_import
+from bulk_import import ImportFileError, parse_import_file
+
+WALLET = "0x" + "ab" * 20
+
+
+def test_csv_with_aliases_bom_and_blank_lines():
+    data = "\ufeff" f"Name,PIN,Wallet,Note\nalice,1234,{WALLET},x\n,,,\n\nbob, 5678 ,{WALLET},\n".encode()
+
+    rows = parse_import_file(data, "cohort.csv")
+
+    assert rows == [
+        (2, {"username": "alice", "password": "1234", "wallet_address": WALLET}),
+        (5, {"username": "bob", "password": "5678", "wallet_address": WALLET}),
+    ]
+
+
+def test_csv_without_username_header_is_refused():
+    with pytest.raises(ImportFileError):
+        parse_import_file(b"pin,wallet\n1234,0x1\n", "cohort.csv")
+
+
+def test_jsonl_by_extension_or_content():
+    data = f'{{"username": "alice", "pin": 1234, "wallet": "{WALLET}"}}\n\n{{"name": "bob"}}\n'.encode()
+
+    expected = [
+        (1, {"username": "alice", "password": "1234", "wallet_address": WALLET}),
+        (3, {"username": "bob"}),
+    ]
+    assert parse_import_file(data, "cohort.jsonl") == expected
+    assert parse_import_file(data, "upload") == expected
+
+
+def test_bad_jsonl_rows_are_reported_without_failing_the_file():
+    rows = parse_import_file(b'{"username": "alice"}\n{not json\n[1, 2]\n', "cohort.ndjson")
+
+    assert rows[0] == (1, {"username": "alice"})
+    assert rows[1][0] == 2 and "_error" in rows[1][1]
+    assert rows[2][0] == 3 and "_error" in rows[2][1]
+
+
+def test_non_utf8_is_refused():
+    with pytest.raises(ImportFileError):
+        parse_import_file("username\n김철수\n".encode("cp949"), "cohort.csv")
+
+
+def test_row_limit(monkeypatch):
+    monkeypatch.setattr(bulk_import, "BULK_IMPORT_MAX_ROWS", 2)
+    assert len(parse_import_file(b"username\na\nb\n")) == 2
+    with pytest.raises(ImportFileError):
+        parse_import_file(b"username\na\nb\nc\n")
@@ -0,0 +1,72 @@
+"""
+Equity curve downsampling
+- LTTB keeps the endpoints and the visually significant samples
+- The M4 query (main.equity_m4_query) keeps each bucket's first/last/min/max
+  sample, run against the throwaway SQLite database from conftest
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+import main
+from database import Base, SessionLocal, engine
+from downsample import lttb_indices
+from models import EquitySnapshot, User
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_small_series_are_returned_whole():
+    assert lttb_indices([0, 1, 2], [5, 6, 7], threshold=3) == [0, 1, 2]
+    assert lttb_indices([0, 1, 2], [5, 6, 7], threshold=10) == [0, 1, 2]
+
+
+def test_threshold_below_three_keeps_only_endpoints():
+    xs = list(range(10))
+    assert lttb_indices(xs, xs, threshold=2) == [0, 9]
+    assert lttb_indices(xs, xs, threshold=1) == [0]
+    assert lttb_indices(xs, xs, threshold=0) == []
+
+
+def test_output_is_sorted_sized_and_keeps_endpoints():
+    xs = list(range(1000))
+    ys = [math.sin(x / 25) for x in xs]
+    indices = lttb_indices(xs, ys, threshold=50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert indices == sorted(set(indices))
+
+
+def test_spike_survives_downsampling():
+    xs = list(range(100))
+    ys = [0.0] * 100
+    ys[37] = 100.0
+    assert 37 in lttb_indices(xs, ys, threshold=10)
+
+
+def test_m4_query_keeps_extremes_of_every_bucket():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(username="equity-m4", password_hash="x", wallet_address="0x" + "e4" * 20)
+        db.add(user)
+        db.flush()
+        # 100 samples, spikes in the middle of what becomes bucket 3 of 10
+        values = [1000.0 + i for i in range(100)]
+        values[25], values[26] = 5000.0, 10.0
+        db.add_all([
+            EquitySnapshot(user_id=user.id, ts=START + timedelta(minutes=i), account_value=v, profit_rate=0.0)
+            for i, v in enumerate(values)
+        ])
+        db.commit()
+
+        rows = db.execute(main.equity_m4_query([EquitySnapshot.user_id == user.id], buckets=10)).all()
+    finally:
+        db.close()
+
+    kept = [row.account_value for row in rows]
+    assert len(kept) <= 40
+    assert 5000.0 in kept and 10.0 in kept
+    # Every bucket's first and last sample, in time order
+    assert kept[0] == 1000.0 and kept[-1] == 1099.0
+    assert [row.ts for row in rows] == sorted(row.ts for row in rows)
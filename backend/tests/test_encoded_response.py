@@ -0,0 +1,50 @@
+"""
+Pre-encoded JSON responses
+- If-None-Match uses weak comparison; 304s carry no body
+"""
+
+import pytest
+from starlette.requests import Request
+
+from encoded_response import EncodedJSON, _etag_matches, encoded_response
+
+PAYLOAD = EncodedJSON.encode({"entries": list(range(5))})
+OPAQUE = PAYLOAD.etag[2:]  # the quoted tag without W/
+
+
+def request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize("header", [
+    PAYLOAD.etag,
+    OPAQUE,
+    "*",
+    f'"other", {PAYLOAD.etag}',
+    f'W/"other",{OPAQUE}',
+])
+def test_matching_if_none_match(header):
+    assert _etag_matches(request(if_none_match=header), PAYLOAD.etag)
+
+
+@pytest.mark.parametrize("header", [None, "", '"other"', f"W/{OPAQUE[:-2]}\""])
+def test_non_matching_if_none_match(header):
+    headers = {} if header is None else {"if_none_match": header}
+    assert not _etag_matches(request(**headers), PAYLOAD.etag)
+
+
+def test_match_is_a_bodyless_304_with_the_etag():
+    response = encoded_response(request(if_none_match=PAYLOAD.etag), PAYLOAD)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == PAYLOAD.etag
+
+
+def test_small_bodies_are_sent_uncompressed():
+    response = encoded_response(request(accept_encoding="gzip, br"), PAYLOAD)
+    assert response.status_code == 200
+    assert response.body == PAYLOAD.body
+    assert "content-encoding" not in response.headers
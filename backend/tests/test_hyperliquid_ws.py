@@ -0,0 +1,91 @@
+"""
+Hyperliquid WebSocket ingestion against the local replay server
+- Only acknowledged subscriptions count as live
+- Refused subscriptions (per-IP user cap) are dropped, not retried
+"""
+
+import asyncio
+
+import websockets
+
+from hyperliquid_ws import HyperliquidStream
+from ws_replay_server import serve_client
+
+WALLETS = ["0x%040x" % i for i in range(1, 6)]
+
+
+def web_data(address: str, account_value: str) -> dict:
+    return {
+        "channel": "webData2",
+        "data": {"user": address, "clearinghouseState": {"marginSummary": {"accountValue": account_value}}},
+    }
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_only_acknowledged_wallets_are_live():
+    frames = [web_data(address, "1000") for address in WALLETS]
+    states = {}
+    live_updates = []
+
+    async def scenario():
+        async with websockets.serve(
+            lambda ws: serve_client(ws, frames, interval=0.001, drop_after=0, max_users=2), "127.0.0.1", 0
+        ) as server:
+            port = server.sockets[0].getsockname()[1]
+            stream = HyperliquidStream(
+                on_state=lambda address, state: states.setdefault(address, state),
+                on_live=live_updates.append,
+                url=f"ws://127.0.0.1:{port}",
+                max_subscriptions=3,
+                record_path=None,
+            )
+            stream.set_wallets(reversed(WALLETS))
+            stream.start()
+            try:
+                await wait_for(lambda: stream.errors >= 1 and len(states) >= 2)
+                live = set(live_updates[-1])
+                # Re-publishing the same wallets does not retry the refused one
+                stream.set_wallets(reversed(WALLETS))
+                await asyncio.sleep(0.05)
+                return stream, live
+            finally:
+                await stream.stop()
+
+    stream, live = asyncio.run(scenario())
+    # Capped at 3 (top of the list), the server accepted 2 of them
+    assert len(live) == 2 and live <= {WALLETS[4], WALLETS[3], WALLETS[2]}
+    assert set(states) == live
+    assert stream.errors == 1
+
+
+def test_live_set_is_cleared_on_disconnect():
+    frames = [web_data(WALLETS[0], "1000")]
+    live_updates = []
+
+    async def scenario():
+        async with websockets.serve(
+            lambda ws: serve_client(ws, frames, interval=0.001, drop_after=1), "127.0.0.1", 0
+        ) as server:
+            port = server.sockets[0].getsockname()[1]
+            stream = HyperliquidStream(
+                on_state=lambda address, state: None,
+                on_live=live_updates.append,
+                url=f"ws://127.0.0.1:{port}",
+                record_path=None,
+            )
+            stream.set_wallets(WALLETS[:1])
+            stream.start()
+            try:
+                await wait_for(lambda: stream.reconnects >= 1)
+            finally:
+                await stream.stop()
+
+    asyncio.run(scenario())
+    assert live_updates[0] == {WALLETS[0]}
+    assert live_updates[1] == set()
@@ -0,0 +1,87 @@
+"""
+Leader election locks
+- File lock: always runs
+- Postgres advisory lock: set TEST_POSTGRES_URL (postgresql+asyncpg://...) to run
+"""
+
+import os
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from leader_election import FileLeaderLock, LeaderElector, PostgresLeaderLock
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+TEST_LOCK_KEY = 0x7E57  # distinct from the application key
+
+
+def test_file_lock_is_exclusive_until_released(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "leader.lock")
+        first, second = FileLeaderLock(path), FileLeaderLock(path)
+        assert await first.try_acquire()
+        assert not await second.try_acquire()
+        assert await first.still_held()
+        await first.release()
+        assert await second.try_acquire()
+        await second.release()
+
+    asyncio.run(scenario())
+
+
+def test_elector_runs_callbacks_on_election_and_shutdown(tmp_path):
+    events = []
+
+    async def on_elected():
+        events.append("elected")
+
+    async def on_demoted():
+        events.append("demoted")
+
+    async def scenario():
+        elector = LeaderElector(FileLeaderLock(str(tmp_path / "leader.lock")), on_elected, on_demoted, retry_seconds=0.01)
+        elector.start()
+        for _ in range(100):
+            if elector.is_leader:
+                break
+            await asyncio.sleep(0.01)
+        assert elector.is_leader
+        await elector.stop()
+        assert not elector.is_leader
+
+    asyncio.run(scenario())
+    assert events == ["elected", "demoted"]
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+def test_postgres_lock_is_exclusive_and_not_idle_in_transaction():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async def scenario():
+        engine = create_async_engine(TEST_POSTGRES_URL)
+        first = PostgresLeaderLock(engine, key=TEST_LOCK_KEY)
+        second = PostgresLeaderLock(engine, key=TEST_LOCK_KEY)
+        try:
+            assert await first.try_acquire()
+            assert not await second.try_acquire()
+            assert await first.still_held()
+
+            # The lock holder must not keep a transaction open
+            holder_pid = await first._conn.scalar(text("SELECT pg_backend_pid()"))
+            async with engine.connect() as conn:
+                state = await conn.scalar(
+                    text("SELECT state FROM pg_stat_activity WHERE pid = :pid"), {"pid": holder_pid}
+                )
+            assert state == "idle"
+
+            await first.release()
+            assert not await first.still_held()
+            assert await second.try_acquire()
+            await second.release()
+        finally:
+            await first.release()
+            await second.release()
+            await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,227 @@
+"""
+Leaderboard refresher
+- DB access (load_participants / persist_snapshot) is replaced per test
+"""
+
+import asyncio
+
+import orjson
+import pytest
+
+import leaderboard
+from leaderboard import LeaderboardRefresher, Participant
+from refresh_scheduler import AdaptiveRefreshScheduler
+
+
+def participant(user_id: int, current_balance=None, initial_balance=1000.0) -> Participant:
+    return Participant(
+        user_id=user_id,
+        wallet_address="0x%040x" % user_id,
+        username=f"user{user_id}",
+        profile_image_url=None,
+        initial_balance=initial_balance,
+        current_balance=current_balance,
+        profit_rate=None,
+        rank=None,
+    )
+
+
+class FakeDB:
+    def __init__(self):
+        self.participants = []
+        self.persisted = []
+
+    def load_participants(self):
+        return list(self.participants)
+
+    def persist_snapshot(self, snapshot, participants, sampled):
+        self.persisted.append((snapshot, sampled))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(leaderboard, "load_participants", db.load_participants)
+    monkeypatch.setattr(leaderboard, "persist_snapshot", db.persist_snapshot)
+    return db
+
+
+def make_refresher(budget_per_minute: float, fetched: list, **kwargs) -> LeaderboardRefresher:
+    async def fetch_state(address, username, profile_image_url, initial_balance, last_balance=None):
+        fetched.append(address)
+        return {
+            "address": address,
+            "username": username,
+            "profile_image_url": profile_image_url,
+            "accountValue": 2000.0,
+            "initial_balance": initial_balance,
+            "profit_rate": leaderboard.compute_profit_rate(2000.0, initial_balance),
+            "has_positions": False,
+            "book": None,
+            "stale": False,
+            "error": None,
+        }
+
+    return LeaderboardRefresher(
+        fetch_state=fetch_state,
+        interval=30,
+        scheduler=AdaptiveRefreshScheduler(budget_per_minute=budget_per_minute),
+        **kwargs
+    )
+
+
+def test_cold_start_fetches_within_budget_and_seeds_the_rest_from_db(db):
+    db.participants = [participant(i, current_balance=1000.0 + i) for i in range(1, 11)]
+    fetched = []
+    refresher = make_refresher(budget_per_minute=8, fetched=fetched)
+
+    snapshot = asyncio.run(refresher.refresh())
+
+    assert len(fetched) == 4  # 8/min over a 30 s tick
+    assert len(snapshot.entries) == 10
+    fresh = [entry for entry in snapshot.entries if not entry.stale]
+    seeded = [entry for entry in snapshot.entries if entry.stale]
+    assert len(fresh) == 4 and all(entry.account_value == 2000.0 for entry in fresh)
+    assert all(entry.account_value == 1000.0 + entry.user_id for entry in seeded)
+    # Only fetched wallets count as equity samples
+    assert db.persisted[0][1] == {entry.user_id for entry in fresh}
+
+
+def test_seeded_wallets_are_fetched_on_later_ticks(db):
+    db.participants = [participant(i) for i in range(1, 7)]
+    fetched = []
+    refresher = make_refresher(budget_per_minute=6, fetched=fetched)
+
+    async def scenario():
+        for _ in range(2):
+            await refresher.refresh()
+        return refresher.snapshot
+
+    snapshot = asyncio.run(scenario())
+    assert len(fetched) == 6
+    assert len(set(fetched)) == 6
+    assert not any(entry.stale for entry in snapshot.entries)
+
+
+def test_stop_cancels_the_refresh_in_flight(db):
+    db.participants = [participant(1)]
+    started = []
+    cancelled = []
+
+    async def fetch_state(*args):
+        started.append(args[0])
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(args[0])
+            raise
+
+    async def scenario():
+        refresher = LeaderboardRefresher(fetch_state=fetch_state, interval=30)
+        refresher.start()
+        while not started:
+            await asyncio.sleep(0.001)
+        await refresher.stop()
+        # Nothing left running that could still persist or publish
+        await asyncio.sleep(0.01)
+        return refresher
+
+    refresher = asyncio.run(scenario())
+    assert cancelled == started
+    assert db.persisted == []
+    assert refresher.snapshot is None
+
+
+def test_demoted_worker_does_not_persist_or_publish(db):
+    db.participants = [participant(1)]
+    leader = {"value": True}
+    fetched = []
+    refresher = make_refresher(budget_per_minute=60, fetched=fetched, is_leader=lambda: leader["value"])
+
+    async def scenario():
+        await refresher.refresh()
+        leader["value"] = False
+        await refresher.refresh()
+
+    asyncio.run(scenario())
+    assert len(db.persisted) == 1
+    assert refresher.snapshot is db.persisted[0][0]
+
+
+def test_participant_list_is_encoded_once_per_page(db):
+    db.participants = [participant(i, initial_balance=1000.0 * i) for i in range(1, 4)]
+    snapshot = asyncio.run(make_refresher(budget_per_minute=60, fetched=[]).refresh())
+
+    full = snapshot.encoded_users()
+    assert snapshot.encoded_users() is full
+    users = orjson.loads(full.body)
+    assert [user["rank"] for user in users] == [1, 2, 3]
+    assert [user["id"] for user in users] == [1, 2, 3]  # 2000 on 1000 is the best return
+    assert set(users[0]) == {"id", "username", "wallet_address", "profile_image_url", "profit_rate", "rank"}
+
+    page = orjson.loads(snapshot.encoded_users(after_rank=1, limit=1).body)
+    assert [user["id"] for user in page] == [2]
+
+
+def test_restored_entries_stay_stale_until_refetched(db):
+    db.participants = [participant(i) for i in range(1, 5)]
+    persisted = asyncio.run(make_refresher(budget_per_minute=60, fetched=[]).refresh())
+    assert not any(entry.stale for entry in persisted.entries)
+
+    fetched = []
+    refresher = make_refresher(budget_per_minute=4, fetched=fetched)  # 2 wallets per tick
+    kept = refresher.restore_snapshot(persisted, user_ids={1, 2, 3, 4}, serve=True)
+
+    assert kept == 4
+    assert refresher.snapshot.generated_at == persisted.generated_at
+    assert all(entry.stale for entry in refresher.snapshot.entries)
+
+    snapshot = asyncio.run(refresher.refresh())
+    refetched = {"0x%040x" % entry.user_id for entry in snapshot.entries if not entry.stale}
+    assert len(fetched) == 2 and refetched == set(fetched)
+
+
+def wallet_state(user_id: int, profit_rate: float, **overrides) -> dict:
+    state = {
+        "user_id": user_id,
+        "address": "0x%040x" % user_id,
+        "username": f"user{user_id}",
+        "profile_image_url": None,
+        "accountValue": 1000.0 + profit_rate * 10,
+        "initial_balance": 1000.0,
+        "profit_rate": profit_rate,
+    }
+    state.update(overrides)
+    return state
+
+
+def test_build_snapshot_ranks_by_profit_rate_with_user_id_tiebreak():
+    snapshot = leaderboard.build_snapshot([
+        wallet_state(1, 5.0), wallet_state(2, 20.0), wallet_state(3, 5.0), wallet_state(4, -3.0),
+    ])
+    assert [(entry.user_id, entry.rank) for entry in snapshot.entries] == [(2, 1), (1, 2), (3, 3), (4, 4)]
+    assert snapshot.rank_of(3) == 3 and snapshot.rank_of(99) is None
+    assert snapshot.entries[0].avatar == leaderboard.DEFAULT_AVATAR
+
+
+def test_page_around_and_next_cursor():
+    snapshot = leaderboard.build_snapshot([wallet_state(i, float(100 - i)) for i in range(1, 11)])
+
+    page = snapshot.page(after_rank=2, limit=3)
+    assert [entry.rank for entry in page] == [3, 4, 5]
+    assert snapshot.to_dict(page)["next_after_rank"] == 5
+    assert snapshot.to_dict(snapshot.page(after_rank=8, limit=5))["next_after_rank"] is None
+    assert snapshot.to_dict(snapshot.page(after_rank=10))["entries"] == []
+    assert snapshot.to_dict()["total"] == 10
+
+    assert [entry.user_id for entry in snapshot.around(5, 2)] == [3, 4, 5, 6, 7]
+    assert [entry.user_id for entry in snapshot.around(1, 2)] == [1, 2, 3]
+    assert snapshot.around(99, 2) == ()
+
+
+def test_full_page_reuses_the_snapshot_encoding():
+    snapshot = leaderboard.build_snapshot([wallet_state(i, float(i)) for i in range(1, 4)])
+    assert snapshot.encoded_page() is snapshot.encoded
+    assert snapshot.encoded_page(limit=10) is snapshot.encoded
+    assert snapshot.encoded_page(after_rank=1, limit=1) is snapshot.encoded_page(after_rank=1, limit=1)
+    assert orjson.loads(snapshot.encoded_page(after_rank=1, limit=1).body)["next_after_rank"] == 2
@@ -0,0 +1,63 @@
+"""
+Leaderboard push stream deltas
+- Only changed rows are sent; joins and leaves are reported by address
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from leaderboard import build_snapshot
+from leaderboard_stream import diff_snapshots
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def snapshot(rates: dict, minutes: int = 0, names: dict = None):
+    return build_snapshot(
+        [
+            {
+                "user_id": user_id,
+                "address": "0x%040x" % user_id,
+                "username": (names or {}).get(user_id, f"user{user_id}"),
+                "profile_image_url": None,
+                "accountValue": 1000.0 + rate * 10,
+                "initial_balance": 1000.0,
+                "profit_rate": rate,
+            }
+            for user_id, rate in rates.items()
+        ],
+        generated_at=START + timedelta(minutes=minutes),
+    )
+
+
+def test_unchanged_snapshot_has_no_delta():
+    assert diff_snapshots(snapshot({1: 5.0, 2: 3.0}), snapshot({1: 5.0, 2: 3.0}, minutes=1)) is None
+
+
+def test_only_changed_rows_are_sent():
+    previous = snapshot({1: 5.0, 2: 3.0, 3: 1.0})
+    current = snapshot({1: 5.0, 2: 3.0, 3: 2.0}, minutes=1)
+
+    delta = diff_snapshots(previous, current)
+
+    assert delta["generated_at"] == current.generated_at.isoformat()
+    assert [row["address"] for row in delta["updated"]] == ["0x%040x" % 3]
+    assert delta["updated"][0]["roi24h"] == 2.0
+    assert delta["joined"] == [] and delta["left"] == []
+
+
+def test_rank_and_profile_changes_count_as_updates():
+    previous = snapshot({1: 5.0, 2: 3.0})
+    current = snapshot({1: 5.0, 2: 9.0}, minutes=1, names={1: "renamed"})
+
+    updated = {row["address"]: row for row in diff_snapshots(previous, current)["updated"]}
+
+    assert updated["0x%040x" % 2]["rank"] == 1
+    assert updated["0x%040x" % 1]["rank"] == 2 and updated["0x%040x" % 1]["name"] == "renamed"
+
+
+def test_joins_and_leaves():
+    delta = diff_snapshots(snapshot({1: 5.0, 2: 3.0}), snapshot({1: 5.0, 3: 1.0}, minutes=1))
+
+    assert [row["address"] for row in delta["joined"]] == ["0x%040x" % 3]
+    assert delta["left"] == ["0x%040x" % 2]
+    assert delta["updated"] == []
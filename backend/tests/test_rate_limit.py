@@ -0,0 +1,93 @@
+"""
+Upstream rate-limit budget
+- Burst, strict priority order, and 429 backoff/recovery of the token bucket
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from rate_limit import MIN_RATE_FRACTION, RECOVERY_FRACTION, Priority, TokenBucketScheduler
+
+
+def test_burst_is_granted_without_waiting():
+    scheduler = TokenBucketScheduler(weight_per_minute=60, burst=5)  # 1 token/s after the burst
+
+    async def scenario():
+        started = time.monotonic()
+        await asyncio.gather(*(scheduler.acquire() for _ in range(5)))
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 0.1
+
+
+def test_critical_is_served_before_queued_refreshes():
+    scheduler = TokenBucketScheduler(weight_per_minute=6000, burst=1)  # a token every 10 ms
+    order = []
+
+    async def acquire(name, priority):
+        await scheduler.acquire(priority=priority)
+        order.append(name)
+
+    async def scenario():
+        await scheduler.acquire()  # empty the bucket
+        tasks = [asyncio.create_task(acquire(f"refresh{i}", Priority.REFRESH)) for i in range(3)]
+        tasks.append(asyncio.create_task(acquire("background", Priority.BACKGROUND)))
+        await asyncio.sleep(0)  # all queued
+        tasks.append(asyncio.create_task(acquire("critical", Priority.CRITICAL)))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert order == ["critical", "refresh0", "refresh1", "refresh2", "background"]
+
+
+def test_weight_above_the_burst_is_capped_instead_of_waiting_forever():
+    scheduler = TokenBucketScheduler(weight_per_minute=60, burst=5)
+    asyncio.run(asyncio.wait_for(scheduler.acquire(weight=20), timeout=1))
+
+
+def test_cancelled_waiter_does_not_hold_up_the_queue():
+    scheduler = TokenBucketScheduler(weight_per_minute=6000, burst=1)
+
+    async def scenario():
+        await scheduler.acquire()
+        blocked = asyncio.create_task(scheduler.acquire(weight=1, priority=Priority.CRITICAL))
+        follower = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        blocked.cancel()
+        await asyncio.wait_for(follower, timeout=1)
+        return scheduler.queue_depth
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_rate_limited_halves_the_rate_and_pauses():
+    scheduler = TokenBucketScheduler(weight_per_minute=6000, burst=10)
+
+    async def scenario():
+        scheduler.on_rate_limited(retry_after=0.2)
+        started = time.monotonic()
+        await scheduler.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) >= 0.19
+    assert scheduler.rate == pytest.approx(scheduler.max_rate / 2)
+
+
+def test_rate_stays_above_the_floor_and_recovers_additively():
+    scheduler = TokenBucketScheduler(weight_per_minute=6000, burst=10)
+
+    async def scenario():
+        for _ in range(20):
+            scheduler.on_rate_limited(retry_after=0)
+
+    asyncio.run(scenario())
+    assert scheduler.rate == pytest.approx(scheduler.max_rate * MIN_RATE_FRACTION)
+
+    scheduler.on_success()
+    assert scheduler.rate == pytest.approx(scheduler.max_rate * (MIN_RATE_FRACTION + RECOVERY_FRACTION))
+
+    for _ in range(200):
+        scheduler.on_success()
+    assert scheduler.rate == scheduler.max_rate
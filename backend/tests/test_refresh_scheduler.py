@@ -0,0 +1,90 @@
+"""
+Adaptive refresh scheduler
+- Unseen wallets first, then the most overdue, always within the budget
+- Positions or movement keep a wallet on the short interval
+"""
+
+import pytest
+
+import refresh_scheduler
+from refresh_scheduler import AdaptiveRefreshScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(refresh_scheduler, "time", clock)
+    return clock
+
+
+def test_budget_caps_unseen_wallets(clock):
+    # 60/min over a 30 s tick -> 30 fetches, even on a cold start
+    scheduler = AdaptiveRefreshScheduler(budget_per_minute=60, min_interval=15, max_interval=600)
+    assert scheduler.select(range(500), tick_seconds=30) == list(range(30))
+
+
+def test_unseen_wallets_come_before_due_ones(clock):
+    scheduler = AdaptiveRefreshScheduler(budget_per_minute=6, min_interval=15, max_interval=600)
+    scheduler.record(1, 100.0, has_positions=True)
+    clock.now += 60
+    assert scheduler.select([1, 2, 3], tick_seconds=30) == [2, 3, 1]
+    assert scheduler.select([1, 2, 3], tick_seconds=10) == [2]
+
+
+def test_most_overdue_first_and_fresh_wallets_skipped(clock):
+    scheduler = AdaptiveRefreshScheduler(budget_per_minute=600, min_interval=10, max_interval=600)
+    scheduler.record(1, 100.0, has_positions=True)
+    clock.now += 15
+    scheduler.record(2, 100.0, has_positions=True)
+    clock.now += 15
+    scheduler.record(3, 100.0, has_positions=True)
+    clock.now += 1
+    # 1 is 31 s old, 2 is 16 s old, 3 was refreshed a second ago
+    assert scheduler.select([3, 2, 1], tick_seconds=1) == [1, 2]
+
+
+def test_desired_interval_follows_activity(clock):
+    scheduler = AdaptiveRefreshScheduler(min_interval=15, max_interval=600)
+    assert scheduler.desired_interval(1) == 15  # never seen
+
+    scheduler.record(1, 100.0, has_positions=True)
+    assert scheduler.desired_interval(1) == 15
+
+    scheduler.record(2, 100.0, has_positions=False)
+    scheduler.record(2, 100.0, has_positions=False)
+    assert scheduler.desired_interval(2) == 600  # flat and idle
+
+    scheduler.record(3, 100.0, has_positions=False)
+    scheduler.record(3, 150.0, has_positions=False)
+    assert scheduler.desired_interval(3) == 15  # moving
+
+
+def test_forget_makes_a_wallet_unseen_again(clock):
+    scheduler = AdaptiveRefreshScheduler(budget_per_minute=600, min_interval=15, max_interval=600)
+    scheduler.record(1, 100.0, has_positions=False)
+    assert scheduler.select([1], tick_seconds=1) == []
+    scheduler.forget(1)
+    assert scheduler.select([1], tick_seconds=1) == [1]
+
+
+def test_live_wallets_use_the_live_interval_and_others_adapt(clock):
+    scheduler = AdaptiveRefreshScheduler(min_interval=15, max_interval=600, live_interval=300)
+    scheduler.record(1, 100.0, has_positions=True)
+    scheduler.record(2, 100.0, has_positions=True)
+    scheduler.set_live([1])
+    assert scheduler.desired_interval(1) == 300
+    assert scheduler.desired_interval(2) == 15
+
+    clock.now += 20
+    assert scheduler.select([1, 2], tick_seconds=1) == [2]
+
+    scheduler.set_live([])  # e.g. the WebSocket dropped
+    assert sorted(scheduler.select([1, 2], tick_seconds=1)) == [1, 2]
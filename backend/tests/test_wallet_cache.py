@@ -0,0 +1,121 @@
+"""
+Wallet state cache
+- TTL hits, shared fetches, stale fallback and pruning
+- The deadline is handed to the fetch and never cuts off a fetch that is
+  still waiting for rate budget
+"""
+
+import asyncio
+
+import pytest
+
+from wallet_cache import WalletStateCache
+
+ADDRESS = "0x" + "ab" * 20
+
+
+class FakeFetch:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.error = None
+
+    async def __call__(self, address: str, timeout: float) -> dict:
+        self.calls.append((address, timeout))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"marginSummary": {"accountValue": str(len(self.calls))}}
+
+
+def test_fresh_entry_is_served_without_fetching():
+    fetch = FakeFetch()
+
+    async def scenario():
+        cache = WalletStateCache(fetch, ttl=60, deadline=3)
+        first, info = await cache.get(ADDRESS.upper())
+        second, _ = await cache.get(ADDRESS)
+        return cache, first, second, info
+
+    cache, first, second, info = asyncio.run(scenario())
+    assert fetch.calls == [(ADDRESS, 3)]
+    assert first is second
+    assert not info.stale
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_concurrent_misses_share_one_fetch():
+    fetch = FakeFetch(delay=0.01)
+
+    async def scenario():
+        cache = WalletStateCache(fetch, ttl=60)
+        return await asyncio.gather(*(cache.get(ADDRESS) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(fetch.calls) == 1
+    assert all(state is results[0][0] for state, _ in results)
+
+
+def test_slow_fetch_is_awaited_past_the_deadline():
+    # e.g. queued behind the rate limiter: not a failure, so not stale
+    fetch = FakeFetch(delay=0.05)
+
+    async def scenario():
+        cache = WalletStateCache(fetch, ttl=0, deadline=0.01)
+        await cache.get(ADDRESS)
+        return await cache.get(ADDRESS)
+
+    state, info = asyncio.run(scenario())
+    assert not info.stale
+    assert state["marginSummary"]["accountValue"] == "2"
+
+
+def test_failed_fetch_falls_back_to_last_good_state():
+    fetch = FakeFetch()
+
+    async def scenario():
+        cache = WalletStateCache(fetch, ttl=0, stale_window=60)
+        good, _ = await cache.get(ADDRESS)
+        fetch.error = RuntimeError("HTTP 502 from /info")
+        state, info = await cache.get(ADDRESS)
+        return cache, good, state, info
+
+    cache, good, state, info = asyncio.run(scenario())
+    assert state is good
+    assert info.stale
+    assert info.error == "HTTP 502 from /info"
+    assert cache.stale_served == 1
+
+
+def test_failed_fetch_without_usable_state_raises():
+    fetch = FakeFetch()
+    fetch.error = RuntimeError("down")
+
+    async def scenario():
+        cache = WalletStateCache(fetch, ttl=0, stale_window=0)
+        with pytest.raises(RuntimeError):
+            await cache.get(ADDRESS)
+        # An expired last good state is not used either
+        fetch.error = None
+        await cache.get(ADDRESS)
+        fetch.error = RuntimeError("down")
+        await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError):
+            await cache.get(ADDRESS)
+
+    asyncio.run(scenario())
+
+
+def test_retain_drops_wallets_that_left():
+    other = "0x" + "cd" * 20
+
+    async def scenario():
+        cache = WalletStateCache(FakeFetch(), ttl=60)
+        await cache.get(ADDRESS)
+        await cache.get(other)
+        return cache, cache.retain([ADDRESS.upper()])
+
+    cache, removed = asyncio.run(scenario())
+    assert removed == 1
+    assert len(cache) == 1
+    assert cache.stats()["slowest"][0]["address"] == ADDRESS
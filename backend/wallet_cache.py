@@ -0,0 +1,142 @@
+"""
+Per-wallet state cache for Blockblock Trading Competition
+- Fresh entries are served without an upstream call
+- Each upstream request gets a deadline (time queued for the rate budget
+  doesn't count); failed fetches fall back to the last good state (marked
+  stale)
+- Fetch latency and age are recorded per wallet
+- Wallets that leave the leaderboard are pruned on every published snapshot
+"""
+
+import os
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Cache configuration
+WALLET_STATE_TTL_SECONDS = float(os.getenv("WALLET_STATE_TTL_SECONDS", "10"))
+WALLET_STATE_STALE_SECONDS = float(os.getenv("WALLET_STATE_STALE_SECONDS", "900"))
+# Timeout per upstream HTTP request, passed to the fetch function
+WALLET_FETCH_DEADLINE_SECONDS = float(os.getenv("WALLET_FETCH_DEADLINE_SECONDS", "3"))
+
+
+@dataclass(frozen=True)
+class CachedWalletState:
+    """Last good clearinghouseState for one wallet"""
+    state: dict
+    fetched_at: float   # time.monotonic()
+    latency: float      # seconds the fetch took
+
+
+@dataclass(frozen=True)
+class WalletStateInfo:
+    """How a served state was obtained"""
+    stale: bool
+    age_seconds: float
+    latency_seconds: Optional[float]
+    error: Optional[str] = None
+
+
+class WalletStateCache:
+    """
+    Stale-while-revalidate cache in front of a wallet-state fetch function.
+    fetch(address, timeout) must apply the timeout to the HTTP request only,
+    so a fetch waiting its turn in the rate limiter is never counted as slow.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, float], Awaitable[dict]],
+        ttl: float = WALLET_STATE_TTL_SECONDS,
+        stale_window: float = WALLET_STATE_STALE_SECONDS,
+        deadline: float = WALLET_FETCH_DEADLINE_SECONDS,
+    ):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.stale_window = stale_window
+        self.deadline = deadline
+        self._entries: Dict[str, CachedWalletState] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def retain(self, addresses: Iterable[str]) -> int:
+        """
+        Drop every wallet not in addresses (rejected, deactivated or
+        re-pointed users). Returns how many entries were removed.
+        """
+        keep = {address.lower() for address in addresses}
+        stale = [address for address in self._entries if address not in keep]
+        for address in stale:
+            del self._entries[address]
+        return len(stale)
+
+    async def get(self, address: str) -> Tuple[dict, WalletStateInfo]:
+        """
+        Return (state, info). Raises the fetch error only when there is no
+        usable last good state to fall back to.
+        """
+        address = address.lower()
+        entry = self._entries.get(address)
+        now = time.monotonic()
+
+        if entry is not None and now - entry.fetched_at <= self.ttl:
+            self.hits += 1
+            return entry.state, WalletStateInfo(False, now - entry.fetched_at, entry.latency)
+
+        self.misses += 1
+        task = self._inflight.get(address)
+        if task is None:
+            task = asyncio.ensure_future(self._revalidate(address))
+            # The fetch may outlive every waiter; don't leave its error unretrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[address] = task
+
+        try:
+            # A cancelled waiter must not cancel the fetch other callers share
+            fresh = await asyncio.shield(task)
+            return fresh.state, WalletStateInfo(False, 0.0, fresh.latency)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            entry = self._entries.get(address)
+            now = time.monotonic()
+            if entry is None or now - entry.fetched_at > self.stale_window:
+                raise
+            self.stale_served += 1
+            return entry.state, WalletStateInfo(True, now - entry.fetched_at, entry.latency, error)
+
+    async def _revalidate(self, address: str) -> CachedWalletState:
+        started = time.monotonic()
+        try:
+            state = await self._fetch(address, self.deadline)
+            entry = CachedWalletState(state, time.monotonic(), time.monotonic() - started)
+            self._entries[address] = entry
+            return entry
+        finally:
+            self._inflight.pop(address, None)
+
+    def stats(self, limit: int = 20) -> dict:
+        """Hit/miss counters plus the slowest and oldest wallets"""
+        now = time.monotonic()
+        rows: List[dict] = [
+            {
+                "address": address,
+                "age_seconds": round(now - entry.fetched_at, 1),
+                "latency_seconds": round(entry.latency, 3),
+            }
+            for address, entry in self._entries.items()
+        ]
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "slowest": sorted(rows, key=lambda r: r["latency_seconds"], reverse=True)[:limit],
+            "oldest": sorted(rows, key=lambda r: r["age_seconds"], reverse=True)[:limit],
+        }
@@ -0,0 +1,101 @@
+"""
+Local Hyperliquid WebSocket stand-in that replays recorded frames
+Use it to exercise HYPERLIQUID_INGESTION_MODE=ws without mainnet:
+
+    python ws_replay_server.py frames.jsonl --port 8765 --interval 0.5
+    HYPERLIQUID_INGESTION_MODE=ws HYPERLIQUID_WS_URL=ws://localhost:8765 uvicorn main:app
+
+frames.jsonl holds one raw server frame per line, e.g. as written by
+HYPERLIQUID_WS_RECORD_PATH. Each client only receives frames for the
+users it subscribed to; the file is replayed in a loop. Like Hyperliquid,
+subscriptions past --max-users distinct users get an error frame instead
+of an acknowledgement.
+"""
+
+import sys
+import json
+import asyncio
+import argparse
+
+import websockets
+
+
+def load_frames(path: str) -> list:
+    frames = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                frames.append(json.loads(line))
+    return frames
+
+
+async def serve_client(ws, frames: list, interval: float, drop_after: int, max_users: int = 0) -> None:
+    subscribed = set()
+
+    async def replay():
+        sent = 0
+        while True:
+            for frame in frames:
+                data = frame.get("data")
+                user = data.get("user", "").lower() if isinstance(data, dict) else ""
+                if frame.get("channel") in ("subscriptionResponse", "pong") or user not in subscribed:
+                    continue
+                await ws.send(json.dumps(frame))
+                sent += 1
+                if drop_after and sent >= drop_after:
+                    # Simulate an upstream disconnect to exercise reconnects
+                    await ws.close()
+                    return
+                await asyncio.sleep(interval)
+            await asyncio.sleep(interval)
+
+    replayer = asyncio.create_task(replay())
+    try:
+        async for raw in ws:
+            message = json.loads(raw)
+            method = message.get("method")
+            if method == "ping":
+                await ws.send(json.dumps({"channel": "pong"}))
+            elif method in ("subscribe", "unsubscribe"):
+                user = message["subscription"].get("user", "").lower()
+                if method == "subscribe":
+                    if max_users and user not in subscribed and len(subscribed) >= max_users:
+                        await ws.send(json.dumps({
+                            "channel": "error",
+                            "data": f"Cannot track more than {max_users} total users. {json.dumps(message)}",
+                        }))
+                        continue
+                    subscribed.add(user)
+                else:
+                    subscribed.discard(user)
+                await ws.send(json.dumps({"channel": "subscriptionResponse", "data": message}))
+    finally:
+        replayer.cancel()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded Hyperliquid WS frames")
+    parser.add_argument("frames", help="JSONL file with one frame per line")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between frames")
+    parser.add_argument("--drop-after", type=int, default=0, help="close the connection after N frames")
+    parser.add_argument("--max-users", type=int, default=0, help="refuse subscriptions past N users (0: no cap)")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    print(f"🔁 Replaying {len(frames)} frames on ws://{args.host}:{args.port}")
+    async with websockets.serve(
+        lambda ws: serve_client(ws, frames, args.interval, args.drop_after, args.max_users),
+        args.host,
+        args.port,
+    ):
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        sys.exit(0)
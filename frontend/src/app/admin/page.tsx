@@ -4,16 +4,36 @@ import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 import { isAuthenticated, isAdmin, fetchWithAuth, getCurrentUser, logout } from "@/lib/auth";
 import { User } from "@/lib/auth";
-import { Check, X, Edit, Loader2, ArrowLeft, LogOut } from "lucide-react";
+import { Check, X, Edit, Loader2, ArrowLeft, LogOut, Search } from "lucide-react";
 import Image from "next/image";
 
 const API_URL = "https://blockblock-trading-competition-production-f6b5.up.railway.app";
+const PAGE_SIZE = 50;
+
+interface UserCounts {
+    all: number;
+    pending: number;
+    approved: number;
+}
+
+interface DeletedUser {
+    id: number;
+    username: string;
+    is_approved: boolean;
+}
 
 export default function AdminPage() {
     const router = useRouter();
     const [users, setUsers] = useState<User[]>([]);
     const [loading, setLoading] = useState(true);
     const [filter, setFilter] = useState<"all" | "pending" | "approved">("all");
+    const [search, setSearch] = useState("");
+    const [query, setQuery] = useState("");
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [counts, setCounts] = useState<UserCounts | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [selected, setSelected] = useState<Set<number>>(new Set());
+    const [working, setWorking] = useState(false);
     const [editingUser, setEditingUser] = useState<User | null>(null);
     const [editForm, setEditForm] = useState({
         username: "",
@@ -33,15 +53,33 @@ export default function AdminPage() {
         }
 
         fetchUsers();
-    }, [router, filter]);
+    }, [router, filter, query]);
+
+    // Debounce the search box so typing doesn't fire a request per keystroke
+    useEffect(() => {
+        const timer = setTimeout(() => setQuery(search.trim()), 300);
+        return () => clearTimeout(timer);
+    }, [search]);
+
+    const fetchPage = async (cursor: string | null) => {
+        const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+        if (filter !== "all") params.set("status_filter", filter);
+        if (query) params.set("q", query);
+        if (cursor) params.set("cursor", cursor);
 
+        const response = await fetchWithAuth(`${API_URL}/api/admin/users?${params}`);
+        const data = await response.json();
+        setNextCursor(data.next_cursor);
+        setCounts(data.counts);
+        return data.items as User[];
+    };
+
+    // Reload from the first page (filter/search change)
     const fetchUsers = async () => {
         setLoading(true);
+        setSelected(new Set());
         try {
-            const filterParam = filter === "all" ? "" : `?status_filter=${filter}`;
-            const response = await fetchWithAuth(`${API_URL}/api/admin/users${filterParam}`);
-            const data = await response.json();
-            setUsers(data);
+            setUsers(await fetchPage(null));
         } catch (error) {
             console.error("Failed to fetch users:", error);
         } finally {
@@ -49,32 +87,109 @@ export default function AdminPage() {
         }
     };
 
-    const handleApprove = async (userId: number) => {
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
         try {
-            await fetchWithAuth(`${API_URL}/api/admin/approve/${userId}`, {
-                method: "POST",
+            const items = await fetchPage(nextCursor);
+            setUsers((prev) => [...prev, ...items]);
+        } catch (error) {
+            console.error("Failed to fetch users:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    // Batch endpoints return the affected rows, so the list is patched in place instead of reloaded
+    const postBatch = async (path: string, userIds: number[]) => {
+        const response = await fetchWithAuth(`${API_URL}/api/admin/users/${path}`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ user_ids: userIds }),
+        });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+    };
+
+    const clearSelection = (ids: number[]) => {
+        setSelected((prev) => {
+            const next = new Set(prev);
+            ids.forEach((id) => next.delete(id));
+            return next;
+        });
+    };
+
+    const handleApprove = async (userIds: number[]) => {
+        if (userIds.length === 0) return;
+        setWorking(true);
+        try {
+            const data = await postBatch("approve", userIds);
+            const approved = new Map<number, User>((data.users as User[]).map((u): [number, User] => [u.id, u]));
+            setUsers((prev) =>
+                filter === "pending"
+                    ? prev.filter((u) => !approved.has(u.id))
+                    : prev.map((u) => approved.get(u.id) ?? u)
+            );
+            setCounts((prev) => prev && {
+                ...prev,
+                pending: prev.pending - approved.size,
+                approved: prev.approved + approved.size,
             });
-            fetchUsers();
+            clearSelection(userIds);
         } catch (error) {
-            console.error("Failed to approve user:", error);
+            console.error("Failed to approve users:", error);
             alert("사용자 승인에 실패했습니다");
+        } finally {
+            setWorking(false);
         }
     };
 
-    const handleReject = async (userId: number) => {
-        if (!confirm("정말 이 사용자를 거절/삭제하시겠습니까?")) return;
+    const handleReject = async (userIds: number[]) => {
+        if (userIds.length === 0) return;
+        const message = userIds.length === 1
+            ? "정말 이 사용자를 거절/삭제하시겠습니까?"
+            : `선택한 ${userIds.length}명을 거절/삭제하시겠습니까?`;
+        if (!confirm(message)) return;
 
+        setWorking(true);
         try {
-            await fetchWithAuth(`${API_URL}/api/admin/reject/${userId}`, {
-                method: "DELETE",
+            const data = await postBatch("reject", userIds);
+            const deleted = data.deleted as DeletedUser[];
+            const deletedIds = new Set(deleted.map((u) => u.id));
+            const pendingDeleted = deleted.filter((u) => !u.is_approved).length;
+            setUsers((prev) => prev.filter((u) => !deletedIds.has(u.id)));
+            setCounts((prev) => prev && {
+                all: prev.all - deleted.length,
+                pending: prev.pending - pendingDeleted,
+                approved: prev.approved - (deleted.length - pendingDeleted),
             });
-            fetchUsers();
+            clearSelection(userIds);
         } catch (error) {
-            console.error("Failed to reject user:", error);
+            console.error("Failed to reject users:", error);
             alert("사용자 거절에 실패했습니다");
+        } finally {
+            setWorking(false);
         }
     };
 
+    const toggleSelected = (userId: number) => {
+        setSelected((prev) => {
+            const next = new Set(prev);
+            if (next.has(userId)) next.delete(userId);
+            else next.add(userId);
+            return next;
+        });
+    };
+
+    const toggleAll = () => {
+        setSelected((prev) =>
+            prev.size === users.length ? new Set() : new Set(users.map((u) => u.id))
+        );
+    };
+
+    const selectedIds = Array.from(selected);
+    const selectedPendingIds = users.filter((u) => selected.has(u.id) && !u.is_approved).map((u) => u.id);
+
     const handleEdit = (user: User) => {
         setEditingUser(user);
         setEditForm({
@@ -91,13 +206,19 @@ export default function AdminPage() {
             formData.append("username", editForm.username);
             formData.append("wallet_address", editForm.wallet_address);
 
-            await fetchWithAuth(`${API_URL}/api/admin/update/${editingUser.id}`, {
+            const response = await fetchWithAuth(`${API_URL}/api/admin/update/${editingUser.id}`, {
                 method: "PUT",
                 body: formData,
             });
+            const data = await response.json();
+            if (!response.ok) {
+                alert(data.detail || "사용자 정보 수정에 실패했습니다");
+                return;
+            }
 
+            const updated = data as User;
+            setUsers((prev) => prev.map((u) => (u.id === updated.id ? updated : u)));
             setEditingUser(null);
-            fetchUsers();
         } catch (error) {
             console.error("Failed to update user:", error);
             alert("사용자 정보 수정에 실패했습니다");
@@ -140,7 +261,7 @@ export default function AdminPage() {
 
             <div className="relative z-10 max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
                 {/* Filter Tabs */}
-                <div className="flex gap-2 mb-6">
+                <div className="flex flex-wrap items-center gap-2 mb-6">
                     <button
                         onClick={() => setFilter("all")}
                         className={`px-4 py-2 rounded-lg font-medium transition-all ${filter === "all"
@@ -148,7 +269,7 @@ export default function AdminPage() {
                             : "bg-white/5 text-gray-400 hover:text-white hover:bg-white/10"
                             }`}
                     >
-                        전체
+                        전체{counts && ` (${counts.all})`}
                     </button>
                     <button
                         onClick={() => setFilter("pending")}
@@ -157,7 +278,7 @@ export default function AdminPage() {
                             : "bg-white/5 text-gray-400 hover:text-white hover:bg-white/10"
                             }`}
                     >
-                        승인 대기
+                        승인 대기{counts && ` (${counts.pending})`}
                     </button>
                     <button
                         onClick={() => setFilter("approved")}
@@ -166,10 +287,51 @@ export default function AdminPage() {
                             : "bg-white/5 text-gray-400 hover:text-white hover:bg-white/10"
                             }`}
                     >
-                        승인됨
+                        승인됨{counts && ` (${counts.approved})`}
                     </button>
+
+                    <div className="relative ml-auto w-full sm:w-72">
+                        <Search size={16} className="absolute left-3 top-1/2 -translate-y-1/2 text-gray-500" />
+                        <input
+                            type="text"
+                            value={search}
+                            onChange={(e) => setSearch(e.target.value)}
+                            placeholder="이름 또는 지갑 주소 검색"
+                            className="w-full pl-9 pr-4 py-2 bg-[#1A1D26] border border-white/10 rounded-lg text-white text-sm focus:outline-none focus:border-purple-500"
+                        />
+                    </div>
                 </div>
 
+                {/* Bulk Actions */}
+                {selected.size > 0 && (
+                    <div className="flex flex-wrap items-center gap-3 mb-4 px-4 py-3 bg-purple-500/10 border border-purple-500/30 rounded-xl">
+                        <span className="text-sm text-gray-300">{selected.size}명 선택됨</span>
+                        <button
+                            onClick={() => handleApprove(selectedPendingIds)}
+                            disabled={working || selectedPendingIds.length === 0}
+                            className="flex items-center gap-1 px-3 py-1.5 bg-green-500/20 hover:bg-green-500/30 text-green-400 rounded-lg text-sm transition-all disabled:opacity-50"
+                        >
+                            <Check size={16} />
+                            선택 승인{selectedPendingIds.length > 0 && ` (${selectedPendingIds.length})`}
+                        </button>
+                        <button
+                            onClick={() => handleReject(selectedIds)}
+                            disabled={working}
+                            className="flex items-center gap-1 px-3 py-1.5 bg-red-500/20 hover:bg-red-500/30 text-red-400 rounded-lg text-sm transition-all disabled:opacity-50"
+                        >
+                            <X size={16} />
+                            선택 거절/삭제
+                        </button>
+                        <button
+                            onClick={() => setSelected(new Set())}
+                            className="ml-auto text-sm text-gray-400 hover:text-white transition-all"
+                        >
+                            선택 해제
+                        </button>
+                        {working && <Loader2 className="animate-spin text-purple-400" size={16} />}
+                    </div>
+                )}
+
                 {/* Users Table */}
                 <div className="bg-[#151921]/80 backdrop-blur-xl border border-white/10 rounded-2xl overflow-hidden shadow-2xl">
                     {loading ? (
@@ -185,6 +347,15 @@ export default function AdminPage() {
                             <table className="w-full">
                                 <thead className="bg-white/5 border-b border-white/10">
                                     <tr>
+                                        <th className="pl-6 py-4 w-4">
+                                            <input
+                                                type="checkbox"
+                                                checked={users.length > 0 && selected.size === users.length}
+                                                onChange={toggleAll}
+                                                className="accent-purple-600"
+                                                aria-label="전체 선택"
+                                            />
+                                        </th>
                                         <th className="px-6 py-4 text-left text-sm font-semibold text-gray-300">프로필</th>
                                         <th className="px-6 py-4 text-left text-sm font-semibold text-gray-300">이름</th>
                                         <th className="px-6 py-4 text-left text-sm font-semibold text-gray-300">지갑 주소</th>
@@ -196,6 +367,15 @@ export default function AdminPage() {
                                 <tbody className="divide-y divide-white/5">
                                     {users.map((user) => (
                                         <tr key={user.id} className="hover:bg-white/5 transition-colors">
+                                            <td className="pl-6 py-4">
+                                                <input
+                                                    type="checkbox"
+                                                    checked={selected.has(user.id)}
+                                                    onChange={() => toggleSelected(user.id)}
+                                                    className="accent-purple-600"
+                                                    aria-label={`${user.username} 선택`}
+                                                />
+                                            </td>
                                             <td className="px-6 py-4">
                                                 {user.profile_image_url ? (
                                                     <img
@@ -231,7 +411,8 @@ export default function AdminPage() {
                                                 <div className="flex items-center justify-end gap-2">
                                                     {!user.is_approved && (
                                                         <button
-                                                            onClick={() => handleApprove(user.id)}
+                                                            onClick={() => handleApprove([user.id])}
+                                                            disabled={working}
                                                             className="p-2 bg-green-500/20 hover:bg-green-500/30 text-green-400 rounded-lg transition-all"
                                                             title="승인"
                                                         >
@@ -246,7 +427,8 @@ export default function AdminPage() {
                                                         <Edit size={18} />
                                                     </button>
                                                     <button
-                                                        onClick={() => handleReject(user.id)}
+                                                        onClick={() => handleReject([user.id])}
+                                                        disabled={working}
                                                         className="p-2 bg-red-500/20 hover:bg-red-500/30 text-red-400 rounded-lg transition-all"
                                                         title="거절/삭제"
                                                     >
@@ -258,6 +440,18 @@ export default function AdminPage() {
                                     ))}
                                 </tbody>
                             </table>
+                            {nextCursor && (
+                                <div className="flex justify-center py-4 border-t border-white/5">
+                                    <button
+                                        onClick={loadMore}
+                                        disabled={loadingMore}
+                                        className="flex items-center gap-2 px-4 py-2 bg-white/5 hover:bg-white/10 text-gray-300 rounded-lg text-sm transition-all disabled:opacity-50"
+                                    >
+                                        {loadingMore && <Loader2 className="animate-spin" size={16} />}
+                                        더 보기
+                                    </button>
+                                </div>
+                            )}
                         </div>
                     )}
                 </div>
@@ -1,12 +1,13 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useRouter } from "next/navigation";
 import LeaderboardTable from "@/components/LeaderboardTable";
 import AdvancedChart from "@/components/AdvancedChart";
 import { RefreshCw, Shield, LogOut } from "lucide-react";
 import Image from "next/image";
 import { isAuthenticated, isAdmin, getCurrentUser, logout, fetchWithAuth } from "@/lib/auth";
+import { subscribeLeaderboard } from "@/lib/leaderboardStream";
 
 import { LeaderboardItem } from "@/types";
 import dynamic from "next/dynamic";
@@ -21,6 +22,26 @@ const DEFAULT_AVATARS = [
 
 const API_URL = "https://blockblock-trading-competition-production-f6b5.up.railway.app";
 
+const enhanceItems = (items: any[]): LeaderboardItem[] =>
+  items.map((item: any, index: number) => {
+    let name = item.name || item.address;
+    let avatar = item.avatar;
+
+    if (!avatar || avatar === "/images/avatars/default.jpg") {
+      const avatarIndex = index % DEFAULT_AVATARS.length;
+      avatar = `/images/avatars/${DEFAULT_AVATARS[avatarIndex]}`;
+    }
+
+    const roi = item.roi24h ?? item.profit_rate ?? 0;
+
+    return {
+      ...item,
+      name: name,
+      avatar: avatar,
+      roi24h: roi
+    };
+  });
+
 export default function Dashboard() {
   const router = useRouter();
   const [data, setData] = useState<LeaderboardItem[]>([]);
@@ -28,6 +49,9 @@ export default function Dashboard() {
   const [lastUpdated, setLastUpdated] = useState<Date | null>(null);
   const [userIsAdmin, setUserIsAdmin] = useState(false);
   const [currentUsername, setCurrentUsername] = useState("");
+  // Raw entries keyed by wallet address, patched in place by stream deltas
+  const entriesRef = useRef<Map<string, any>>(new Map());
+  const generatedAtRef = useRef<string>("");
 
   // Check authentication on mount
   useEffect(() => {
@@ -43,36 +67,26 @@ export default function Dashboard() {
     }
   }, [router]);
 
+  const render = (generatedAt: string) => {
+    generatedAtRef.current = generatedAt;
+    const ordered = Array.from(entriesRef.current.values()).sort((a, b) => a.rank - b.rank);
+    setData(enhanceItems(ordered));
+    setLastUpdated(new Date(generatedAt));
+    setLoading(false);
+  };
+
+  const applySnapshot = (snapshot: { generated_at: string; entries: any[] }) => {
+    entriesRef.current = new Map(snapshot.entries.map((item) => [item.address, item]));
+    render(snapshot.generated_at);
+  };
+
   const fetchData = async () => {
     try {
       const res = await fetchWithAuth(`${API_URL}/leaderboard`);
       if (!res.ok) {
         throw new Error("Failed to fetch data");
       }
-      const jsonData = await res.json();
-
-      const enhancedData = jsonData.map((item: any, index: number) => {
-        let name = item.name || item.address;
-        let avatar = item.avatar;
-
-        if (!avatar || avatar === "/images/avatars/default.jpg") {
-          const avatarIndex = index % DEFAULT_AVATARS.length;
-          avatar = `/images/avatars/${DEFAULT_AVATARS[avatarIndex]}`;
-        }
-
-        const roi = item.roi24h ?? item.profit_rate ?? 0;
-
-        return {
-          ...item,
-          name: name,
-          avatar: avatar,
-          roi24h: roi
-        };
-      });
-
-      setData(enhancedData);
-      setLastUpdated(new Date());
-      setLoading(false);
+      applySnapshot(await res.json());
     } catch (error) {
       console.error("Error fetching leaderboard:", error);
       setLoading(false);
@@ -81,8 +95,18 @@ export default function Dashboard() {
 
   useEffect(() => {
     fetchData();
-    const intervalId = setInterval(fetchData, 30000);
-    return () => clearInterval(intervalId);
+    const unsubscribe = subscribeLeaderboard(`${API_URL}/leaderboard/stream`, {
+      onSnapshot: applySnapshot,
+      onDelta: (delta) => {
+        if (delta.generated_at <= generatedAtRef.current) return;
+        const entries = entriesRef.current;
+        delta.left.forEach((address) => entries.delete(address));
+        [...delta.joined, ...delta.updated].forEach((item) => entries.set(item.address, item));
+        render(delta.generated_at);
+      },
+      onError: (error) => console.error("Leaderboard stream error:", error),
+    });
+    return unsubscribe;
   }, []);
 
   return (
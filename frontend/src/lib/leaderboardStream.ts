@@ -0,0 +1,87 @@
+// Leaderboard push stream (Server-Sent Events read through fetch so the JWT header is sent)
+
+import { fetchWithAuth } from './auth';
+
+export interface LeaderboardSnapshotEvent {
+    generated_at: string;
+    entries: any[];
+}
+
+export interface LeaderboardDeltaEvent {
+    generated_at: string;
+    updated: any[];
+    joined: any[];
+    left: string[];
+}
+
+export interface LeaderboardStreamHandlers {
+    onSnapshot: (snapshot: LeaderboardSnapshotEvent) => void;
+    onDelta: (delta: LeaderboardDeltaEvent) => void;
+    onError?: (error: unknown) => void;
+}
+
+const MIN_RETRY_MS = 1000;
+const MAX_RETRY_MS = 30000;
+
+function dispatch(raw: string, handlers: LeaderboardStreamHandlers): void {
+    let event = 'message';
+    const dataLines: string[] = [];
+
+    for (const line of raw.split('\n')) {
+        if (line.startsWith(':')) continue; // keep-alive comment
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+    }
+    if (dataLines.length === 0) return;
+
+    const payload = JSON.parse(dataLines.join('\n'));
+    if (event === 'snapshot') handlers.onSnapshot(payload);
+    else if (event === 'delta') handlers.onDelta(payload);
+}
+
+/**
+ * Subscribe to leaderboard updates: a full snapshot on connect, deltas afterwards.
+ * Reconnects with exponential backoff. Returns an unsubscribe function.
+ */
+export function subscribeLeaderboard(url: string, handlers: LeaderboardStreamHandlers): () => void {
+    const controller = new AbortController();
+    let retryMs = MIN_RETRY_MS;
+
+    const run = async () => {
+        while (!controller.signal.aborted) {
+            try {
+                const response = await fetchWithAuth(url, {
+                    signal: controller.signal,
+                    headers: { Accept: 'text/event-stream' },
+                });
+                if (!response.ok || !response.body) {
+                    throw new Error(`Leaderboard stream failed: ${response.status}`);
+                }
+                retryMs = MIN_RETRY_MS;
+
+                const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+                let buffer = '';
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += value;
+
+                    let boundary: number;
+                    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                        dispatch(buffer.slice(0, boundary), handlers);
+                        buffer = buffer.slice(boundary + 2);
+                    }
+                }
+            } catch (error) {
+                if (controller.signal.aborted) return;
+                handlers.onError?.(error);
+            }
+
+            await new Promise((resolve) => setTimeout(resolve, retryMs));
+            retryMs = Math.min(retryMs * 2, MAX_RETRY_MS);
+        }
+    };
+
+    run();
+    return () => controller.abort();
+}
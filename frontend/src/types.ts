@@ -2,10 +2,10 @@ export interface LeaderboardItem {
     rank: number;
     address: string;
     accountValue: number;
-    equity: number;
     roi24h?: number;
     name?: string;
     avatar?: string;
+    stale?: boolean;
 }
 
 export interface TraderData {